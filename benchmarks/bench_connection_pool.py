@@ -0,0 +1,113 @@
+# benchmarks/bench_connection_pool.py
+#
+# Vergleicht Öffnen/Schließen pro Aufruf mit wiederverwendeten Verbindungen
+# aus dem ConnectionPool auf einer großen, lokalen Datenbankdatei.
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m benchmarks.bench_connection_pool [--printers 50000] [--lookups 2000]
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from crud.database import ConnectionPool, dict_factory
+
+SCHEMA = """
+CREATE TABLE locations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL
+);
+
+CREATE TABLE printers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dns TEXT NOT NULL,
+    name TEXT NOT NULL,
+    model TEXT NOT NULL,
+    driver_name TEXT NOT NULL,
+    driver_inf_path TEXT NOT NULL,
+    location_id INTEGER NOT NULL,
+    FOREIGN KEY (location_id) REFERENCES locations (id)
+);
+"""
+
+
+def build_database(path: str, printer_count: int, location_count: int = 200):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO locations (name) VALUES (?)",
+        ((f"Standort {i}",) for i in range(location_count)),
+    )
+    conn.executemany(
+        "INSERT INTO printers (dns, name, model, driver_name, driver_inf_path, location_id) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (
+                f"prn{i:06d}.example.local",
+                f"Drucker {i}",
+                "Modell X",
+                "Treiber X",
+                "//server/treiber/x.inf",
+                i % location_count + 1,
+            )
+            for i in range(printer_count)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def lookup_per_call(path: str, ids: list[int]):
+    for printer_id in ids:
+        conn = sqlite3.connect(path)
+        conn.row_factory = dict_factory
+        conn.execute("SELECT * FROM printers WHERE id = (?)", (printer_id,)).fetchone()
+        conn.commit()
+        conn.close()
+
+
+def lookup_pooled(pool: ConnectionPool, ids: list[int]):
+    for printer_id in ids:
+        conn = pool.acquire()
+        conn.execute("SELECT * FROM printers WHERE id = (?)", (printer_id,)).fetchone()
+        conn.commit()
+
+
+def measure(label: str, func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:10.1f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ConnectionPool-Benchmark")
+    parser.add_argument("--printers", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        build_database(path, args.printers)
+        print(
+            f"Datenbank: {args.printers} Drucker, "
+            f"{os.path.getsize(path) / 1024 / 1024:.1f} MiB, {args.lookups} Abfragen"
+        )
+
+        ids = [random.randint(1, args.printers) for _ in range(args.lookups)]
+
+        per_call = measure("Öffnen/Schließen pro Aufruf", lookup_per_call, path, ids)
+
+        pool = ConnectionPool(path)
+        pooled = measure("ConnectionPool", lookup_pooled, pool, ids)
+        pool.close_all()
+
+        print(f"Faktor: {per_call / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_indexes.py
+#
+# Misst die Dauer von Abfragen nach DNS, Name und Standort auf einem Katalog
+# mit 100.000 Druckern vor und nach den Migrationen (Indizes aus Version 2).
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m benchmarks.bench_indexes [--printers 100000] [--lookups 500]
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from crud.migrations import apply_migrations
+
+from .bench_connection_pool import build_database
+
+QUERIES = {
+    "get_printer_by_dns": "SELECT * FROM printers WHERE dns = (?)",
+    "get_printer_by_name": "SELECT * FROM printers WHERE name = (?)",
+    "get_printers_by_location_id": "SELECT * FROM printers WHERE location_id = (?)",
+}
+
+
+def sample_parameters(printer_count: int, lookups: int, location_count: int = 200):
+    numbers = [random.randrange(printer_count) for _ in range(lookups)]
+    return {
+        "get_printer_by_dns": [(f"prn{i:06d}.example.local",) for i in numbers],
+        "get_printer_by_name": [(f"Drucker {i}",) for i in numbers],
+        "get_printers_by_location_id": [
+            (random.randint(1, location_count),) for _ in numbers
+        ],
+    }
+
+
+def measure_lookups(conn: sqlite3.Connection, parameters: dict) -> dict[str, float]:
+    """Gibt die mittlere Dauer pro Abfrage in Mikrosekunden zurück."""
+    results = {}
+
+    for name, sql in QUERIES.items():
+        start = time.perf_counter()
+        for params in parameters[name]:
+            conn.execute(sql, params).fetchall()
+        results[name] = (time.perf_counter() - start) / len(parameters[name]) * 1e6
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index-Benchmark")
+    parser.add_argument("--printers", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        build_database(path, args.printers)
+        parameters = sample_parameters(args.printers, args.lookups)
+
+        conn = sqlite3.connect(path)
+        before = measure_lookups(conn, parameters)
+
+        version = apply_migrations(conn.cursor())
+        after = measure_lookups(conn, parameters)
+        conn.close()
+
+        print(f"{args.printers} Drucker, {args.lookups} Abfragen je Funktion")
+        print(f"{'Abfrage':<30} {'ohne Index':>12} {f'Version {version}':>12}")
+        for name in QUERIES:
+            print(f"{name:<30} {before[name]:>9.1f} µs {after[name]:>9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
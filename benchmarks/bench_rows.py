@@ -0,0 +1,79 @@
+# benchmarks/bench_rows.py
+#
+# Vergleicht den bisherigen Weg dict_factory + Printer.from_dict mit Record-Zeilen
+# aus der RecordFactory: Zeilen pro Sekunde und Speicherbedarf pro Zeile.
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m benchmarks.bench_rows [--printers 100000]
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from crud.database import dict_factory
+from crud.rows import RecordFactory
+from models.printer import Printer
+
+from .bench_connection_pool import build_database
+
+QUERY = "SELECT * FROM printers;"
+
+
+def load_dicts(conn: sqlite3.Connection) -> list:
+    conn.row_factory = dict_factory
+    return [Printer.from_dict(row) for row in conn.execute(QUERY).fetchall()]
+
+
+def load_records(conn: sqlite3.Connection) -> list:
+    conn.row_factory = RecordFactory()
+    return conn.execute(QUERY).fetchall()
+
+
+def load_records_as_printers(conn: sqlite3.Connection) -> list:
+    conn.row_factory = RecordFactory()
+    return [Printer.from_dict(row) for row in conn.execute(QUERY).fetchall()]
+
+
+def measure(label: str, func, conn: sqlite3.Connection, row_count: int):
+    start = time.perf_counter()
+    func(conn)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    rows = func(conn)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+
+    print(
+        f"{label:<36} {row_count / elapsed:>12,.0f} Zeilen/s "
+        f"{size / row_count:>8.0f} Bytes/Zeile"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zeilen-Benchmark")
+    parser.add_argument("--printers", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        build_database(path, args.printers)
+
+        conn = sqlite3.connect(path)
+        measure("dict_factory + Printer.from_dict", load_dicts, conn, args.printers)
+        measure("RecordFactory", load_records, conn, args.printers)
+        measure(
+            "RecordFactory + Printer.from_dict",
+            load_records_as_printers,
+            conn,
+            args.printers,
+        )
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import csv
+import json
+import os
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, TextIO
+
+from .database import get_db_cursor
+from .locations import TABLE_NAME as LOCATIONS_TABLE, get_locations
+from .printers import TABLE_NAME as PRINTERS_TABLE, iter_printers
+
+# Spalten der Import-/Exportdateien; "location" ist der Name des Standorts
+FIELDS = ("location", "dns", "name", "model", "driver_name", "driver_inf_path")
+
+PRINTER_FIELDS = FIELDS[1:]
+
+# Anzahl der Drucker pro executemany()-Aufruf
+BATCH_SIZE = 500
+
+FORMATS = ("csv", "json", "jsonl")
+
+# Zeichen zwischen zwei Objekten in JSON-Arrays bzw. JSON Lines
+_JSON_SEPARATORS = re.compile(r"[\s,\[\]]*")
+
+
+class ImportReport:
+    """Ergebnis eines Massenimports mit Fehlern pro Datensatz."""
+
+    def __init__(self):
+        self.imported: int = 0
+        self.created_locations: list[str] = []
+        self.errors: list[tuple[int, str]] = []
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    def add_error(self, row_number: int, message: str):
+        self.errors.append((row_number, message))
+
+    def summary(self) -> str:
+        text = (
+            f"{self.imported} Drucker importiert, {self.failed} Datensätze fehlerhaft"
+        )
+        if self.created_locations:
+            text += f", {len(self.created_locations)} Standorte angelegt"
+        return text + "."
+
+
+def detect_format(path: str) -> str:
+    """Leitet das Dateiformat aus der Dateiendung ab (csv, json oder jsonl)."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension not in FORMATS:
+        raise ValueError(
+            f"Nicht unterstütztes Dateiformat '.{extension}' (erlaubt: {', '.join(FORMATS)})."
+        )
+    return extension
+
+
+def _iter_json_objects(stream: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Liest JSON-Objekte nacheinander aus einem Array (`[{...}, {...}]`) oder aus
+    JSON Lines, ohne die ganze Datei in den Speicher zu laden.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    while True:
+        position = _JSON_SEPARATORS.match(buffer, position).end()
+
+        if position < len(buffer):
+            try:
+                obj, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Objekt ist (noch) unvollständig, es sei denn, die Datei ist zu Ende
+                if eof:
+                    raise
+            else:
+                yield obj
+                continue
+
+        if eof:
+            return
+
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Liest Datensätze im Format `fmt` (csv, json, jsonl) aus einer Datei."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt in ("json", "jsonl"):
+        yield from _iter_json_objects(stream)
+    else:
+        raise ValueError(f"Nicht unterstütztes Dateiformat: {fmt}")
+
+
+def _validate_row(row: Any) -> Dict[str, str]:
+    """Prüft einen Datensatz und gibt die bereinigten Felder zurück."""
+    if not isinstance(row, dict):
+        raise ValueError("Datensatz ist kein Objekt.")
+
+    cleaned = {}
+    for field in FIELDS:
+        value = row.get(field)
+        value = "" if value is None else str(value).strip()
+        if not value:
+            raise ValueError(f"Feld '{field}' fehlt oder ist leer.")
+        cleaned[field] = value
+
+    return cleaned
+
+
+def import_printers(
+    rows: Iterable[Dict[str, Any]],
+    create_locations: bool = True,
+    batch_size: int = BATCH_SIZE,
+) -> ImportReport:
+    """
+    Importiert Drucker in einer einzigen Transaktion.
+
+    Jeder Datensatz wird geprüft; Standorte werden über ihren Namen zugeordnet
+    und bei Bedarf angelegt. Fehlerhafte Datensätze (fehlende Felder, unbekannter
+    Standort, DNS bereits vorhanden) werden im Bericht vermerkt, der Import läuft
+    mit den übrigen weiter.
+    """
+    report = ImportReport()
+    error: sqlite3.Error | None = None
+
+    with get_db_cursor() as cursor:
+        try:
+            _import_rows(cursor, rows, create_locations, batch_size, report)
+        except sqlite3.Error as e:
+            # get_db_cursor() verwirft die Transaktion; der Fehler geht an den Aufrufer
+            error = e
+            raise
+
+    if error is not None:
+        raise error
+
+    report.errors.sort()
+    return report
+
+
+def _import_rows(
+    cursor: sqlite3.Cursor,
+    rows: Iterable[Dict[str, Any]],
+    create_locations: bool,
+    batch_size: int,
+    report: ImportReport,
+):
+    # Alles in einer Transaktion; die Sicherungspunkte je Block liegen darin
+    if not cursor.connection.in_transaction:
+        cursor.execute("BEGIN IMMEDIATE;")
+
+    locations = {
+        row["name"]: row["id"]
+        for row in cursor.execute(f"SELECT id, name FROM {LOCATIONS_TABLE};")
+    }
+    known_dns = {
+        row["dns"] for row in cursor.execute(f"SELECT dns FROM {PRINTERS_TABLE};")
+    }
+
+    insert_sql = (
+        f"INSERT INTO {PRINTERS_TABLE} ({', '.join(PRINTER_FIELDS)}, location_id) "
+        f"VALUES ({', '.join('?' for _ in PRINTER_FIELDS)}, ?)"
+    )
+    batch: list[tuple[int, tuple]] = []
+
+    for row_number, row in enumerate(rows, start=1):
+        try:
+            data = _validate_row(row)
+
+            location_id = locations.get(data["location"])
+            if location_id is None:
+                if not create_locations:
+                    raise ValueError(f"Standort '{data['location']}' existiert nicht.")
+
+                cursor.execute(
+                    f"INSERT INTO {LOCATIONS_TABLE} (name) VALUES (?)",
+                    (data["location"],),
+                )
+                location_id = locations[data["location"]] = cursor.lastrowid
+                report.created_locations.append(data["location"])
+
+            if data["dns"] in known_dns:
+                raise ValueError(f"DNS/IP '{data['dns']}' ist bereits vorhanden.")
+            known_dns.add(data["dns"])
+
+        except ValueError as e:
+            report.add_error(row_number, str(e))
+            continue
+
+        values = tuple(data[field] for field in PRINTER_FIELDS) + (location_id,)
+        batch.append((row_number, values))
+
+        if len(batch) >= batch_size:
+            _insert_batch(cursor, insert_sql, batch, report)
+            batch = []
+
+    if batch:
+        _insert_batch(cursor, insert_sql, batch, report)
+
+
+def _insert_batch(
+    cursor: sqlite3.Cursor,
+    insert_sql: str,
+    batch: list[tuple[int, tuple]],
+    report: ImportReport,
+):
+    cursor.execute("SAVEPOINT import_batch;")
+    try:
+        cursor.executemany(insert_sql, (values for _, values in batch))
+        cursor.execute("RELEASE import_batch;")
+        report.imported += len(batch)
+        return
+    except sqlite3.IntegrityError:
+        # Block zurücknehmen und einzeln wiederholen, um die betroffenen
+        # Datensätze zu finden
+        cursor.execute("ROLLBACK TO import_batch;")
+        cursor.execute("RELEASE import_batch;")
+
+    for row_number, values in batch:
+        try:
+            cursor.execute(insert_sql, values)
+            report.imported += 1
+        except sqlite3.IntegrityError as e:
+            report.add_error(row_number, f"Datenbankfehler: {e}")
+
+
+def import_file(path: str, create_locations: bool = True) -> ImportReport:
+    """Importiert Drucker aus einer CSV-, JSON- oder JSON-Lines-Datei."""
+    fmt = detect_format(path)
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        try:
+            return import_printers(read_rows(f, fmt), create_locations)
+        except (csv.Error, json.JSONDecodeError) as e:
+            raise ValueError(f"Die Datei '{path}' konnte nicht gelesen werden: {e}")
+
+
+def iter_export_rows() -> Iterator[Dict[str, Any]]:
+    """Liefert alle Drucker im Import-/Exportformat, seitenweise aus der Datenbank."""
+    location_names = {location["id"]: location["name"] for location in get_locations()}
+
+    for printer in iter_printers():
+        row = {"location": location_names.get(printer["location_id"], "")}
+        for field in PRINTER_FIELDS:
+            row[field] = printer[field]
+        yield row
+
+
+def write_rows(
+    stream: TextIO,
+    rows: Iterable[Dict[str, Any]],
+    fmt: str,
+    fields: Iterable[str] = FIELDS,
+) -> int:
+    """
+    Schreibt Datensätze fortlaufend im Format `fmt` und gibt deren Anzahl zurück.
+    `fields` sind die Spalten bei CSV.
+    """
+    count = 0
+
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=list(fields))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+
+    elif fmt == "jsonl":
+        for row in rows:
+            stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += 1
+
+    elif fmt == "json":
+        stream.write("[")
+        for row in rows:
+            stream.write(",\n  " if count else "\n  ")
+            stream.write(json.dumps(row, ensure_ascii=False))
+            count += 1
+        stream.write("\n]\n" if count else "]\n")
+
+    else:
+        raise ValueError(f"Nicht unterstütztes Dateiformat: {fmt}")
+
+    return count
+
+
+def export_file(path: str) -> int:
+    """Exportiert alle Drucker in eine CSV-, JSON- oder JSON-Lines-Datei."""
+    fmt = detect_format(path)
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return write_rows(f, iter_export_rows(), fmt)
@@ -0,0 +1,60 @@
+from .database import get_read_cursor
+from .locations import TABLE_NAME as LOCATIONS_TABLE
+from .printers import TABLE_NAME as PRINTERS_TABLE, PAGE_SIZE
+from .changes import get_change_seq
+
+PRINTER_COLUMNS = (
+    "id",
+    "location_id",
+    "dns",
+    "name",
+    "model",
+    "driver_name",
+    "driver_inf_path",
+)
+
+
+def get_catalog():
+    """
+    Lädt alle Standorte samt ihrer Drucker mit einer einzigen Abfrage.
+
+    Gibt eine nach Standort-ID sortierte Liste im Format von `Location.to_dict()`
+    zurück, d.h. jeder Standort enthält seine Drucker (nach ID sortiert) unter
+    dem Schlüssel "printers". Standorte ohne Drucker sind mit leerer Liste enthalten.
+    """
+    with get_read_cursor() as cursor:
+        stmt = cursor.execute(
+            f"SELECT l.id AS l_id, l.name AS l_name, "
+            f"{', '.join(f'p.{column}' for column in PRINTER_COLUMNS)} "
+            f"FROM {LOCATIONS_TABLE} l "
+            f"LEFT JOIN {PRINTERS_TABLE} p ON p.location_id = l.id "
+            f"ORDER BY l.id, p.id;"
+        )
+
+        catalog = []
+        current = None
+
+        # Zeilen blockweise gruppieren, statt das ganze Ergebnis zweimal im Speicher zu halten
+        while rows := stmt.fetchmany(PAGE_SIZE):
+            for row in rows:
+                if current is None or current["id"] != row["l_id"]:
+                    current = {"id": row["l_id"], "name": row["l_name"], "printers": []}
+                    catalog.append(current)
+
+                # LEFT JOIN: ein Standort ohne Drucker liefert eine Zeile mit p.id = NULL
+                if row["id"] is not None:
+                    current["printers"].append(
+                        {column: row[column] for column in PRINTER_COLUMNS}
+                    )
+
+        return catalog
+
+
+def get_catalog_snapshot():
+    """
+    Gibt den Stand des Änderungsprotokolls und den Katalog zusammen zurück.
+
+    Der Stand wird vor dem Katalog gelesen, sodass `changes_since()` danach
+    keine Änderung auslässt (doppelt gelieferte sind unschädlich).
+    """
+    return get_change_seq(), get_catalog()
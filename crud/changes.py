@@ -0,0 +1,118 @@
+from .database import get_db_cursor, get_read_cursor
+from .locations import TABLE_NAME as LOCATIONS_TABLE
+from .printers import TABLE_NAME as PRINTERS_TABLE
+
+TABLE_NAME = "changes"
+
+# Anzahl der Protokolleinträge, die prune_changes() mindestens behält
+KEEP_CHANGES = 50_000
+
+# Höchstzahl an Parametern pro IN (...)-Abfrage
+_MAX_PARAMETERS = 500
+
+
+class ChangeSet:
+    """
+    Zusammengefasste Änderungen seit einer Sequenznummer.
+
+    Pro Datensatz zählt nur die letzte Änderung: eingefügte und geänderte
+    Zeilen stehen mit ihrem aktuellen Inhalt in `locations`/`printers`,
+    gelöschte nur mit ihrer ID in `deleted_locations`/`deleted_printers`.
+    """
+
+    def __init__(self, seq: int):
+        self.seq = seq
+        self.locations: list = []
+        self.printers: list = []
+        self.deleted_locations: list[int] = []
+        self.deleted_printers: list[int] = []
+
+    def is_empty(self) -> bool:
+        return not (
+            self.locations
+            or self.printers
+            or self.deleted_locations
+            or self.deleted_printers
+        )
+
+
+def get_change_seq() -> int:
+    """Gibt die Sequenznummer der letzten protokollierten Änderung zurück."""
+    with get_read_cursor() as cursor:
+        stmt = cursor.execute(f"SELECT COALESCE(MAX(seq), 0) AS seq FROM {TABLE_NAME};")
+        return stmt.fetchone()["seq"]
+
+    return 0
+
+
+def _fetch_rows(cursor, table: str, ids: list[int]) -> list:
+    rows = []
+
+    for start in range(0, len(ids), _MAX_PARAMETERS):
+        chunk = ids[start : start + _MAX_PARAMETERS]
+        stmt = cursor.execute(
+            f"SELECT * FROM {table} WHERE id IN ({', '.join('?' for _ in chunk)}) "
+            f"ORDER BY id",
+            chunk,
+        )
+        rows.extend(stmt.fetchall())
+
+    return rows
+
+
+def changes_since(seq: int) -> ChangeSet | None:
+    """
+    Liefert alle Änderungen an Standorten und Druckern nach `seq`.
+
+    Gibt None zurück, wenn die benötigten Protokolleinträge bereits entfernt
+    wurden; der Aufrufer muss dann vollständig neu laden.
+    """
+    with get_read_cursor() as cursor:
+        (oldest,) = cursor.execute(
+            f"SELECT MIN(seq) AS oldest FROM {TABLE_NAME};"
+        ).fetchone()
+        if oldest is not None and oldest > seq + 1:
+            return None
+
+        # Bei mehreren Änderungen einer Zeile liefert SQLite zu MAX(seq) die
+        # Spalten der letzten Änderung
+        stmt = cursor.execute(
+            f"SELECT table_name, row_id, operation, MAX(seq) AS seq "
+            f"FROM {TABLE_NAME} WHERE seq > (?) GROUP BY table_name, row_id;",
+            (seq,),
+        )
+        entries = stmt.fetchall()
+
+        change_set = ChangeSet(max((entry["seq"] for entry in entries), default=seq))
+        changed = {LOCATIONS_TABLE: [], PRINTERS_TABLE: []}
+        deleted = {
+            LOCATIONS_TABLE: change_set.deleted_locations,
+            PRINTERS_TABLE: change_set.deleted_printers,
+        }
+
+        for entry in entries:
+            if entry["table_name"] not in changed:
+                continue
+            if entry["operation"] == "delete":
+                deleted[entry["table_name"]].append(entry["row_id"])
+            else:
+                changed[entry["table_name"]].append(entry["row_id"])
+
+        change_set.locations = _fetch_rows(
+            cursor, LOCATIONS_TABLE, sorted(changed[LOCATIONS_TABLE])
+        )
+        change_set.printers = _fetch_rows(
+            cursor, PRINTERS_TABLE, sorted(changed[PRINTERS_TABLE])
+        )
+
+        return change_set
+
+
+def prune_changes(keep: int = KEEP_CHANGES):
+    """Entfernt alte Protokolleinträge, sodass höchstens `keep` übrig bleiben."""
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {TABLE_NAME} "
+            f"WHERE seq <= (SELECT MAX(seq) FROM {TABLE_NAME}) - (?);",
+            (keep,),
+        )
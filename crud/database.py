@@ -1,12 +1,29 @@
+import os
 import sqlite3
+import tempfile
 from typing import Iterator
 from contextlib import contextmanager
 
+from .pool import ConnectionPool, is_stale_handle_error
+from .replica import Replica
+from .rows import record_factory
+
 # DB_NAME: str = "dv.db"
 DB_NAME: str = "//rtlnord.netrtlsrv.com/RTLNORD$/Public/install/_Skripte/DruckerVerwaltung/dv.db"
 
 SCHEMA_FILE: str = "structure.sql"
 
+# Lokale Kopie der Datenbank für Lesezugriffe (None = direkt von DB_NAME lesen)
+REPLICA_NAME: str | None = os.path.join(
+    os.environ.get("LOCALAPPDATA") or tempfile.gettempdir(),
+    "DruckerVerwaltung",
+    "dv_replica.db",
+)
+
+
+class DatabaseOfflineError(sqlite3.OperationalError):
+    """Wird bei Schreibzugriffen ausgelöst, solange die Primärdatenbank nicht erreichbar ist."""
+
 
 def dict_factory(cursor, row):
 
@@ -18,26 +35,100 @@ def dict_factory(cursor, row):
     return d
 
 
+_pool = ConnectionPool(DB_NAME, row_factory=record_factory)
+_replica = (
+    Replica(DB_NAME, REPLICA_NAME, row_factory=record_factory) if REPLICA_NAME else None
+)
+
+
+def _rollback(
+    pool: ConnectionPool, conn: sqlite3.Connection, error: sqlite3.Error | None = None
+):
+    """Verwirft die offene Transaktion und die Verbindung, falls sie unbrauchbar ist."""
+    try:
+        conn.rollback()
+    except sqlite3.Error:
+        # Zustand der Transaktion unklar: Verbindung nicht weiterverwenden
+        pool.invalidate()
+        return
+
+    # Ungültiges Datei-Handle: der nächste Zugriff verbindet neu
+    if error is not None and is_stale_handle_error(error):
+        pool.invalidate()
+
+
 @contextmanager
-def get_db_cursor() -> Iterator[sqlite3.Cursor]:
+def _pooled_cursor(pool: ConnectionPool) -> Iterator[sqlite3.Cursor]:
 
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
+    conn = pool.acquire()
     cursor = conn.cursor()
+    changes_before = conn.total_changes
 
     try:
         yield cursor
+        # If the 'with' block completed without error, commit the transaction
+        conn.commit()
     except sqlite3.Error as e:
         # If any database error occurs, roll back the transaction
-        conn.rollback()
+        _rollback(pool, conn, e)
         # raise # Re-raise the exception so the caller knows about the error
+    except BaseException:
+        # Auch andere Fehler (z.B. eine fehlerhafte Importdatei) dürfen die
+        # Transaktion nicht offen lassen, sonst schreibt der nächste Aufrufer
+        # der Verbindung sie fest
+        _rollback(pool, conn)
+        raise
     else:
-        # If the 'with' block completed without error, commit the transaction
-        conn.commit()
+        # Own writes only show up in the replica after the next sync
+        if _replica and pool is _pool and conn.total_changes != changes_before:
+            _replica.mark_stale()
     finally:
-        # Always close the connection
-        if conn:
-            conn.close()
+        cursor.close()
+
+
+@contextmanager
+def get_db_cursor() -> Iterator[sqlite3.Cursor]:
+    """Cursor auf der Primärdatenbank, für Schreibzugriffe."""
+
+    if is_read_only():
+        raise DatabaseOfflineError(
+            "Die Datenbank ist nicht erreichbar, Änderungen sind derzeit nicht möglich."
+        )
+
+    with _pooled_cursor(_pool) as cursor:
+        yield cursor
+
+
+@contextmanager
+def get_read_cursor() -> Iterator[sqlite3.Cursor]:
+    """Cursor für Lesezugriffe, bedient aus der lokalen Kopie der Datenbank."""
+
+    if _replica is None:
+        with _pooled_cursor(_pool) as cursor:
+            yield cursor
+        return
+
+    _replica.ensure_fresh()
+    if not _replica.available:
+        # Erster Start ohne erreichbare Freigabe: es gibt noch nichts zu lesen
+        raise DatabaseOfflineError(
+            "Die Datenbank ist nicht erreichbar und es gibt noch keine lokale Kopie."
+        )
+
+    with _pooled_cursor(_replica.pool) as cursor:
+        yield cursor
+
+
+def is_read_only() -> bool:
+    """Gibt an, ob nur noch aus der lokalen Kopie gelesen werden kann."""
+    return bool(_replica and _replica.offline)
+
+
+def close_db_connections():
+    """Schließt alle offenen Datenbankverbindungen (beim Beenden der Anwendung)."""
+    if _replica:
+        _replica.close()
+    _pool.close_all()
 
 
 def create_db_from_schema():
@@ -0,0 +1,276 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from .pool import ConnectionPool
+from .rows import record_factory
+
+# Lokale Datenbank mit dem Verlauf der Verfügbarkeitsprüfungen (pro Rechner)
+HISTORY_NAME: str = os.path.join(
+    os.environ.get("LOCALAPPDATA") or tempfile.gettempdir(),
+    "DruckerVerwaltung",
+    "dv_history.db",
+)
+
+# Gepufferte Ergebnisse werden spätestens nach so vielen Sekunden geschrieben ...
+FLUSH_INTERVAL = 5.0
+# ... oder sobald so viele Ergebnisse anstehen
+FLUSH_SIZE = 1000
+
+# Einzelergebnisse älter als das werden zu Stundenwerten zusammengefasst
+RAW_RETENTION = 7 * 24 * 3600
+# Stundenwerte älter als das werden gelöscht
+HOURLY_RETENTION = 365 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS samples (
+    host_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    up INTEGER NOT NULL,
+    PRIMARY KEY (host_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hourly (
+    host_id INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    up_count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    last_up INTEGER,
+    PRIMARY KEY (host_id, hour)
+) WITHOUT ROWID;
+"""
+
+
+class AvailabilityHistory:
+    """
+    Zeitreihe aller Verfügbarkeitsergebnisse in einer lokalen SQLite-Datei.
+
+    `record()` puffert nur im Speicher; ein Hintergrundthread schreibt die
+    Ergebnisse gesammelt in einer Transaktion. Pro Ergebnis wird eine
+    Zeile (Host-ID, Sekunde, 0/1) gespeichert, ältere Werte werden durch
+    `downsample()` zu Stundenwerten verdichtet.
+    """
+
+    def __init__(
+        self,
+        path: str = HISTORY_NAME,
+        flush_interval: float = FLUSH_INTERVAL,
+        flush_size: int = FLUSH_SIZE,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._pool = ConnectionPool(path, row_factory=record_factory)
+        with self._cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode = WAL;")
+            cursor.executescript(SCHEMA)
+
+        self._host_ids: dict[str, int] = {}
+        self._buffer: list[tuple[str, int, int]] = []
+        self._lock = threading.Lock()
+        # Serialisiert Schreibvorgänge aus Flusher-Thread und close()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="history-flush", daemon=True
+        )
+        self._flusher.start()
+
+    @contextmanager
+    def _cursor(self) -> Iterator[sqlite3.Cursor]:
+        conn = self._pool.acquire()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def record(self, host: str, is_available: bool, ts: float | None = None):
+        """Merkt ein Prüfergebnis zum Schreiben vor (blockiert nicht auf I/O)."""
+        sample = (host, int(time.time() if ts is None else ts), int(is_available))
+
+        with self._lock:
+            if self._closed:
+                return
+            self._buffer.append(sample)
+            # Nur beim Erreichen der Grenze wecken; nach einem fehlgeschlagenen
+            # Schreibversuch wartet der nächste bis zum regulären Intervall
+            if len(self._buffer) == self.flush_size:
+                self._wakeup.set()
+
+    def flush(self):
+        """
+        Schreibt alle gepufferten Ergebnisse. Schlägt das Schreiben fehl,
+        bleiben sie für den nächsten Versuch im Puffer.
+        """
+        with self._lock:
+            samples, self._buffer = self._buffer, []
+
+        if not samples:
+            return
+
+        with self._write_lock:
+            try:
+                with self._cursor() as cursor:
+                    new_ids = self._resolve_hosts(
+                        cursor, {host for host, _, _ in samples}
+                    )
+                    # Mehrere Ergebnisse in derselben Sekunde: das letzte zählt
+                    cursor.executemany(
+                        "INSERT OR REPLACE INTO samples (host_id, ts, up) "
+                        "VALUES (?, ?, ?)",
+                        (
+                            (self._host_ids.get(host) or new_ids[host], ts, up)
+                            for host, ts, up in samples
+                        ),
+                    )
+            except BaseException:
+                with self._lock:
+                    self._buffer[:0] = samples
+                raise
+
+            # Neue Host-IDs erst nach dem Commit übernehmen, sonst blieben
+            # nach einem Rollback IDs ohne Zeile in `hosts` zurück
+            self._host_ids.update(new_ids)
+
+    def _resolve_hosts(self, cursor: sqlite3.Cursor, hosts: set[str]) -> dict[str, int]:
+        """Legt noch unbekannte Hosts an und gibt deren IDs zurück."""
+        missing = {host for host in hosts if host not in self._host_ids}
+        if not missing:
+            return {}
+
+        cursor.executemany(
+            "INSERT OR IGNORE INTO hosts (host) VALUES (?)",
+            ((host,) for host in missing),
+        )
+        return {
+            row["host"]: row["id"]
+            for row in cursor.execute("SELECT id, host FROM hosts")
+            if row["host"] in missing
+        }
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # Verlauf ist nicht kritisch; die Ergebnisse bleiben im Puffer
+                # und werden beim nächsten Durchlauf erneut geschrieben
+                pass
+
+    def close(self):
+        """Schreibt ausstehende Ergebnisse und schließt die Datenbank."""
+        with self._lock:
+            self._closed = True
+        self._wakeup.set()
+        self._flusher.join()
+
+        self.flush()
+        self._pool.close_all()
+
+    def downsample(self, now: float | None = None):
+        """Fasst alte Einzelergebnisse zu Stundenwerten zusammen und löscht sehr alte."""
+        now = int(time.time() if now is None else now)
+        raw_cutoff = now - RAW_RETENTION
+        raw_cutoff -= raw_cutoff % 3600
+
+        with self._write_lock, self._cursor() as cursor:
+            cursor.execute("BEGIN IMMEDIATE;")
+            cursor.execute(
+                "INSERT INTO hourly (host_id, hour, up_count, total, last_up) "
+                "SELECT host_id, ts - ts % 3600 AS bucket, SUM(up), COUNT(*), "
+                "MAX(CASE WHEN up THEN ts END) "
+                "FROM samples WHERE ts < (?) GROUP BY host_id, bucket "
+                "ON CONFLICT (host_id, hour) DO UPDATE SET "
+                "up_count = up_count + excluded.up_count, "
+                "total = total + excluded.total, "
+                # Skalares MAX liefert NULL, sobald ein Wert NULL ist
+                "last_up = COALESCE(MAX(last_up, excluded.last_up), "
+                "last_up, excluded.last_up)",
+                (raw_cutoff,),
+            )
+            cursor.execute("DELETE FROM samples WHERE ts < (?)", (raw_cutoff,))
+            cursor.execute(
+                "DELETE FROM hourly WHERE hour < (?)", (now - HOURLY_RETENTION,)
+            )
+
+    def uptime(self, host: str, since: float) -> float | None:
+        """Anteil erfolgreicher Prüfungen seit `since` in Prozent (None ohne Daten)."""
+        since = int(since)
+
+        with self._cursor() as cursor:
+            row = cursor.execute(
+                "SELECT SUM(up_count) AS up_count, SUM(total) AS total FROM ("
+                "  SELECT SUM(s.up) AS up_count, COUNT(*) AS total FROM samples s"
+                "  JOIN hosts h ON h.id = s.host_id WHERE h.host = (?) AND s.ts >= (?)"
+                "  UNION ALL"
+                "  SELECT SUM(o.up_count), SUM(o.total) FROM hourly o"
+                "  JOIN hosts h ON h.id = o.host_id WHERE h.host = (?) AND o.hour >= (?)"
+                ")",
+                (host, since, host, since),
+            ).fetchone()
+
+        if not row["total"]:
+            return None
+        return 100.0 * row["up_count"] / row["total"]
+
+    def last_seen(self, host: str) -> int | None:
+        """Zeitpunkt (Unix-Sekunden) der letzten erfolgreichen Prüfung, oder None."""
+        with self._cursor() as cursor:
+            row = cursor.execute(
+                "SELECT MAX(last_up) AS last_up FROM ("
+                "  SELECT MAX(s.ts) AS last_up FROM samples s"
+                "  JOIN hosts h ON h.id = s.host_id WHERE h.host = (?) AND s.up = 1"
+                "  UNION ALL"
+                "  SELECT MAX(o.last_up) FROM hourly o"
+                "  JOIN hosts h ON h.id = o.host_id WHERE h.host = (?)"
+                ")",
+                (host, host),
+            ).fetchone()
+
+        return row["last_up"]
+
+    def flapping(
+        self, since: float, min_transitions: int = 3, hosts: Iterable[str] | None = None
+    ) -> list[tuple[str, int]]:
+        """
+        Hosts, deren Zustand seit `since` mindestens `min_transitions` Mal zwischen
+        erreichbar und nicht erreichbar gewechselt hat, mit der Anzahl der Wechsel.
+        Grundlage sind die Einzelergebnisse, nicht die Stundenwerte.
+        """
+        with self._cursor() as cursor:
+            rows = cursor.execute(
+                "SELECT h.host AS host, SUM(changed) AS transitions FROM ("
+                "  SELECT host_id, up != LAG(up) OVER ("
+                "    PARTITION BY host_id ORDER BY ts) AS changed"
+                "  FROM samples WHERE ts >= (?)"
+                ") JOIN hosts h ON h.id = host_id "
+                "GROUP BY host_id HAVING transitions >= (?) "
+                "ORDER BY transitions DESC, h.host",
+                (int(since), min_transitions),
+            ).fetchall()
+
+        result = [(row["host"], row["transitions"]) for row in rows]
+        if hosts is not None:
+            wanted = set(hosts)
+            result = [entry for entry in result if entry[0] in wanted]
+        return result
@@ -0,0 +1,230 @@
+import sqlite3
+from typing import Callable
+
+from .database import SCHEMA_FILE, get_db_cursor
+
+
+class MigrationError(Exception):
+    """Wird ausgelöst, wenn eine Schema-Migration nicht angewendet werden konnte."""
+
+
+def _baseline_schema() -> str:
+    with open(SCHEMA_FILE, "r") as f:
+        return f.read()
+
+
+# (Version, SQL) – jede Migration hebt `PRAGMA user_version` auf ihre Version.
+# Neue Migrationen werden nur angehängt, bestehende nie nachträglich geändert.
+MIGRATIONS: list[tuple[int, str | Callable[[], str]]] = [
+    # 1: Ausgangsschema aus structure.sql
+    (1, _baseline_schema),
+    # 2: Indizes für die Suche nach DNS, Name und Standort, DNS eindeutig
+    (
+        2,
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_printers_dns ON printers (dns);
+        CREATE INDEX IF NOT EXISTS idx_printers_name ON printers (name);
+        CREATE INDEX IF NOT EXISTS idx_printers_location_id ON printers (location_id);
+        """,
+    ),
+    # 3: Änderungsprotokoll, damit Clients nur Deltas nachladen müssen
+    (
+        3,
+        """
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            operation TEXT NOT NULL CHECK (operation IN ('insert', 'update', 'delete'))
+        );
+
+        CREATE TRIGGER IF NOT EXISTS locations_log_insert AFTER INSERT ON locations
+        BEGIN
+            INSERT INTO changes (table_name, row_id, operation)
+            VALUES ('locations', NEW.id, 'insert');
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS locations_log_update AFTER UPDATE ON locations
+        BEGIN
+            INSERT INTO changes (table_name, row_id, operation)
+            VALUES ('locations', NEW.id, 'update');
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS locations_log_delete AFTER DELETE ON locations
+        BEGIN
+            INSERT INTO changes (table_name, row_id, operation)
+            VALUES ('locations', OLD.id, 'delete');
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS printers_log_insert AFTER INSERT ON printers
+        BEGIN
+            INSERT INTO changes (table_name, row_id, operation)
+            VALUES ('printers', NEW.id, 'insert');
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS printers_log_update AFTER UPDATE ON printers
+        BEGIN
+            INSERT INTO changes (table_name, row_id, operation)
+            VALUES ('printers', NEW.id, 'update');
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS printers_log_delete AFTER DELETE ON printers
+        BEGIN
+            INSERT INTO changes (table_name, row_id, operation)
+            VALUES ('printers', OLD.id, 'delete');
+        END;
+        """,
+    ),
+    # 4: Volltextindex über Drucker und den Namen ihres Standorts
+    (
+        4,
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS printers_fts USING fts5 (
+            name, dns, model, driver_name, location_name,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        );
+
+        INSERT INTO printers_fts (rowid, name, dns, model, driver_name, location_name)
+        SELECT p.id, p.name, p.dns, p.model, p.driver_name, l.name
+        FROM printers p LEFT JOIN locations l ON l.id = p.location_id;
+
+        CREATE TRIGGER IF NOT EXISTS printers_fts_insert AFTER INSERT ON printers
+        BEGIN
+            INSERT INTO printers_fts (rowid, name, dns, model, driver_name, location_name)
+            VALUES (
+                NEW.id, NEW.name, NEW.dns, NEW.model, NEW.driver_name,
+                (SELECT name FROM locations WHERE id = NEW.location_id)
+            );
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS printers_fts_update AFTER UPDATE ON printers
+        BEGIN
+            DELETE FROM printers_fts WHERE rowid = OLD.id;
+            INSERT INTO printers_fts (rowid, name, dns, model, driver_name, location_name)
+            VALUES (
+                NEW.id, NEW.name, NEW.dns, NEW.model, NEW.driver_name,
+                (SELECT name FROM locations WHERE id = NEW.location_id)
+            );
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS printers_fts_delete AFTER DELETE ON printers
+        BEGIN
+            DELETE FROM printers_fts WHERE rowid = OLD.id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS locations_fts_update AFTER UPDATE OF name ON locations
+        BEGIN
+            UPDATE printers_fts SET location_name = NEW.name
+            WHERE rowid IN (SELECT id FROM printers WHERE location_id = NEW.id);
+        END;
+        """,
+    ),
+]
+
+LATEST_VERSION: int = MIGRATIONS[-1][0]
+
+
+def _check_duplicate_dns(cursor: sqlite3.Cursor):
+    """Der eindeutige Index aus Migration 2 scheitert an bereits doppelten DNS/IPs."""
+    duplicates = cursor.execute(
+        "SELECT dns, group_concat(name, ', ') FROM printers "
+        "GROUP BY dns HAVING COUNT(*) > 1 ORDER BY dns;"
+    ).fetchall()
+    if duplicates:
+        listing = "; ".join(f"{dns} ({names})" for dns, names in duplicates)
+        raise MigrationError(
+            "Mehrere Drucker verwenden dieselbe DNS/IP. Bitte die doppelten "
+            f"Einträge bereinigen und die Anwendung neu starten: {listing}"
+        )
+
+
+# Prüfungen, die vor einer Migration laufen und sie mit einer verständlichen
+# Meldung abbrechen, statt sie an den Daten scheitern zu lassen
+PRECHECKS: dict[int, Callable[[sqlite3.Cursor], None]] = {
+    2: _check_duplicate_dns,
+}
+
+
+def split_statements(script: str) -> list[str]:
+    """Zerlegt ein SQL-Skript in einzelne Anweisungen (auch Trigger mit BEGIN ... END)."""
+    statements = []
+    buffer = ""
+
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+
+    if buffer.strip():
+        statements.append(buffer.strip())
+
+    return statements
+
+
+def get_schema_version(cursor: sqlite3.Cursor) -> int:
+    cursor.row_factory = None
+    (version,) = cursor.execute("PRAGMA user_version;").fetchone()
+    return version
+
+
+def apply_migrations(cursor: sqlite3.Cursor) -> int:
+    """
+    Wendet alle ausstehenden Migrationen in einer Transaktion an.
+
+    Ist das Schema bereits aktuell, bleibt es bei einer einzigen Abfrage von
+    `PRAGMA user_version`. Gibt die Schemaversion nach der Migration zurück.
+    """
+    version = get_schema_version(cursor)
+    if version >= LATEST_VERSION:
+        return version
+
+    try:
+        # Andere Clients sperren und die Version innerhalb der Transaktion erneut lesen
+        cursor.execute("BEGIN IMMEDIATE;")
+        version = get_schema_version(cursor)
+
+        for migration_version, script in MIGRATIONS:
+            if migration_version <= version:
+                continue
+
+            if migration_version in PRECHECKS:
+                PRECHECKS[migration_version](cursor)
+
+            sql = script() if callable(script) else script
+            for statement in split_statements(sql):
+                cursor.execute(statement)
+
+            cursor.execute(f"PRAGMA user_version = {migration_version};")
+            version = migration_version
+
+        cursor.execute("COMMIT;")
+        return version
+
+    except MigrationError:
+        if cursor.connection.in_transaction:
+            cursor.connection.rollback()
+        raise
+    except (OSError, sqlite3.Error) as e:
+        if cursor.connection.in_transaction:
+            cursor.connection.rollback()
+        raise MigrationError(
+            f"Die Datenbank konnte nicht auf Version {LATEST_VERSION} aktualisiert werden: {e}"
+        ) from e
+
+
+def migrate_db() -> int | None:
+    """
+    Bringt die Datenbank beim Start auf den aktuellen Stand.
+
+    Gibt None zurück, wenn die Datenbank nicht erreichbar ist; die Anwendung
+    arbeitet dann mit der lokalen Kopie weiter. Scheitert eine Migration (z.B.
+    an doppelten DNS/IPs), wird MigrationError mit der Ursache ausgelöst.
+    """
+    try:
+        with get_db_cursor() as cursor:
+            return apply_migrations(cursor)
+
+    except sqlite3.OperationalError:
+        return None
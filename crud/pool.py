@@ -0,0 +1,132 @@
+import sqlite3
+import threading
+import time
+import weakref
+
+# Primäre Fehlercodes, nach denen eine Verbindung nicht weiterverwendet wird
+# (z.B. wenn die Freigabe kurz weg war und das Datei-Handle ungültig ist)
+STALE_ERROR_CODES = {
+    sqlite3.SQLITE_IOERR,
+    sqlite3.SQLITE_CORRUPT,
+    sqlite3.SQLITE_CANTOPEN,
+    sqlite3.SQLITE_NOTADB,
+}
+
+
+def is_stale_handle_error(error: sqlite3.Error) -> bool:
+    """Prüft, ob ein Fehler auf eine unbrauchbar gewordene Verbindung hinweist."""
+    if isinstance(error, sqlite3.ProgrammingError):
+        # z.B. "Cannot operate on a closed database."
+        return True
+
+    error_code = getattr(error, "sqlite_errorcode", None)
+    if error_code is None:
+        return False
+
+    return (error_code & 0xFF) in STALE_ERROR_CODES
+
+
+class _ConnectionHolder:
+    """Hält die Verbindung eines Threads und schließt sie, sobald der Thread endet."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.last_used = time.monotonic()
+
+    def close(self):
+        try:
+            self.connection.close()
+        except sqlite3.Error:
+            pass
+
+    def __del__(self):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Hält pro Thread eine langlebige Verbindung zu einer SQLite-Datenbank.
+
+    Verbindungen werden beim ersten Zugriff eines Threads geöffnet und danach
+    wiederverwendet. Ist eine Verbindung länger als `health_check_interval`
+    Sekunden unbenutzt, wird sie vor der nächsten Verwendung geprüft und bei
+    Bedarf neu aufgebaut.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        uri: bool = False,
+        row_factory=None,
+        health_check_interval: float = 30.0,
+    ):
+        self.database = database
+        self.uri = uri
+        self.row_factory = row_factory
+        self.health_check_interval = health_check_interval
+
+        self._local = threading.local()
+        self._holders: weakref.WeakSet[_ConnectionHolder] = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # Die Verbindung wird nur vom eigenen Thread benutzt, darf aber beim
+        # Herunterfahren aus dem Hauptthread geschlossen werden.
+        conn = sqlite3.connect(self.database, uri=self.uri, check_same_thread=False)
+        conn.row_factory = self.row_factory
+        return conn
+
+    @staticmethod
+    def is_healthy(conn: sqlite3.Connection) -> bool:
+        """Prüft eine Verbindung mit einem Zugriff, der die Datenbankdatei berührt."""
+        try:
+            conn.execute("PRAGMA schema_version;").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self) -> sqlite3.Connection:
+        """Gibt die Verbindung des aktuellen Threads zurück (und öffnet sie bei Bedarf)."""
+        if self._closed:
+            raise sqlite3.ProgrammingError(
+                "Der Verbindungspool wurde bereits geschlossen."
+            )
+
+        holder: _ConnectionHolder | None = getattr(self._local, "holder", None)
+        now = time.monotonic()
+
+        if holder and now - holder.last_used > self.health_check_interval:
+            if not self.is_healthy(holder.connection):
+                self.invalidate()
+                holder = None
+
+        if holder is None:
+            holder = _ConnectionHolder(self._connect())
+            self._local.holder = holder
+            with self._lock:
+                self._holders.add(holder)
+
+        holder.last_used = now
+        return holder.connection
+
+    def invalidate(self):
+        """Verwirft die Verbindung des aktuellen Threads, der nächste Zugriff verbindet neu."""
+        holder: _ConnectionHolder | None = getattr(self._local, "holder", None)
+        if holder is None:
+            return
+
+        self._local.holder = None
+        with self._lock:
+            self._holders.discard(holder)
+        holder.close()
+
+    def close_all(self):
+        """Schließt alle Verbindungen des Pools, weitere Zugriffe sind danach nicht möglich."""
+        with self._lock:
+            self._closed = True
+            holders = list(self._holders)
+            self._holders.clear()
+
+        for holder in holders:
+            holder.close()
@@ -1,63 +1,130 @@
+import re
 import sqlite3
-from .database import get_db_cursor
+from .database import get_db_cursor, get_read_cursor
 
 TABLE_NAME = "printers"
 
+FTS_TABLE_NAME = "printers_fts"
 
-def get_printers():
-    with get_db_cursor() as cursor:
+# Anzahl der Zeilen, die iter_printers() pro Abfrage lädt
+PAGE_SIZE = 500
 
-        stmt = cursor.execute(f"SELECT * FROM {TABLE_NAME};")
-        return stmt.fetchall()
+# Maximale Trefferzahl von search_printers()
+SEARCH_LIMIT = 1000
 
+# Wortbestandteile, so wie sie der FTS-Tokenizer (unicode61) trennt
+_TOKEN_PATTERN = re.compile(r"\w+")
 
-def get_printers_by_location_id(location_id: int):
-    with get_db_cursor() as cursor:
-        stmt = cursor.execute(
-            f"SELECT * FROM {TABLE_NAME} WHERE location_id = (?)", (location_id,)
+
+class PrinterConflictError(ValueError):
+    """Wird ausgelöst, wenn ein Drucker gegen eine Einschränkung verstößt, z.B. doppelte DNS/IP."""
+
+
+def _conflict(data: dict, error: sqlite3.IntegrityError) -> PrinterConflictError:
+    if "printers.dns" in str(error):
+        return PrinterConflictError(
+            f"Die DNS/IP '{data.get('dns')}' ist bereits einem anderen Drucker zugeordnet."
         )
+    return PrinterConflictError(f"Der Drucker konnte nicht gespeichert werden: {error}")
+
+
+def get_printers():
+    return list(iter_printers())
+
+
+def get_printers_by_location_id(location_id: int):
+    return list(iter_printers(location_id=location_id))
+
+
+def page_printers(
+    after_id: int = 0, limit: int = PAGE_SIZE, location_id: int | None = None
+):
+    """
+    Liefert höchstens `limit` Drucker mit einer ID größer als `after_id`, nach ID sortiert.
+
+    Die nächste Seite beginnt bei der ID des letzten Eintrags (Keyset-Paginierung),
+    dadurch bleibt jede Abfrage gleich schnell, egal wie weit hinten sie liegt.
+    """
+    with get_read_cursor() as cursor:
+        if location_id is None:
+            stmt = cursor.execute(
+                f"SELECT * FROM {TABLE_NAME} WHERE id > (?) ORDER BY id LIMIT (?)",
+                (after_id, limit),
+            )
+        else:
+            stmt = cursor.execute(
+                f"SELECT * FROM {TABLE_NAME} WHERE location_id = (?) AND id > (?) "
+                f"ORDER BY id LIMIT (?)",
+                (location_id, after_id, limit),
+            )
 
         return stmt.fetchall()
 
 
+def iter_printers(location_id: int | None = None, chunk_size: int = PAGE_SIZE):
+    """
+    Durchläuft alle Drucker (optional nur eines Standorts) seitenweise nach ID.
+
+    Es liegen nie mehr als `chunk_size` Zeilen gleichzeitig im Speicher, und
+    zwischen zwei Seiten wird keine Datenbanksperre gehalten.
+    """
+    after_id = 0
+
+    while True:
+        page = page_printers(after_id, chunk_size, location_id)
+        if not page:
+            return
+
+        yield from page
+
+        if len(page) < chunk_size:
+            return
+        after_id = page[-1]["id"]
+
+
 def get_printer_by_id(id: int):
-    with get_db_cursor() as cursor:
+    with get_read_cursor() as cursor:
         stmt = cursor.execute(f"SELECT * FROM {TABLE_NAME} WHERE id = (?)", (id,))
 
         return stmt.fetchone()
 
 
 def get_printer_by_name(name: str):
-    with get_db_cursor() as cursor:
+    with get_read_cursor() as cursor:
         stmt = cursor.execute(f"SELECT * FROM {TABLE_NAME} WHERE name = (?)", (name,))
 
         return stmt.fetchone()
 
 
 def get_printer_by_dns(dns: str):
-    with get_db_cursor() as cursor:
+    with get_read_cursor() as cursor:
         stmt = cursor.execute(f"SELECT * FROM {TABLE_NAME} WHERE dns = (?)", (dns,))
 
         return stmt.fetchone()
 
 
 def create_printer(data: dict):
+    """Legt einen Drucker an; bei doppelter DNS/IP wird PrinterConflictError ausgelöst."""
 
-    new_printer_id = None
+    new_printer = None
 
-    try:
-        with get_db_cursor() as cursor:
+    with get_db_cursor() as cursor:
+        try:
             cursor.execute(
-                f"INSERT INTO {TABLE_NAME} ({", ".join(data.keys())}) VALUES (?,?,?,?,?,?)",
+                f"INSERT INTO {TABLE_NAME} ({', '.join(data.keys())}) VALUES (?,?,?,?,?,?)",
                 tuple(data.values()),
             )
-            new_printer_id = cursor.lastrowid
+        except sqlite3.IntegrityError as e:
+            # Kein sqlite3.Error, damit get_db_cursor() ihn nicht verschluckt
+            raise _conflict(data, e) from e
 
-        if new_printer_id:
-            return get_printer_by_id(new_printer_id)
+        # Direkt von der Primärdatenbank lesen, die lokale Kopie ist noch nicht abgeglichen
+        stmt = cursor.execute(
+            f"SELECT * FROM {TABLE_NAME} WHERE id = (?)", (cursor.lastrowid,)
+        )
+        new_printer = stmt.fetchone()
 
-    except sqlite3.IntegrityError:
-        return
+    return new_printer
 
 
 def delete_printer(id: int):
@@ -66,13 +133,54 @@ def delete_printer(id: int):
 
 
 def update_printer(id: int, data: dict):
-    try:
-        with get_db_cursor() as cursor:
-            set_clause = ", ".join([f"{key} = ?" for key in data.keys()])
+    """Ändert einen Drucker; bei doppelter DNS/IP wird PrinterConflictError ausgelöst."""
+    with get_db_cursor() as cursor:
+        set_clause = ", ".join([f"{key} = ?" for key in data.keys()])
+        try:
             cursor.execute(
                 f"UPDATE {TABLE_NAME} SET {set_clause} WHERE id = ?",
                 (*data.values(), id),
             )
+        except sqlite3.IntegrityError as e:
+            raise _conflict(data, e) from e
+
+
+def build_search_query(text: str) -> str:
+    """
+    Übersetzt eine Eingabe aus dem Suchfeld in eine FTS5-Abfrage.
+
+    Jedes Wort wird zu einer Phrase seiner Bestandteile mit Präfixsuche
+    ("prn-04.lan" -> "prn 04 lan" *), alle Wörter müssen vorkommen.
+    """
+    phrases = []
+
+    for word in text.split():
+        tokens = _TOKEN_PATTERN.findall(word)
+        if tokens:
+            phrases.append(f'"{" ".join(tokens)}" *')
+
+    return " ".join(phrases)
+
+
+def search_printers(query: str, limit: int = SEARCH_LIMIT):
+    """
+    Durchsucht Name, DNS, Modell, Treibername und Standort aller Drucker.
+
+    Die Treffer sind nach Relevanz sortiert (bm25); jedes Wort der Eingabe
+    wird auch als Wortanfang gefunden.
+    """
+    fts_query = build_search_query(query)
+    if not fts_query:
+        return []
+
+    with get_read_cursor() as cursor:
+        stmt = cursor.execute(
+            f"SELECT p.* FROM {FTS_TABLE_NAME} "
+            f"JOIN {TABLE_NAME} p ON p.id = {FTS_TABLE_NAME}.rowid "
+            f"WHERE {FTS_TABLE_NAME} MATCH (?) ORDER BY rank LIMIT (?)",
+            (fts_query, limit),
+        )
+
+        return stmt.fetchall()
 
-    except sqlite3.IntegrityError:
-        return
+    return []
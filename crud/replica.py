@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .pool import ConnectionPool
+
+
+class Replica:
+    """
+    Lokale Kopie der Datenbank auf der Netzwerkfreigabe.
+
+    Lesezugriffe werden aus der lokalen Kopie beantwortet. Vor einem Zugriff wird
+    (höchstens alle `check_interval` Sekunden) ein Fingerabdruck der Primärdatenbank
+    aus Änderungszeit, Dateigröße und `PRAGMA data_version` gebildet; nur wenn er
+    sich geändert hat, wird die Kopie über die SQLite-Backup-API erneuert.
+
+    Ist die Primärdatenbank nicht erreichbar, wird mit der letzten gültigen Kopie
+    weitergearbeitet und `offline` gesetzt. Gibt es noch keine Kopie, ist
+    `available` False.
+    """
+
+    def __init__(
+        self, primary: str, path: str, row_factory=None, check_interval: float = 2.0
+    ):
+        self.primary = primary
+        self.path = path
+        self.check_interval = check_interval
+        self.offline = False
+
+        # Lesende Verbindungen öffnen die Kopie nur lesend, damit bei fehlender
+        # Kopie keine leere Datenbankdatei angelegt wird.
+        self.pool = ConnectionPool(
+            f"{Path(os.path.abspath(path)).as_uri()}?mode=ro",
+            uri=True,
+            row_factory=row_factory,
+        )
+
+        self._state_path = f"{path}.json"
+        self._lock = threading.Lock()
+        self._source: sqlite3.Connection | None = None
+        self._fingerprint: tuple | None = None
+        self._last_check = 0.0
+        self._stale = True
+
+    @property
+    def available(self) -> bool:
+        """Gibt an, ob bereits eine lokale Kopie existiert."""
+        return os.path.exists(self.path)
+
+    def mark_stale(self):
+        """Erzwingt einen Abgleich beim nächsten Lesezugriff (z.B. nach eigenen Schreibzugriffen)."""
+        self._stale = True
+
+    def ensure_fresh(self):
+        """Gleicht die lokale Kopie bei Bedarf mit der Primärdatenbank ab."""
+        with self._lock:
+            now = time.monotonic()
+            if not self._stale and now - self._last_check < self.check_interval:
+                return
+            self._last_check = now
+
+            try:
+                fingerprint = self._read_fingerprint()
+
+                if self._needs_copy(fingerprint):
+                    self._copy_from_primary()
+                    self._save_state(fingerprint)
+
+                self._fingerprint = fingerprint
+                self._stale = False
+                self.offline = False
+
+            except (OSError, sqlite3.Error):
+                # Freigabe nicht erreichbar: mit der letzten Kopie weiterarbeiten
+                self._close_source()
+                self.offline = True
+
+    def close(self):
+        with self._lock:
+            self._close_source()
+        self.pool.close_all()
+
+    def _needs_copy(self, fingerprint: tuple) -> bool:
+        if not os.path.exists(self.path):
+            return True
+
+        if self._fingerprint is None:
+            # Erster Abgleich nach dem Start: `data_version` ist nur innerhalb einer
+            # Verbindung vergleichbar, daher zählen hier Zeitstempel und Größe.
+            return self._load_state() != list(fingerprint[:2])
+
+        return fingerprint != self._fingerprint
+
+    def _read_fingerprint(self) -> tuple:
+        stat = os.stat(self.primary)
+
+        if self._source is None:
+            self._source = sqlite3.connect(self.primary, check_same_thread=False)
+
+        (data_version,) = self._source.execute("PRAGMA data_version;").fetchone()
+        return (stat.st_mtime_ns, stat.st_size, data_version)
+
+    def _copy_from_primary(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        target = sqlite3.connect(self.path)
+        try:
+            self._source.backup(target)
+        finally:
+            target.close()
+
+    def _close_source(self):
+        if self._source is not None:
+            try:
+                self._source.close()
+            except sqlite3.Error:
+                pass
+            self._source = None
+
+    def _load_state(self) -> list | None:
+        try:
+            with open(self._state_path, "r") as f:
+                return json.load(f).get("fingerprint")
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self, fingerprint: tuple):
+        try:
+            with open(self._state_path, "w") as f:
+                json.dump({"fingerprint": list(fingerprint[:2])}, f)
+        except OSError:
+            pass
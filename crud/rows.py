@@ -0,0 +1,104 @@
+import threading
+from operator import itemgetter
+from typing import Any, Iterator
+
+
+class Record(tuple):
+    """
+    Kompakte, unveränderliche Ergebniszeile.
+
+    Die Werte liegen wie bei einem Tupel direkt im Objekt, der Zugriff erfolgt
+    wahlweise über den Spaltennamen (`row["name"]`, `row.name`) oder den Index.
+    Über `keys()` und `__getitem__` verhält sich ein Record wie ein Mapping, damit
+    `Printer.from_dict(row)`, `dict(row)` und `**row` unverändert funktionieren.
+    """
+
+    __slots__ = ()
+
+    _fields: tuple[str, ...] = ()
+    _index: dict[str, int] = {}
+
+    def __getitem__(self, key):
+        # Zugriff über den Namen ist der Regelfall, Index und Slices der Ausnahmefall
+        index = self._index.get(key) if key.__class__ is str else key
+        if index is None:
+            raise KeyError(key)
+        return tuple.__getitem__(self, index)
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def get(self, key: str, default: Any = None) -> Any:
+        index = self._index.get(key)
+        return default if index is None else tuple.__getitem__(self, index)
+
+    def keys(self) -> tuple[str, ...]:
+        return self._fields
+
+    def values(self) -> tuple:
+        return tuple(self)
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        return zip(self._fields, self)
+
+    def to_dict(self) -> dict[str, Any]:
+        return dict(zip(self._fields, self))
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{key}={value!r}" for key, value in self.items())
+        return f"{type(self).__name__}({values})"
+
+
+def make_record_class(fields: tuple[str, ...]) -> type[Record]:
+    """Erzeugt eine Record-Klasse für die gegebenen Spaltennamen."""
+    namespace = {
+        "__slots__": (),
+        "_fields": fields,
+        "_index": {name: idx for idx, name in enumerate(fields)},
+    }
+
+    # Attributzugriff wie bei namedtuple, sofern der Name nicht schon belegt ist
+    for idx, name in enumerate(fields):
+        if name.isidentifier() and not hasattr(Record, name):
+            namespace[name] = property(itemgetter(idx))
+
+    return type("Record", (Record,), namespace)
+
+
+class RecordFactory:
+    """
+    `row_factory` für sqlite3, die Zeilen als `Record` erzeugt.
+
+    Die Zuordnung von Spaltennamen zu Positionen wird pro Anweisung einmal
+    berechnet (`cursor.description` bleibt für alle Zeilen einer Abfrage
+    dasselbe Objekt) und für gleiche Spaltenlisten wiederverwendet.
+    """
+
+    def __init__(self):
+        self._classes: dict[tuple[str, ...], type[Record]] = {}
+        self._lock = threading.Lock()
+        self._last: tuple[Any, type[Record] | None] = (None, None)
+
+    def record_class(self, description) -> type[Record]:
+        fields = tuple(column[0] for column in description)
+
+        cls = self._classes.get(fields)
+        if cls is None:
+            with self._lock:
+                cls = self._classes.setdefault(fields, make_record_class(fields))
+
+        return cls
+
+    def __call__(self, cursor, row) -> Record:
+        description = cursor.description
+        last_description, cls = self._last
+
+        if description is not last_description:
+            cls = self.record_class(description)
+            # Als ein Tupel speichern, damit parallele Threads nie ein halbes Paar sehen
+            self._last = (description, cls)
+
+        return tuple.__new__(cls, row)
+
+
+record_factory = RecordFactory()
@@ -0,0 +1,419 @@
+# installer/batch.py
+
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable
+
+from models.location import Location
+from models.printer import Printer
+
+from .planner import (
+    STEP_DRIVER,
+    STEP_PORT,
+    STEP_PRINTER,
+    STEP_REMOVE_PRINTER,
+    InstallStep,
+    SystemState,
+    plan_installation,
+    port_name,
+    printer_queue_name,
+)
+from .process import ChildProcess
+
+# Höchstzahl gleichzeitig eingerichteter Ports bzw. Warteschlangen
+DEFAULT_PARALLELISM = 4
+
+# Ergebnis pro Drucker
+RESULT_INSTALLED = "installiert"
+RESULT_UNCHANGED = "bereits vorhanden"
+RESULT_FAILED = "fehlgeschlagen"
+
+
+# Zeitlimit pro Schritt in Sekunden; pnputil braucht bei großen Paketen lange
+STEP_TIMEOUTS = {
+    STEP_PORT: 60.0,
+    STEP_DRIVER: 600.0,
+    STEP_REMOVE_PRINTER: 60.0,
+    STEP_PRINTER: 180.0,
+}
+
+# Meldungen vorübergehender Fehler (Spooler/RPC nicht erreichbar, Zeitlimit),
+# bei denen ein Schritt wiederholt wird
+TRANSIENT_ERRORS = (
+    r"RPC|Spooler|0x800706BA|0x800706BE|0x80070079|Zeitüberschreitung|Zeitlimit"
+    r"|timed out"
+)
+
+# Zeilen der Befehlsausgabe, die im Fehlerfall in die Meldung übernommen werden
+_ERROR_TAIL_LINES = 5
+
+
+class RetryPolicy:
+    """Wie oft und mit welchen Abständen vorübergehende Fehler wiederholt werden."""
+
+    def __init__(self, attempts: int = 3, delay: float = 2.0, backoff: float = 2.0):
+        self.attempts = max(1, attempts)
+        self.delay = delay
+        self.backoff = backoff
+
+    def delay_for(self, attempt: int) -> float:
+        """Wartezeit vor dem Versuch nach `attempt` fehlgeschlagenen Versuchen."""
+        return self.delay * self.backoff ** max(0, attempt - 1)
+
+    def is_transient(self, message: str) -> bool:
+        return re.search(TRANSIENT_ERRORS, message, re.IGNORECASE) is not None
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def step_timeout(
+    step: InstallStep, timeouts: dict[str, float] = STEP_TIMEOUTS
+) -> float:
+    return timeouts.get(step.kind, max(timeouts.values()))
+
+
+def command_args(command: str) -> str | list[str]:
+    """
+    Befehlszeile eines Schritts für Popen ohne Shell: Windows zerlegt die
+    Zeichenkette selbst (CreateProcess), POSIX braucht eine Argumentliste.
+    """
+    return command if os.name == "nt" else shlex.split(command)
+
+
+def run_shell_command(
+    command: str,
+    timeout: float | None = None,
+    on_output: Callable[[str], None] | None = None,
+):
+    """
+    Führt einen Befehl (ohne Shell) aus und meldet jede Zeile von
+    stdout/stderr sofort an `on_output`. Ein Exit-Code ungleich 0 löst
+    CalledProcessError aus (mit den letzten Ausgabezeilen), eine
+    Überschreitung von `timeout` TimeoutExpired; der Prozess wird dann samt
+    Kindprozessen beendet.
+    """
+    process = ChildProcess(command_args(command))
+
+    def expire():
+        if process.poll() is None:
+            process.kill()
+
+    timer = threading.Timer(timeout, expire) if timeout else None
+    if timer:
+        timer.daemon = True
+        timer.start()
+
+    tail: list[str] = []
+    try:
+        for line in process.lines():
+            line = line.rstrip()
+            if not line:
+                continue
+            tail = (tail + [line])[-_ERROR_TAIL_LINES:]
+            if on_output:
+                on_output(line)
+        exit_code = process.wait()
+    finally:
+        if timer:
+            timer.cancel()
+
+    if process.killed.is_set():
+        raise subprocess.TimeoutExpired(command, timeout)
+    if exit_code:
+        raise subprocess.CalledProcessError(
+            exit_code, command, output="\n".join(tail), stderr="\n".join(tail)
+        )
+
+
+class BatchItem:
+    """Ein Drucker der Sammelinstallation mit seinen eigenen Schritten."""
+
+    __slots__ = ("printer", "location", "queue_name", "port", "driver", "steps")
+
+    def __init__(
+        self,
+        printer: Printer,
+        location: Location,
+        port: str | None,
+        driver: str | None,
+        steps: list[InstallStep],
+    ):
+        self.printer = printer
+        self.location = location
+        self.queue_name = printer_queue_name(printer, location)
+        # Schlüssel der gemeinsamen Port- bzw. Treiberschritte, von denen er abhängt
+        self.port = port
+        self.driver = driver
+        self.steps = steps
+
+
+class BatchPlan:
+    """
+    Plan für viele Drucker: gemeinsame Port- und Treiberschritte (jeder nur
+    einmal) und danach die Warteschlangen der einzelnen Drucker.
+    """
+
+    def __init__(self):
+        self.ports: dict[str, InstallStep] = {}
+        self.drivers: dict[str, InstallStep] = {}
+        self.items: list[BatchItem] = []
+
+    @property
+    def step_count(self) -> int:
+        return (
+            len(self.ports)
+            + len(self.drivers)
+            + sum(len(item.steps) for item in self.items)
+        )
+
+
+def driver_key(inf_path: str) -> str:
+    """Vergleichsschlüssel eines Treiberpakets (gleiche .inf, andere Schreibweise)."""
+    return os.path.normcase(os.path.normpath(inf_path.strip()))
+
+
+def plan_batch(
+    printers: Iterable[tuple[Printer, Location]],
+    state: SystemState,
+    stage_driver: Callable[[str], str] | None = None,
+) -> BatchPlan:
+    """
+    Plant die Installation vieler Drucker auf Grundlage von `plan_installation`.
+    Jedes Treiberpaket (`driver_inf_path`) wird nur einmal bereitgestellt
+    (und über `stage_driver` nur einmal kopiert), jeder Port nur einmal angelegt.
+    """
+    plan = BatchPlan()
+    staged: dict[str, str] = {}
+
+    def stage_once(inf_path: str) -> str:
+        key = driver_key(inf_path)
+        if key not in staged:
+            staged[key] = stage_driver(inf_path)
+        return staged[key]
+
+    for printer, location in printers:
+        port = driver = None
+        steps = []
+
+        for step in plan_installation(
+            printer, location, state, stage_once if stage_driver else None
+        ):
+            if step.kind == STEP_PORT:
+                port = port_name(printer).lower()
+                plan.ports.setdefault(port, step)
+            elif step.kind == STEP_DRIVER:
+                driver = driver_key(printer.driver_inf_path)
+                plan.drivers.setdefault(driver, step)
+            else:
+                steps.append(step)
+
+        plan.items.append(BatchItem(printer, location, port, driver, steps))
+
+    return plan
+
+
+class BatchReport:
+    """Ergebnis der Sammelinstallation pro Drucker (Warteschlange)."""
+
+    def __init__(self):
+        self.results: list[tuple[str, str, str]] = []
+
+    def add(self, queue_name: str, result: str, message: str = ""):
+        self.results.append((queue_name, result, message))
+
+    def count(self, result: str) -> int:
+        return sum(1 for _, entry, _ in self.results if entry == result)
+
+    @property
+    def failed(self) -> int:
+        return self.count(RESULT_FAILED)
+
+    def summary(self) -> str:
+        return (
+            f"{self.count(RESULT_INSTALLED)} Drucker installiert, "
+            f"{self.count(RESULT_UNCHANGED)} bereits vorhanden, "
+            f"{self.failed} fehlgeschlagen."
+        )
+
+    def details(self) -> str:
+        return "\n".join(
+            f"{queue_name}: {result}" + (f" ({message})" if message else "")
+            for queue_name, result, message in self.results
+        )
+
+
+def filter_printers(
+    printers: Iterable[tuple[Printer, Location]],
+    check: Callable[[Printer], str | None],
+    report: BatchReport,
+) -> list[tuple[Printer, Location]]:
+    """
+    Gibt die Drucker zurück, für die `check` keine Fehlermeldung liefert; die
+    übrigen werden mit dieser Meldung als fehlgeschlagen in `report` vermerkt.
+    """
+    accepted = []
+    for printer, location in printers:
+        message = check(printer)
+        if message is None:
+            accepted.append((printer, location))
+        else:
+            report.add(printer_queue_name(printer, location), RESULT_FAILED, message)
+    return accepted
+
+
+def _wait(seconds: float, should_stop: Callable[[], bool] | None) -> bool:
+    """Wartet `seconds`, bricht bei `should_stop()` vorzeitig ab (dann True)."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if should_stop and should_stop():
+            return True
+        time.sleep(min(0.2, max(0.0, deadline - time.monotonic())))
+    return bool(should_stop and should_stop())
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, subprocess.TimeoutExpired):
+        return f"Zeitüberschreitung nach {error.timeout:g} s"
+    if isinstance(error, subprocess.CalledProcessError):
+        output = (error.stderr or error.output or "").strip()
+        return output or f"Exit-Code {error.returncode}"
+    return str(error)
+
+
+def _execute(
+    run_command: Callable[..., None],
+    step: InstallStep,
+    timeouts: dict[str, float],
+    policy: RetryPolicy,
+    should_stop: Callable[[], bool] | None,
+    on_start: Callable[[InstallStep], None] | None,
+    on_output: Callable[[InstallStep, str], None] | None,
+    on_retry: Callable[[InstallStep, int, str], None] | None,
+) -> str | None:
+    """
+    Führt einen Schritt aus, bei vorübergehenden Fehlern bis zu
+    `policy.attempts` Mal, und gibt im Fehlerfall die Meldung zurück.
+    """
+    if on_start:
+        on_start(step)
+
+    for attempt in range(1, policy.attempts + 1):
+        if should_stop and should_stop():
+            return "abgebrochen"
+
+        try:
+            run_command(
+                step.command,
+                step_timeout(step, timeouts),
+                (lambda line: on_output(step, line)) if on_output else None,
+            )
+            return None
+        except (subprocess.SubprocessError, OSError) as e:
+            message = _error_message(e)
+            transient = isinstance(e, subprocess.TimeoutExpired) or policy.is_transient(
+                message
+            )
+            if not transient or attempt == policy.attempts:
+                return message
+
+        if on_retry:
+            on_retry(step, attempt + 1, message)
+        if _wait(policy.delay_for(attempt), should_stop):
+            return "abgebrochen"
+
+
+def run_batch(
+    plan: BatchPlan,
+    run_command: Callable[..., None] = run_shell_command,
+    parallelism: int = DEFAULT_PARALLELISM,
+    should_stop: Callable[[], bool] | None = None,
+    on_step: Callable[[], None] | None = None,
+    on_result: Callable[[str, str, str], None] | None = None,
+    report: BatchReport | None = None,
+    on_start: Callable[[InstallStep], None] | None = None,
+    on_output: Callable[[InstallStep, str], None] | None = None,
+    on_retry: Callable[[InstallStep, int, str], None] | None = None,
+    timeouts: dict[str, float] = STEP_TIMEOUTS,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+) -> BatchReport:
+    """
+    Führt einen BatchPlan Befehl für Befehl aus: erst alle Ports (parallel),
+    dann die Treiberpakete (nacheinander, pnputil verträgt keine parallelen
+    Aufrufe), dann die Warteschlangen mit höchstens `parallelism` gleichzeitig.
+
+    Schlägt ein Port oder Treiber fehl, scheitern nur die Drucker, die ihn
+    brauchen. Jeder Schritt hat ein Zeitlimit aus `timeouts`; vorübergehende
+    Fehler werden nach `policy` wiederholt.
+
+    `on_start` meldet den Beginn eines Schritts, `on_output` jede Zeile seiner
+    Ausgabe, `on_retry` eine Wiederholung. `on_step` wird nach jedem geplanten
+    Schritt gerufen, auch wenn er übersprungen wurde, `on_result` nach jedem
+    Drucker. Alle können aus Arbeitsthreads kommen.
+    """
+    report = report if report is not None else BatchReport()
+    failures: dict[str, str] = {}
+
+    def execute(step: InstallStep) -> str | None:
+        return _execute(
+            run_command,
+            step,
+            timeouts,
+            policy,
+            should_stop,
+            on_start,
+            on_output,
+            on_retry,
+        )
+
+    def step_done():
+        if on_step:
+            on_step()
+
+    def finish(item: BatchItem, result: str, message: str = ""):
+        report.add(item.queue_name, result, message)
+        if on_result:
+            on_result(item.queue_name, result, message)
+
+    def run_shared(key: str, step: InstallStep):
+        error = execute(step)
+        if error is not None:
+            failures[key] = f"{step.description}: {error}"
+        step_done()
+
+    def run_item(item: BatchItem) -> tuple[str, str]:
+        for key in (item.port, item.driver):
+            if key is not None and key in failures:
+                for _ in item.steps:
+                    step_done()
+                return RESULT_FAILED, failures[key]
+
+        if not item.steps:
+            return RESULT_UNCHANGED, ""
+
+        for index, step in enumerate(item.steps):
+            error = execute(step)
+            step_done()
+            if error is not None:
+                for _ in item.steps[index + 1 :]:
+                    step_done()
+                return RESULT_FAILED, f"{step.description}: {error}"
+
+        return RESULT_INSTALLED, ""
+
+    with ThreadPoolExecutor(max_workers=max(1, parallelism)) as executor:
+        list(executor.map(lambda entry: run_shared(*entry), plan.ports.items()))
+
+        for key, step in plan.drivers.items():
+            run_shared(key, step)
+
+        futures = {executor.submit(run_item, item): item for item in plan.items}
+        for future in as_completed(futures):
+            finish(futures[future], *future.result())
+
+    return report
@@ -0,0 +1,312 @@
+# installer/driver_cache.py
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Callable
+
+# Lokale Kopien der Treiberpakete (pro Rechner)
+DRIVER_CACHE_DIR: str = os.path.join(
+    os.environ.get("LOCALAPPDATA") or tempfile.gettempdir(),
+    "DruckerVerwaltung",
+    "drivers",
+)
+
+# Obergrenze für den Platzbedarf aller Pakete; darüber werden die am längsten
+# nicht benutzten Pakete entfernt
+DEFAULT_MAX_SIZE = 4 * 1024**3
+
+# Blockgröße beim Kopieren (wiederaufnehmbar in Schritten dieser Größe)
+CHUNK_SIZE = 1024**2
+
+INDEX_NAME = "index.json"
+
+# Teilkopien, die so lange (Sekunden) nicht fortgesetzt wurden, werden verworfen
+STAGING_MAX_AGE = 7 * 24 * 3600
+
+
+class DriverCache:
+    """
+    Spiegelt das Verzeichnis einer .inf-Datei (z.B. auf einer Netzwerkfreigabe)
+    in ein lokales Verzeichnis, benannt nach dem Inhaltshash des Pakets.
+
+    Ob die lokale Kopie noch aktuell ist, wird zuerst über Größe und
+    Änderungszeit der Quelldateien geprüft; nur geänderte Dateien werden neu
+    gelesen und gehasht. Ergibt sich derselbe Inhalt (auch aus einer anderen
+    Quelle), wird das vorhandene Paket verwendet. Dateien werden blockweise
+    in `.part`-Dateien kopiert; ein abgebrochener Kopiervorgang setzt beim
+    nächsten Aufruf dort fort. Überschreiten die Pakete `max_size`, werden die
+    am längsten nicht benutzten entfernt.
+    """
+
+    def __init__(
+        self,
+        root: str = DRIVER_CACHE_DIR,
+        max_size: int = DEFAULT_MAX_SIZE,
+        chunk_size: int = CHUNK_SIZE,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.root = root
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "packages"), exist_ok=True)
+
+        # Quellverzeichnis -> {"package": Hash, "files": {Pfad: [Größe, mtime, Hash]}}
+        self._sources: dict[str, dict] = {}
+        # Hash -> {"size": Bytes, "last_used": Zeitpunkt}
+        self._packages: dict[str, dict] = {}
+        self._load_index()
+        self._cleanup()
+
+    # --- Index -------------------------------------------------------------
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.root, INDEX_NAME), encoding="utf-8") as f:
+                index = json.load(f)
+            self._sources = index["sources"]
+            self._packages = index["packages"]
+        except (OSError, ValueError, KeyError):
+            self._sources, self._packages = {}, {}
+
+    def _save_index(self):
+        path = os.path.join(self.root, INDEX_NAME)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"sources": self._sources, "packages": self._packages}, f)
+        os.replace(temp_path, path)
+
+    def _cleanup(self):
+        """
+        Entfernt Reste abgebrochener Läufe: Paketverzeichnisse, die nicht im
+        Index stehen (auch halbfertige `.tmp`), Indexeinträge ohne
+        Verzeichnis und lange nicht fortgesetzte Teilkopien.
+        """
+        packages_dir = os.path.join(self.root, "packages")
+        for name in os.listdir(packages_dir):
+            if name not in self._packages:
+                shutil.rmtree(os.path.join(packages_dir, name), ignore_errors=True)
+
+        for package in list(self._packages):
+            if not os.path.isdir(self._package_dir(package)):
+                del self._packages[package]
+        self._drop_orphaned_sources()
+
+        staging_root = os.path.join(self.root, "staging")
+        if not os.path.isdir(staging_root):
+            return
+        cutoff = self._clock() - STAGING_MAX_AGE
+        for name in os.listdir(staging_root):
+            staging = os.path.join(staging_root, name)
+            if _newest_mtime(staging) < cutoff:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _drop_orphaned_sources(self):
+        for key in [
+            key
+            for key, entry in self._sources.items()
+            if entry["package"] not in self._packages
+        ]:
+            del self._sources[key]
+
+    # --- Pakete ------------------------------------------------------------
+
+    def _package_dir(self, package: str) -> str:
+        return os.path.join(self.root, "packages", package)
+
+    def _has_package(self, package: str | None) -> bool:
+        return package in self._packages and os.path.isdir(self._package_dir(package))
+
+    @property
+    def size(self) -> int:
+        """Platzbedarf aller Pakete in Bytes."""
+        return sum(package["size"] for package in self._packages.values())
+
+    def stage(self, inf_path: str) -> str:
+        """
+        Stellt das Paket von `inf_path` lokal bereit und gibt den Pfad der
+        lokalen .inf-Datei zurück.
+        """
+        source_dir = os.path.dirname(os.path.abspath(inf_path))
+        relative_inf = os.path.basename(inf_path)
+        key = os.path.normcase(source_dir)
+        listing = _scan(source_dir)
+
+        if relative_inf not in listing:
+            raise FileNotFoundError(f"Die Datei '{inf_path}' existiert nicht.")
+
+        with self._lock:
+            entry = self._sources.get(key)
+            if (
+                entry is None
+                or not self._has_package(entry["package"])
+                or not _unchanged(entry["files"], listing)
+            ):
+                entry = self._sources[key] = self._refresh(key, source_dir, listing)
+
+            package = entry["package"]
+            self._packages[package]["last_used"] = self._clock()
+            self._evict(keep=package)
+            self._save_index()
+
+        return os.path.join(self._package_dir(package), relative_inf)
+
+    def _refresh(self, key: str, source_dir: str, listing: dict) -> dict:
+        """Liest geänderte Dateien neu ein und legt bei neuem Inhalt ein Paket an."""
+        old = self._sources.get(key)
+        old_files = old["files"] if old and self._has_package(old["package"]) else {}
+        staging = os.path.join(
+            self.root, "staging", hashlib.sha1(key.encode()).hexdigest()[:16]
+        )
+
+        files = {}
+        parts = {}
+        for relative, (size, mtime) in sorted(listing.items()):
+            known = old_files.get(relative)
+            if known is not None and known[:2] == [size, mtime]:
+                files[relative] = known
+                continue
+
+            part = os.path.join(staging, f"{relative}.{size}-{mtime}.part")
+            file_hash = self._copy(os.path.join(source_dir, relative), part)
+            files[relative] = [size, mtime, file_hash]
+            parts[relative] = part
+
+        digest = hashlib.sha256()
+        for relative, (_, _, file_hash) in sorted(files.items()):
+            digest.update(f"{relative}\0{file_hash}\n".encode())
+        package = digest.hexdigest()[:16]
+
+        if not self._has_package(package):
+            self._build_package(package, files, parts, old["package"] if old else None)
+            self._packages[package] = {
+                "size": sum(size for size, _, _ in files.values()),
+                "last_used": self._clock(),
+            }
+
+        shutil.rmtree(staging, ignore_errors=True)
+        return {"package": package, "files": files}
+
+    def _build_package(
+        self, package: str, files: dict, parts: dict, old_package: str | None
+    ):
+        target = self._package_dir(package)
+        temp_target = f"{target}.tmp"
+        shutil.rmtree(temp_target, ignore_errors=True)
+
+        for relative in files:
+            destination = os.path.join(temp_target, relative)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if relative in parts:
+                os.replace(parts[relative], destination)
+            else:
+                # Unveränderte Datei aus dem bisherigen lokalen Paket übernehmen
+                shutil.copy2(
+                    os.path.join(self._package_dir(old_package), relative),
+                    destination,
+                )
+
+        # Ein Verzeichnis gleichen Inhalts ohne Indexeintrag (Index verloren
+        # oder Abbruch vor dem Speichern) wird ersetzt
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        os.replace(temp_target, target)
+
+    def _copy(self, source: str, part: str) -> str:
+        """
+        Kopiert `source` blockweise nach `part` und gibt den SHA-256 des
+        Inhalts zurück. Ein vorhandener Teil wird weiterverwendet.
+        """
+        os.makedirs(os.path.dirname(part), exist_ok=True)
+        digest = hashlib.sha256()
+        offset = 0
+
+        if os.path.exists(part):
+            with open(part, "rb") as f:
+                while chunk := f.read(self.chunk_size):
+                    digest.update(chunk)
+                    offset += len(chunk)
+
+        with open(source, "rb") as fin, open(part, "ab") as fout:
+            fin.seek(offset)
+            while chunk := fin.read(self.chunk_size):
+                fout.write(chunk)
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def _evict(self, keep: str):
+        total = self.size
+        for package in sorted(
+            self._packages, key=lambda package: self._packages[package]["last_used"]
+        ):
+            if total <= self.max_size:
+                break
+            if package == keep:
+                continue
+            total -= self._packages.pop(package)["size"]
+            shutil.rmtree(self._package_dir(package), ignore_errors=True)
+
+        self._drop_orphaned_sources()
+
+
+def _scan(directory: str) -> dict[str, tuple[int, int]]:
+    """Relativer Pfad -> (Größe, Änderungszeit in ns) aller Dateien unterhalb von `directory`."""
+    listing = {}
+    for current, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(current, name)
+            stat = os.stat(path)
+            listing[os.path.relpath(path, directory)] = (stat.st_size, stat.st_mtime_ns)
+    return listing
+
+
+def _newest_mtime(path: str) -> float:
+    """Jüngste Änderungszeit von `path` und allem darunter."""
+    newest = os.path.getmtime(path)
+    for current, _, names in os.walk(path):
+        for name in names:
+            try:
+                newest = max(newest, os.path.getmtime(os.path.join(current, name)))
+            except OSError:
+                pass
+    return newest
+
+
+def _unchanged(files: dict, listing: dict) -> bool:
+    return files.keys() == listing.keys() and all(
+        files[relative][:2] == list(listing[relative]) for relative in listing
+    )
+
+
+def stage_driver(inf_path: str) -> str:
+    """
+    Pfad der lokalen Kopie von `inf_path` für die Installationsbefehle. Kann
+    das Paket nicht zwischengespeichert werden, bleibt es beim Originalpfad.
+    """
+    try:
+        return get_driver_cache().stage(inf_path)
+    except OSError:
+        return inf_path
+
+
+_cache: DriverCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_driver_cache() -> DriverCache:
+    """Gibt den gemeinsamen DriverCache des Prozesses zurück."""
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = DriverCache()
+
+    return _cache
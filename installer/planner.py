@@ -0,0 +1,198 @@
+# installer/planner.py
+
+from typing import Callable, Iterable
+
+from models.location import Location
+from models.printer import Printer
+
+PRNPORT_SCRIPT = "C:/Windows/System32/Printing_Admin_Scripts/de-DE/prnport.vbs"
+
+# Arten von Installationsschritten
+STEP_PORT = "port"
+STEP_DRIVER = "driver"
+STEP_REMOVE_PRINTER = "remove_printer"
+STEP_PRINTER = "printer"
+
+
+class InstalledPrinter:
+    """Eine bereits eingerichtete Druckerwarteschlange."""
+
+    __slots__ = ("name", "port_name", "driver_name")
+
+    def __init__(self, name: str, port_name: str, driver_name: str):
+        self.name = name
+        self.port_name = port_name
+        self.driver_name = driver_name
+
+
+class SystemState:
+    """
+    Ist-Zustand des Rechners: vorhandene Druckerports, Druckertreiber und
+    Warteschlangen. Die Basisklasse hält feste Werte (z.B. für Tests),
+    `WmiSystemState` liest sie über WMI aus.
+    """
+
+    def __init__(
+        self,
+        ports: Iterable[str] = (),
+        drivers: Iterable[str] = (),
+        printers: Iterable[InstalledPrinter] = (),
+    ):
+        self._ports = {port.lower() for port in ports}
+        self._drivers = {driver.lower() for driver in drivers}
+        self._printers = {printer.name.lower(): printer for printer in printers}
+
+    def has_port(self, port_name: str) -> bool:
+        return port_name.lower() in self._ports
+
+    def has_driver(self, driver_name: str) -> bool:
+        return driver_name.lower() in self._drivers
+
+    def get_printer(self, name: str) -> InstalledPrinter | None:
+        return self._printers.get(name.lower())
+
+
+class WmiSystemState(SystemState):
+    """Liest Ports, Treiber und Warteschlangen einmalig über WMI (nur Windows)."""
+
+    def __init__(self):
+        import wmi
+
+        connection = wmi.WMI()
+        super().__init__(
+            ports=(port.Name for port in connection.Win32_TCPIPPrinterPort()),
+            # WMI liefert "Treibername,Version,Umgebung"
+            drivers=(
+                driver.Name.split(",")[0] for driver in connection.Win32_PrinterDriver()
+            ),
+            printers=(
+                InstalledPrinter(printer.Name, printer.PortName, printer.DriverName)
+                for printer in connection.Win32_Printer()
+            ),
+        )
+
+
+class InstallStep:
+    """
+    Ein einzelner Schritt der Installation mit Beschreibung für die Anzeige.
+    `command` ist der Shell-Befehl, `params` enthält dieselben Angaben
+    einzeln für Ausführungswege ohne Shell (z.B. ein erzeugtes Skript).
+    """
+
+    __slots__ = ("kind", "description", "command", "params")
+
+    def __init__(
+        self,
+        kind: str,
+        description: str,
+        command: str,
+        params: dict[str, str] | None = None,
+    ):
+        self.kind = kind
+        self.description = description
+        self.command = command
+        self.params = params or {}
+
+    def __repr__(self) -> str:
+        return f"InstallStep({self.kind!r}, {self.command!r})"
+
+
+def printer_queue_name(printer: Printer, location: Location) -> str:
+    """Name der Warteschlange, unter dem der Drucker installiert wird."""
+    return f"[{location.name}] {printer.name}"
+
+
+def port_name(printer: Printer) -> str:
+    return f"IP_{printer.dns}"
+
+
+def port_step(printer: Printer) -> InstallStep:
+    return InstallStep(
+        STEP_PORT,
+        f"Port {port_name(printer)} wird angelegt",
+        f'cscript "{PRNPORT_SCRIPT}" '
+        f"-a -r {port_name(printer)} -h {printer.dns} -o raw -n 9100",
+        {"port": port_name(printer), "host": printer.dns},
+    )
+
+
+def driver_step(printer: Printer, inf_path: str | None = None) -> InstallStep:
+    return InstallStep(
+        STEP_DRIVER,
+        f"Treiber '{printer.driver_name}' wird installiert",
+        f'pnputil /add-driver "{inf_path or printer.driver_inf_path}" /install',
+        {
+            "driver": printer.driver_name,
+            "inf_path": inf_path or printer.driver_inf_path,
+        },
+    )
+
+
+def remove_printer_step(queue_name: str) -> InstallStep:
+    return InstallStep(
+        STEP_REMOVE_PRINTER,
+        f"Veraltete Warteschlange '{queue_name}' wird entfernt",
+        f'rundll32 printui.dll,PrintUIEntry /dl /n "{queue_name}" /q',
+        {"printer": queue_name},
+    )
+
+
+def printer_step(
+    printer: Printer, location: Location, inf_path: str | None = None
+) -> InstallStep:
+    queue_name = printer_queue_name(printer, location)
+    return InstallStep(
+        STEP_PRINTER,
+        f"Warteschlange '{queue_name}' wird eingerichtet",
+        f'rundll32 printui.dll,PrintUIEntry /if /b "{queue_name}" /r "{port_name(printer)}" '
+        f'/f "{inf_path or printer.driver_inf_path}" /m "{printer.driver_name}" /z',
+        {
+            "printer": queue_name,
+            "port": port_name(printer),
+            "driver": printer.driver_name,
+            "inf_path": inf_path or printer.driver_inf_path,
+        },
+    )
+
+
+def plan_installation(
+    printer: Printer,
+    location: Location,
+    state: SystemState,
+    stage_driver: Callable[[str], str] | None = None,
+) -> list[InstallStep]:
+    """
+    Ermittelt die Schritte, die für die Installation noch fehlen.
+
+    Vorhandene Ports und Treiber werden übersprungen. Eine Warteschlange
+    gleichen Namens mit passendem Port und Treiber gilt als installiert;
+    passt sie nicht, wird sie entfernt und neu eingerichtet. Eine leere
+    Liste bedeutet: nichts zu tun.
+
+    Wird das Treiberpaket gebraucht, liefert `stage_driver` (falls angegeben)
+    den Pfad der .inf-Datei, den die Befehle verwenden, z.B. eine lokale Kopie.
+    """
+    needs_port = not state.has_port(port_name(printer))
+    needs_driver = not state.has_driver(printer.driver_name)
+
+    queue_name = printer_queue_name(printer, location)
+    installed = state.get_printer(queue_name)
+    needs_printer = installed is None or not (
+        installed.port_name.lower() == port_name(printer).lower()
+        and installed.driver_name.lower() == printer.driver_name.lower()
+    )
+
+    inf_path = None
+    if stage_driver and (needs_driver or needs_printer):
+        inf_path = stage_driver(printer.driver_inf_path)
+
+    steps = []
+    if needs_port:
+        steps.append(port_step(printer))
+    if needs_driver:
+        steps.append(driver_step(printer, inf_path))
+    if needs_printer:
+        if installed is not None:
+            steps.append(remove_printer_step(installed.name))
+        steps.append(printer_step(printer, location, inf_path))
+    return steps
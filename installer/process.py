@@ -0,0 +1,100 @@
+# installer/process.py
+
+import os
+import queue
+import signal
+import subprocess
+import threading
+from typing import Iterator, Sequence
+
+# Markiert das Ende der Ausgabe in der Zeilen-Queue
+_EOF = object()
+
+
+class ChildProcess:
+    """
+    Startet einen Befehl in einer eigenen Prozessgruppe (POSIX: eigene
+    Sitzung, Windows: CREATE_NEW_PROCESS_GROUP) mit zusammengeführtem
+    stdout/stderr.
+
+    `kill()` beendet den ganzen Prozessbaum, also auch Kindprozesse von
+    Shells oder PowerShell (z.B. pnputil), und beendet `lines()` sofort –
+    auch wenn ein entkommener Enkelprozess die Pipe noch offen hält.
+    """
+
+    def __init__(self, args: Sequence[str], encoding: str | None = None):
+        if os.name == "nt":
+            group = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group = {"start_new_session": True}
+
+        self.process = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding=encoding,
+            errors="replace",
+            **group,
+        )
+        self.killed = threading.Event()
+
+        # Die Pipe wird in einem eigenen Thread gelesen, damit das Lesen
+        # nach kill() nicht auf das Schließen der Pipe warten muss
+        self._lines: queue.Queue = queue.Queue()
+        reader = threading.Thread(target=self._read, name="child-output", daemon=True)
+        reader.start()
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def _read(self):
+        try:
+            for line in self.process.stdout:
+                self._lines.put(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._lines.put(_EOF)
+
+    def lines(self) -> Iterator[str]:
+        """Ausgabezeilen (mit Zeilenende), bis der Prozess endet oder beendet wird."""
+        while not self.killed.is_set():
+            line = self._lines.get()
+            if line is _EOF or self.killed.is_set():
+                return
+            yield line
+
+    def poll(self) -> int | None:
+        return self.process.poll()
+
+    def wait(self) -> int:
+        return self.process.wait()
+
+    def kill(self):
+        """Beendet den Prozess samt allen Kindprozessen."""
+        self.killed.set()
+        self._lines.put(_EOF)
+        kill_process_tree(self.process)
+
+
+def kill_process_tree(process: subprocess.Popen):
+    if os.name == "nt":
+        # /T: mit allen Kindprozessen, /F: ohne Rückfrage
+        subprocess.run(
+            ["taskkill", "/T", "/F", "/PID", str(process.pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW,
+        )
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    # Falls taskkill bzw. killpg den Prozess selbst nicht erreicht hat
+    try:
+        process.kill()
+    except OSError:
+        pass
@@ -0,0 +1,467 @@
+# installer/script.py
+
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Callable
+
+from .batch import (
+    DEFAULT_RETRY_POLICY,
+    RESULT_FAILED,
+    RESULT_INSTALLED,
+    RESULT_UNCHANGED,
+    STEP_TIMEOUTS,
+    TRANSIENT_ERRORS,
+    BatchItem,
+    BatchPlan,
+    BatchReport,
+    RetryPolicy,
+    _wait,
+    step_timeout,
+)
+from .planner import (
+    STEP_DRIVER,
+    STEP_PORT,
+    STEP_PRINTER,
+    STEP_REMOVE_PRINTER,
+    InstallStep,
+)
+from .process import ChildProcess
+
+POWERSHELL = (
+    "powershell.exe",
+    "-NoProfile",
+    "-NonInteractive",
+    "-ExecutionPolicy",
+    "Bypass",
+    "-File",
+)
+
+# Statuszeilen des Skripts: "##STEP <Nummer> <Status> [Text]"
+STATUS_START = "START"
+STATUS_OUTPUT = "OUT"
+STATUS_OK = "OK"
+STATUS_FAIL = "FAIL"
+STATUS_SKIP = "SKIP"
+# Vorübergehender Fehler: das Skript endet, der Schritt wird neu gestartet
+STATUS_RETRY = "RETRY"
+
+_STATUS_LINE = re.compile(r"^##STEP (\d+) (START|OUT|OK|FAIL|SKIP|RETRY)(?: (.*))?$")
+
+# Exit-Code des Skripts nach einer RETRY-Zeile
+EXIT_RETRY = 75
+
+# Abstand, in dem während der Ausführung auf einen Abbruch geprüft wird
+_STOP_POLL_INTERVAL = 0.2
+
+# So lange darf die Ausgabe nach dem Ende des Skripts noch offen bleiben
+_EXIT_GRACE_PERIOD = 2.0
+
+SCRIPT_HEADER = """\
+# Erzeugt von Drucker-Verwaltung - nicht bearbeiten
+$ErrorActionPreference = 'Stop'
+$ProgressPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+
+function Write-Status([string]$Line) {
+    [Console]::Out.WriteLine($Line)
+    [Console]::Out.Flush()
+}
+
+function Invoke-Step([int]$Index, [bool]$Ready, [bool]$CanRetry, [scriptblock]$Action) {
+    if (-not $Ready) {
+        Write-Status "##STEP $Index SKIP"
+        return $false
+    }
+    Write-Status "##STEP $Index START"
+    try {
+        & $Action | ForEach-Object { Write-Status "##STEP $Index OUT $_" }
+        Write-Status "##STEP $Index OK"
+        return $true
+    } catch {
+        $message = ($_.Exception.Message -replace '\\s+', ' ').Trim()
+        if ($CanRetry -and $message -match $TransientErrors) {
+            Write-Status "##STEP $Index RETRY $message"
+            exit @EXIT_RETRY@
+        }
+        Write-Status "##STEP $Index FAIL $message"
+        return $false
+    }
+}
+""".replace("@EXIT_RETRY@", str(EXIT_RETRY))
+
+
+def ps_quote(value: str) -> str:
+    """Setzt einen Wert als PowerShell-Zeichenkette in einfache Anführungszeichen."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def render_action(step: InstallStep) -> list[str]:
+    """PowerShell-Zeilen eines Schritts (ohne eigene Prozesse, außer pnputil)."""
+    params = {key: ps_quote(value) for key, value in step.params.items()}
+
+    if step.kind == STEP_PORT:
+        return [
+            f"Add-PrinterPort -Name {params['port']} "
+            f"-PrinterHostAddress {params['host']} -PortNumber 9100"
+        ]
+    if step.kind == STEP_DRIVER:
+        return [
+            # Fehlerausgaben von pnputil sind Ausgabe, kein Abbruch
+            "$ErrorActionPreference = 'Continue'",
+            f"pnputil.exe /add-driver {params['inf_path']} /install 2>&1 "
+            '| ForEach-Object { "$_" }',
+            "$ErrorActionPreference = 'Stop'",
+            # 3010: Installiert, Neustart erforderlich
+            "if ($LASTEXITCODE -notin 0, 3010) "
+            '{ throw "pnputil: Exit-Code $LASTEXITCODE" }',
+            f"Add-PrinterDriver -Name {params['driver']}",
+        ]
+    if step.kind == STEP_REMOVE_PRINTER:
+        return [f"Remove-Printer -Name {params['printer']}"]
+    if step.kind == STEP_PRINTER:
+        return [
+            f"Add-Printer -Name {params['printer']} "
+            f"-DriverName {params['driver']} -PortName {params['port']}"
+        ]
+
+    raise ValueError(f"Unbekannter Installationsschritt: {step.kind}")
+
+
+class ScriptPlan:
+    """
+    Ein BatchPlan als fortlaufend nummerierte Schrittliste mit Abhängigkeiten:
+    erst alle Ports, dann alle Treiber, dann die Schritte der einzelnen Drucker.
+    """
+
+    def __init__(self, plan: BatchPlan):
+        self.steps: list[InstallStep] = []
+        # Nummern der Schritte, die vorher erfolgreich sein müssen
+        self.depends: list[list[int]] = []
+        # Drucker -> (Nummern gemeinsamer Schritte, Nummern eigener Schritte)
+        self.items: list[tuple[BatchItem, list[int], list[int]]] = []
+
+        shared = {}
+        for key, step in plan.ports.items():
+            shared[(STEP_PORT, key)] = self._add(step, [])
+        for key, step in plan.drivers.items():
+            shared[(STEP_DRIVER, key)] = self._add(step, [])
+
+        for item in plan.items:
+            required = [
+                shared[(kind, key)]
+                for kind, key in ((STEP_PORT, item.port), (STEP_DRIVER, item.driver))
+                if key is not None
+            ]
+            own = []
+            for step in item.steps:
+                own.append(self._add(step, own[-1:] or required))
+            self.items.append((item, required, own))
+
+    def _add(self, step: InstallStep, depends: list[int]) -> int:
+        self.steps.append(step)
+        self.depends.append(list(depends))
+        return len(self.steps) - 1
+
+
+def _render(
+    script_plan: ScriptPlan,
+    done: dict[int, bool] | None = None,
+    retryable: set[int] | None = None,
+) -> str:
+    done = done or {}
+    lines = [SCRIPT_HEADER, f"$TransientErrors = {ps_quote(TRANSIENT_ERRORS)}", ""]
+
+    for index, step in enumerate(script_plan.steps):
+        lines.append(f"# {step.description}")
+        if index in done:
+            # Bereits in einem früheren Lauf abgeschlossen
+            lines.append(f"$s{index} = ${str(done[index]).lower()}")
+            lines.append("")
+            continue
+
+        depends = script_plan.depends[index]
+        ready = " -and ".join(f"$s{number}" for number in depends) or "$true"
+        can_retry = "$true" if retryable is None or index in retryable else "$false"
+        lines.append(f"$s{index} = Invoke-Step {index} ({ready}) {can_retry} {{")
+        lines.extend(f"    {line}" for line in render_action(step))
+        lines.append("}")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def render_script(
+    plan: BatchPlan,
+    done: dict[int, bool] | None = None,
+    retryable: set[int] | None = None,
+) -> str:
+    """
+    Erzeugt das PowerShell-Skript für einen BatchPlan (deterministisch).
+
+    `done` enthält Schritte, die schon in einem früheren Lauf abgeschlossen
+    wurden (Nummer -> erfolgreich?); sie werden nicht erneut ausgeführt.
+    Nur Schritte aus `retryable` (Standard: alle) dürfen das Skript bei
+    einem vorübergehenden Fehler für eine Wiederholung beenden.
+    """
+    return _render(ScriptPlan(plan), done, retryable)
+
+
+def parse_status_line(line: str) -> tuple[int, str, str] | None:
+    """Zerlegt eine Statuszeile in (Nummer, Status, Meldung), sonst None."""
+    match = _STATUS_LINE.match(line.rstrip("\r\n"))
+    if match is None:
+        return None
+    return int(match.group(1)), match.group(2), match.group(3) or ""
+
+
+class ScriptRunner:
+    """
+    Führt einen BatchPlan als PowerShell-Skript in einem Prozess aus und
+    wertet die Statuszeilen aus, während es läuft.
+
+    Überschreitet ein Schritt sein Zeitlimit, wird der Prozess beendet.
+    Nach einem Zeitlimit oder einem vorübergehenden Fehler (RETRY) startet
+    ein neues Skript mit den offenen Schritten, nach der Wartezeit aus
+    `policy`; abgeschlossene Schritte laufen nicht erneut.
+    """
+
+    def __init__(
+        self,
+        plan: BatchPlan,
+        should_stop: Callable[[], bool] | None = None,
+        on_step: Callable[[], None] | None = None,
+        on_result: Callable[[str, str, str], None] | None = None,
+        report: BatchReport | None = None,
+        on_start: Callable[[InstallStep], None] | None = None,
+        on_output: Callable[[InstallStep, str], None] | None = None,
+        on_retry: Callable[[InstallStep, int, str], None] | None = None,
+        timeouts: dict[str, float] = STEP_TIMEOUTS,
+        policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+        command: tuple[str, ...] = POWERSHELL,
+    ):
+        self.script_plan = ScriptPlan(plan)
+        self.should_stop = should_stop
+        self.on_step = on_step
+        self.on_result = on_result
+        self.report = report if report is not None else BatchReport()
+        self.on_start = on_start
+        self.on_output = on_output
+        self.on_retry = on_retry
+        self.timeouts = timeouts
+        self.policy = policy
+        self.command = command
+
+        self.results: dict[int, tuple[str, str]] = {}
+        # Fehlgeschlagene Versuche pro Schritt (Zeitlimit oder RETRY)
+        self.failed_attempts: dict[int, int] = {}
+        self._pending = list(self.script_plan.items)
+        # Laufender Schritt und sein Startzeitpunkt (vom Watcher gelesen)
+        self._current: tuple[int, float] | None = None
+
+    def _stopped(self) -> bool:
+        return bool(self.should_stop and self.should_stop())
+
+    def _failure(self, index: int) -> str:
+        status, message = self.results[index]
+        if status == STATUS_SKIP:
+            # Ursache ist der erste fehlgeschlagene Schritt, von dem er abhängt
+            for number in self.script_plan.depends[index]:
+                if self.results.get(number, (STATUS_OK,))[0] != STATUS_OK:
+                    return self._failure(number)
+        return f"{self.script_plan.steps[index].description}: {message}"
+
+    def _settle(self):
+        for entry in list(self._pending):
+            item, required, own = entry
+            if not all(index in self.results for index in required + own):
+                continue
+
+            self._pending.remove(entry)
+            failed = [
+                index for index in required + own if self.results[index][0] != STATUS_OK
+            ]
+            if failed:
+                result, message = RESULT_FAILED, self._failure(failed[0])
+            elif not own and not required:
+                result, message = RESULT_UNCHANGED, ""
+            else:
+                result, message = RESULT_INSTALLED, ""
+
+            self.report.add(item.queue_name, result, message)
+            if self.on_result:
+                self.on_result(item.queue_name, result, message)
+
+    def _finish_step(self, index: int, status: str, message: str = ""):
+        if index in self.results or not 0 <= index < len(self.script_plan.steps):
+            return
+        self.results[index] = (status, message)
+        if self.on_step:
+            self.on_step()
+        self._settle()
+
+    def _fail_open_steps(self, message: str):
+        for index in range(len(self.script_plan.steps)):
+            self._finish_step(index, STATUS_FAIL, message)
+
+    def run(self) -> BatchReport:
+        # Drucker ohne Schritte stehen sofort fest
+        self._settle()
+
+        while len(self.results) < len(self.script_plan.steps):
+            if self._stopped():
+                self._fail_open_steps("abgebrochen")
+                break
+
+            outcome, index, message = self._run_once()
+
+            if outcome == "stopped":
+                self._fail_open_steps("abgebrochen")
+                break
+            if outcome == "error":
+                self._fail_open_steps(message)
+                break
+            if outcome not in ("retry", "timeout"):
+                continue
+
+            attempts = self.failed_attempts.get(index, 0) + 1
+            self.failed_attempts[index] = attempts
+            if attempts >= self.policy.attempts:
+                # Nur nach einem Zeitlimit möglich; RETRY kommt im letzten Versuch nicht
+                self._finish_step(index, STATUS_FAIL, message)
+                continue
+
+            if self.on_retry:
+                self.on_retry(self.script_plan.steps[index], attempts + 1, message)
+            if _wait(self.policy.delay_for(attempts), self.should_stop):
+                self._fail_open_steps("abgebrochen")
+                break
+
+        return self.report
+
+    def _run_once(self) -> tuple[str, int | None, str]:
+        """
+        Ein Lauf des Skripts mit allen offenen Schritten. Ergebnis:
+        ("done"|"retry"|"timeout"|"stopped"|"error", Schritt, Meldung).
+        """
+        steps = self.script_plan.steps
+        done = {
+            index: status == STATUS_OK for index, (status, _) in self.results.items()
+        }
+        retryable = {
+            index
+            for index in range(len(steps))
+            if self.failed_attempts.get(index, 0) + 1 < self.policy.attempts
+        }
+
+        fd, script_path = tempfile.mkstemp(prefix="dv_install_", suffix=".ps1")
+        try:
+            # PowerShell 5 liest Skripte ohne BOM nicht als UTF-8
+            with os.fdopen(fd, "w", encoding="utf-8-sig") as f:
+                f.write(_render(self.script_plan, done, retryable))
+
+            # Eigene Prozessgruppe: ein Abbruch beendet auch pnputil & Co.
+            process = ChildProcess([*self.command, script_path], encoding="utf-8")
+        except OSError as e:
+            os.remove(script_path)
+            return "error", None, str(e)
+
+        self._current = None
+        finished = threading.Event()
+        stopped = threading.Event()
+        timed_out: list[int] = []
+
+        def watch():
+            exited_at = None
+            while not finished.wait(_STOP_POLL_INTERVAL):
+                current = self._current
+                if self._stopped():
+                    stopped.set()
+                    process.kill()
+                    return
+                if current is not None and time.monotonic() - current[1] > (
+                    step_timeout(steps[current[0]], self.timeouts)
+                ):
+                    timed_out.append(current[0])
+                    process.kill()
+                    return
+                # Hält nach dem Ende des Skripts ein Kindprozess die Ausgabe
+                # offen, wird er nach kurzer Frist beendet
+                if process.poll() is None:
+                    continue
+                if exited_at is None:
+                    exited_at = time.monotonic()
+                elif time.monotonic() - exited_at > _EXIT_GRACE_PERIOD:
+                    process.kill()
+                    return
+
+        watcher = threading.Thread(target=watch, name="install-script", daemon=True)
+        watcher.start()
+
+        retry: tuple[int, str] | None = None
+        try:
+            for line in process.lines():
+                status_line = parse_status_line(line)
+                if status_line is None:
+                    # Sonstige Ausgabe (z.B. stderr) gehört zum laufenden Schritt
+                    if self._current is not None and line.strip() and self.on_output:
+                        self.on_output(steps[self._current[0]], line.rstrip())
+                    continue
+
+                index, status, text = status_line
+                if not 0 <= index < len(steps) or index in self.results:
+                    continue
+                if status == STATUS_START:
+                    self._current = (index, time.monotonic())
+                    if self.on_start:
+                        self.on_start(steps[index])
+                elif status == STATUS_OUTPUT:
+                    if self.on_output:
+                        self.on_output(steps[index], text)
+                elif status == STATUS_RETRY:
+                    retry = (index, text)
+                else:
+                    self._current = None
+                    self._finish_step(index, status, text)
+
+            exit_code = process.wait()
+        finally:
+            finished.set()
+            if process.poll() is None:
+                process.kill()
+            watcher.join()
+            self._current = None
+            try:
+                os.remove(script_path)
+            except OSError:
+                pass
+
+        if stopped.is_set():
+            return "stopped", None, ""
+        if timed_out:
+            timeout = step_timeout(steps[timed_out[0]], self.timeouts)
+            return "timeout", timed_out[0], f"Zeitüberschreitung nach {timeout:g} s"
+        if retry is not None and exit_code == EXIT_RETRY:
+            return "retry", retry[0], retry[1]
+        if len(self.results) == len(steps):
+            return "done", None, ""
+        if exit_code:
+            return (
+                "error",
+                None,
+                f"Das Installationsskript endete mit Exit-Code {exit_code}.",
+            )
+        return "error", None, "Keine Rückmeldung vom Installationsskript."
+
+
+def run_script(plan: BatchPlan, **kwargs) -> BatchReport:
+    """
+    Führt einen BatchPlan als ein einziges PowerShell-Skript aus (siehe
+    ScriptRunner). `on_start`, `on_output` und `on_retry` melden Beginn,
+    Ausgabezeilen und Wiederholungen eines Schritts, `on_step` jeden
+    abgeschlossenen oder übersprungenen Schritt, `on_result` jeden Drucker,
+    sobald alle seine Schritte feststehen.
+    """
+    return ScriptRunner(plan, **kwargs).run()
@@ -0,0 +1,264 @@
+# main_cli.py
+
+import argparse
+import sqlite3
+import sys
+from datetime import datetime
+
+from crud.bulk import (
+    detect_format,
+    export_file,
+    import_file,
+    import_printers,
+    write_rows,
+)
+from crud.database import close_db_connections
+from crud.locations import get_location_by_name, get_locations
+from crud.migrations import MigrationError, migrate_db
+from crud.printers import iter_printers
+from network.discovery import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_TIMEOUT,
+    find_unregistered,
+    run_scan,
+    to_import_rows,
+)
+from network.sweeper import iter_sweep
+
+# Spalten des Verfügbarkeitsberichts
+REPORT_FIELDS = ("location", "name", "dns", "available", "checked_at")
+
+# Standardwerte für den Verfügbarkeitsbericht
+REPORT_CONCURRENCY = 256
+REPORT_TIMEOUT = 1.0
+REPORT_BUDGET = 45.0
+
+
+def run_import(args: argparse.Namespace) -> int:
+    report = import_file(args.file, create_locations=not args.no_create_locations)
+
+    for row_number, message in report.errors:
+        print(f"Datensatz {row_number}: {message}", file=sys.stderr)
+    print(report.summary())
+
+    return 1 if report.errors else 0
+
+
+def run_export(args: argparse.Namespace) -> int:
+    count = export_file(args.file)
+    print(f"{count} Drucker nach '{args.file}' exportiert.")
+    return 0
+
+
+def run_report(args: argparse.Namespace) -> int:
+    fmt = detect_format(args.file)
+    location_names = {location["id"]: location["name"] for location in get_locations()}
+
+    location_id = None
+    if args.location:
+        location = get_location_by_name(args.location)
+        if not location:
+            raise ValueError(f"Der Standort '{args.location}' existiert nicht.")
+        location_id = location["id"]
+
+    printers = {printer["id"]: printer for printer in iter_printers(location_id)}
+    counts = {True: 0, False: 0, None: 0}
+
+    def rows():
+        results = iter_sweep(
+            ((printer_id, printer["dns"]) for printer_id, printer in printers.items()),
+            concurrency=args.concurrency,
+            host_timeout=args.timeout,
+            budget=args.budget,
+        )
+        for printer_id, is_available in results:
+            printer = printers[printer_id]
+            counts[is_available] += 1
+            yield {
+                "location": location_names.get(printer["location_id"], ""),
+                "name": printer["name"],
+                "dns": printer["dns"],
+                "available": is_available,
+                "checked_at": datetime.now().isoformat(timespec="seconds"),
+            }
+
+    with open(args.file, "w", encoding="utf-8", newline="") as f:
+        write_rows(f, rows(), fmt, REPORT_FIELDS)
+
+    print(
+        f"{len(printers)} Drucker nach '{args.file}' geschrieben: "
+        f"{counts[True]} erreichbar, {counts[False]} nicht erreichbar, "
+        f"{counts[None]} nicht geprüft."
+    )
+    return 0
+
+
+def run_discover(args: argparse.Namespace) -> int:
+    if args.add:
+        missing = [
+            option
+            for option in ("location", "model", "driver_name", "driver_inf_path")
+            if not getattr(args, option)
+        ]
+        if missing:
+            raise ValueError(
+                "Für --add fehlen: "
+                + ", ".join(f"--{option.replace('_', '-')}" for option in missing)
+            )
+
+    ports = tuple(int(port) for port in args.ports.split(","))
+    devices = run_scan(
+        args.networks,
+        ports=ports,
+        timeout=args.timeout,
+        concurrency=args.concurrency,
+    )
+    unregistered = find_unregistered(
+        devices, (printer["dns"] for printer in iter_printers())
+    )
+
+    for device in unregistered:
+        ports_text = ",".join(str(port) for port in device.ports)
+        print(f"{device.address}\t{device.hostname or '-'}\t{ports_text}")
+    print(
+        f"{len(devices)} Geräte gefunden, davon {len(unregistered)} nicht im Katalog."
+    )
+
+    if not args.add or not unregistered:
+        return 0
+
+    report = import_printers(
+        to_import_rows(
+            unregistered,
+            args.location,
+            args.model,
+            args.driver_name,
+            args.driver_inf_path,
+        ),
+        create_locations=not args.no_create_locations,
+    )
+    for row_number, message in report.errors:
+        print(f"Datensatz {row_number}: {message}", file=sys.stderr)
+    print(report.summary())
+
+    return 1 if report.errors else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Drucker-Verwaltung ohne grafische Oberfläche."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import", help="Drucker aus einer CSV-, JSON- oder JSONL-Datei importieren."
+    )
+    import_parser.add_argument(
+        "file", help="Pfad zur Importdatei (.csv, .json, .jsonl)"
+    )
+    import_parser.add_argument(
+        "--no-create-locations",
+        action="store_true",
+        help="Unbekannte Standorte als Fehler melden, statt sie anzulegen.",
+    )
+    import_parser.set_defaults(handler=run_import)
+
+    export_parser = commands.add_parser(
+        "export", help="Alle Drucker in eine CSV-, JSON- oder JSONL-Datei exportieren."
+    )
+    export_parser.add_argument(
+        "file", help="Pfad zur Exportdatei (.csv, .json, .jsonl)"
+    )
+    export_parser.set_defaults(handler=run_export)
+
+    report_parser = commands.add_parser(
+        "report",
+        help="Alle Drucker prüfen und die Erreichbarkeit in eine Datei schreiben.",
+    )
+    report_parser.add_argument(
+        "file", help="Pfad zur Berichtsdatei (.csv, .json, .jsonl)"
+    )
+    report_parser.add_argument(
+        "--location", help="Nur die Drucker dieses Standorts prüfen."
+    )
+    report_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=REPORT_TIMEOUT,
+        help="Zeitlimit pro Drucker in Sekunden.",
+    )
+    report_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=REPORT_CONCURRENCY,
+        help="Höchstzahl gleichzeitig geprüfter Drucker.",
+    )
+    report_parser.add_argument(
+        "--budget",
+        type=float,
+        default=REPORT_BUDGET,
+        help="Gesamtzeit in Sekunden; danach nicht geprüfte Drucker bleiben leer.",
+    )
+    report_parser.set_defaults(handler=run_report)
+
+    discover_parser = commands.add_parser(
+        "discover",
+        help="Netze nach Druckern durchsuchen, die noch nicht im Katalog stehen.",
+    )
+    discover_parser.add_argument(
+        "networks", nargs="+", help="Netze in CIDR-Schreibweise, z.B. 10.1.0.0/22"
+    )
+    discover_parser.add_argument(
+        "--ports",
+        default="9100,515,631",
+        help="Zu prüfende Ports, durch Kommas getrennt (Standard: 9100,515,631)",
+    )
+    discover_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="Zeitlimit pro Verbindung in Sekunden.",
+    )
+    discover_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Höchstzahl gleichzeitig geprüfter Hosts.",
+    )
+    discover_parser.add_argument(
+        "--add",
+        action="store_true",
+        help="Gefundene Drucker direkt in den Katalog übernehmen.",
+    )
+    discover_parser.add_argument("--location", help="Standort für --add")
+    discover_parser.add_argument("--model", help="Modell für --add")
+    discover_parser.add_argument("--driver-name", help="Treibername für --add")
+    discover_parser.add_argument(
+        "--driver-inf-path", help="Treiberpfad (.inf) für --add"
+    )
+    discover_parser.add_argument(
+        "--no-create-locations",
+        action="store_true",
+        help="Unbekannten Standort als Fehler melden, statt ihn anzulegen.",
+    )
+    discover_parser.set_defaults(handler=run_discover)
+
+    return parser
+
+
+def main() -> int:
+    """Führt einen Befehl der Kommandozeile aus."""
+    args = build_parser().parse_args()
+
+    try:
+        migrate_db()
+        return args.handler(args)
+    except (OSError, ValueError, sqlite3.Error, MigrationError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+    finally:
+        close_db_connections()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
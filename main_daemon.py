@@ -0,0 +1,223 @@
+# main_daemon.py
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import tempfile
+import time
+
+from crud.changes import changes_since, get_change_seq
+from crud.database import close_db_connections
+from crud.history import HISTORY_NAME, AvailabilityHistory
+from crud.migrations import MigrationError, migrate_db
+from crud.printers import iter_printers
+from network.resolver import get_resolver
+from network.monitor import (
+    DEFAULT_CONCURRENCY,
+    MAX_INTERVAL,
+    MIN_INTERVAL,
+    Monitor,
+    MonitoredHost,
+)
+
+# Lokale Statusdatei mit dem aktuellen Zustand aller Drucker
+STATUS_FILE: str = os.path.join(
+    os.environ.get("LOCALAPPDATA") or tempfile.gettempdir(),
+    "DruckerVerwaltung",
+    "dv_status.json",
+)
+
+# Abstände in Sekunden
+CATALOG_INTERVAL = 60.0
+STATUS_INTERVAL = 10.0
+DOWNSAMPLE_INTERVAL = 3600.0
+
+
+def write_status(path: str, printers: list[dict], resolver_stats: dict | None = None):
+    """Schreibt den Zustand aller Drucker atomar (erst Temporärdatei, dann Umbenennen)."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "updated": time.time(),
+                "resolver": resolver_stats,
+                "printers": printers,
+            },
+            f,
+            ensure_ascii=False,
+        )
+    os.replace(tmp_path, path)
+
+
+class CatalogWatcher:
+    """Hält die überwachten Drucker über das Änderungsprotokoll aktuell."""
+
+    def __init__(self, monitor: Monitor):
+        self.monitor = monitor
+        self.seq: int | None = None
+
+    def fetch(self):
+        """Liest Änderungen bzw. den ganzen Katalog (blockiert, läuft in einem Thread)."""
+        if self.seq is not None:
+            change_set = changes_since(self.seq)
+            if change_set is not None:
+                return change_set.seq, None, change_set
+
+        # Erster Durchlauf oder Protokoll reicht nicht zurück: vollständig laden
+        seq = get_change_seq()
+        printers = [
+            (printer["id"], printer["dns"], printer["name"])
+            for printer in iter_printers()
+        ]
+        return seq, printers, None
+
+    def apply(self, update):
+        """Überträgt das Ergebnis von fetch() in den Monitor (in der Ereignisschleife)."""
+        seq, printers, change_set = update
+
+        if printers is not None:
+            self.monitor.sync_printers(
+                {"id": printer_id, "dns": dns, "name": name}
+                for printer_id, dns, name in printers
+            )
+        else:
+            for printer_id in change_set.deleted_printers:
+                self.monitor.remove_printer(printer_id)
+            for printer in change_set.printers:
+                self.monitor.add_printer(printer["id"], printer["dns"], printer["name"])
+
+        self.seq = seq if self.seq is None else max(self.seq, seq)
+
+    async def refresh(self):
+        self.apply(await asyncio.to_thread(self.fetch))
+
+
+async def run_periodically(interval: float, func, stop: asyncio.Event):
+    """Führt die Coroutine `func()` sofort und danach alle `interval` Sekunden aus."""
+    while not stop.is_set():
+        try:
+            await func()
+        except Exception as e:
+            print(f"Fehler in {func.__qualname__}: {e}", file=sys.stderr)
+
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_daemon(args: argparse.Namespace):
+    history = AvailabilityHistory(args.history)
+
+    def on_result(host: MonitoredHost):
+        history.record(host.dns, host.available)
+
+    monitor = Monitor(
+        concurrency=args.concurrency,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        on_result=on_result,
+    )
+    watcher = CatalogWatcher(monitor)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows: Strg+C kommt als KeyboardInterrupt an
+            pass
+
+    # Katalog zuerst laden, damit die erste Statusdatei vollständig ist
+    await watcher.refresh()
+
+    async def save_status():
+        # Zustand im Loop kopieren, nur das Schreiben läuft im Thread
+        await asyncio.to_thread(
+            write_status,
+            args.status_file,
+            monitor.status(),
+            get_resolver().stats.to_dict(),
+        )
+
+    async def downsample():
+        await asyncio.to_thread(history.downsample)
+
+    try:
+        await asyncio.gather(
+            monitor.run(stop),
+            run_periodically(CATALOG_INTERVAL, watcher.refresh, stop),
+            run_periodically(STATUS_INTERVAL, save_status, stop),
+            run_periodically(DOWNSAMPLE_INTERVAL, downsample, stop),
+        )
+    finally:
+        stop.set()
+        write_status(args.status_file, monitor.status(), get_resolver().stats.to_dict())
+        history.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Überwacht die Erreichbarkeit aller Drucker ohne grafische Oberfläche."
+    )
+    parser.add_argument(
+        "--status-file",
+        default=STATUS_FILE,
+        help=f"Pfad der Statusdatei (Standard: {STATUS_FILE})",
+    )
+    parser.add_argument(
+        "--history",
+        default=HISTORY_NAME,
+        help=f"Pfad der Verlaufsdatenbank (Standard: {HISTORY_NAME})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Höchstzahl gleichzeitiger Prüfungen.",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=MIN_INTERVAL,
+        help="Kürzester Prüfabstand in Sekunden (bei wechselndem Zustand).",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=MAX_INTERVAL,
+        help="Längster Prüfabstand in Sekunden (bei stabilem Zustand).",
+    )
+    return parser
+
+
+def main() -> int:
+    """Startet die Überwachung, bis sie mit Strg+C bzw. SIGTERM beendet wird."""
+    args = build_parser().parse_args()
+
+    try:
+        migrate_db()
+    except MigrationError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        close_db_connections()
+        return 1
+
+    try:
+        asyncio.run(run_daemon(args))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_db_connections()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,14 @@
 # main_gui.py
 
 import sys
-from PySide6.QtWidgets import QApplication
-from crud.database import create_db_from_schema
+from PySide6.QtWidgets import QApplication, QMessageBox
+from crud.database import close_db_connections
+from crud.migrations import MigrationError, migrate_db
+from crud.changes import prune_changes
+from crud.history import AvailabilityHistory
+from network.availability import get_availability_cache
+from threads.database_worker import get_database_worker
+from threads.task_executor import get_task_executor
 from views.gui.main_window import MainWindow
 
 
@@ -10,18 +16,39 @@ def main():
     """Initialisiert und startet die grafische Benutzeroberfläche."""
     app = QApplication(sys.argv)
 
+    # Schema aktualisieren; ohne erreichbare Datenbank geht es mit der lokalen Kopie weiter
+    try:
+        if migrate_db() is not None:
+            prune_changes()
+    except MigrationError as e:
+        QMessageBox.critical(None, "Datenbankfehler", str(e))
+        sys.exit(1)
+
     # 1. Datenzugriffsschicht initialisieren
     # storage = Storage("printers.json")
 
+    # Alle Prüfergebnisse im lokalen Verlauf festhalten
+    history = AvailabilityHistory()
+    history.downsample()
+    get_availability_cache().add_listener(history.record)
+
     # 2. View mit dem Service initialisieren
     gui = MainWindow()
     gui.show()
 
-    sys.exit(app.exec())
+    exit_code = app.exec()
+
+    # 3. Laufende Aufgaben abbrechen, Datenbankzugriffe abwarten und
+    #    Verbindungen sauber schließen
+    get_task_executor().shutdown()
+    get_database_worker().shutdown()
+    close_db_connections()
+    history.close()
+
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
-    create_db_from_schema()
     main()
 
 input()
@@ -47,4 +47,5 @@ class Location:
     def from_dict(cls, data: Dict[str, Any]) -> "Location":
         """Erstellt ein Objekt aus einem Dictionary."""
         printers = [Printer.from_dict(p_data) for p_data in data.get("printers", [])]
-        return cls(**data, printers=printers)
+        fields = {key: value for key, value in data.items() if key != "printers"}
+        return cls(**fields, printers=printers)
@@ -1,6 +1,6 @@
 # models/printer.py
 
-from icmplib import ping
+from network.probes import CompositeProbe, IcmpProbe, TcpProbe
 from typing import Dict, Any
 
 
@@ -24,13 +24,9 @@ class Printer:
         self.driver_inf_path = driver_inf_path
 
     def is_available(self, timeout: float = 2.0) -> bool:
-        """Prüft die Netzwerkverfügbarkeit des Druckers."""
-        try:
-            host = ping(self.dns, count=2, timeout=timeout)
-            return host.is_alive
-
-        except Exception as e:
-            return False
+        """Prüft die Netzwerkverfügbarkeit des Druckers (Druckerports oder ICMP)."""
+        probe = CompositeProbe(TcpProbe(timeout=timeout), IcmpProbe(timeout=timeout))
+        return probe.check(self.dns)
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialisiert das Objekt in ein Dictionary."""
@@ -38,5 +34,8 @@ class Printer:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Printer":
-        """Erstellt ein Objekt aus einem Dictionary."""
+        """Erstellt ein Objekt aus einem Dictionary (oder einer Datenbankzeile)."""
+        if not isinstance(data, dict):
+            # Datenbankzeilen einmal gesammelt umwandeln statt Spalte für Spalte
+            data = dict(data.items())
         return cls(**data)
@@ -0,0 +1,143 @@
+# network/availability.py
+
+import threading
+import time
+from typing import Callable
+
+from .probes import DEFAULT_PROBE
+
+# Gültigkeitsdauer eines Ergebnisses in Sekunden (erreichbar / nicht erreichbar)
+DEFAULT_TTL = 60.0
+DEFAULT_NEGATIVE_TTL = 10.0
+
+
+class _PendingCheck:
+    """Eine laufende Prüfung, auf die weitere Anfragen für denselben Host warten."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: bool = False
+
+
+class AvailabilityCache:
+    """
+    Prozessweiter Zwischenspeicher für die Erreichbarkeit von Hosts (DNS/IP).
+
+    Ergebnisse gelten `ttl` Sekunden, negative Ergebnisse nur `negative_ttl`
+    Sekunden, damit ein wieder erreichbarer Drucker schnell erkannt wird.
+    Fragen mehrere Threads gleichzeitig nach demselben Host, läuft nur eine
+    Prüfung; alle erhalten deren Ergebnis.
+
+    Jedes neue Ergebnis (aus `check` oder `put`) wird an die über
+    `add_listener` registrierten Funktionen gemeldet, z.B. an den Verlauf.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[str], bool] = DEFAULT_PROBE,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.probe = probe
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        # Host -> (erreichbar?, Ablaufzeitpunkt)
+        self._entries: dict[str, tuple[bool, float]] = {}
+        self._pending: dict[str, _PendingCheck] = {}
+        self._listeners: list[Callable[[str, bool], None]] = []
+
+    def add_listener(self, listener: Callable[[str, bool], None]):
+        """Registriert `listener(host, erreichbar)` für alle neuen Ergebnisse."""
+        self._listeners.append(listener)
+
+    def _notify(self, host: str, is_available: bool):
+        for listener in self._listeners:
+            listener(host, is_available)
+
+    def get(self, host: str) -> bool | None:
+        """Gibt das gespeicherte Ergebnis zurück, oder None, wenn keins gültig ist."""
+        with self._lock:
+            return self._lookup(host)
+
+    def _lookup(self, host: str) -> bool | None:
+        entry = self._entries.get(host)
+        if entry is None:
+            return None
+
+        is_available, expires = entry
+        if self._clock() >= expires:
+            del self._entries[host]
+            return None
+
+        return is_available
+
+    def put(self, host: str, is_available: bool):
+        """Speichert ein anderweitig ermitteltes Ergebnis (z.B. aus einer Gesamtprüfung)."""
+        with self._lock:
+            self._store(host, is_available)
+        self._notify(host, is_available)
+
+    def _store(self, host: str, is_available: bool):
+        ttl = self.ttl if is_available else self.negative_ttl
+        self._entries[host] = (is_available, self._clock() + ttl)
+
+    def check(self, host: str, refresh: bool = False) -> bool:
+        """
+        Gibt die Erreichbarkeit von `host` zurück und prüft nur, wenn kein
+        gültiges Ergebnis vorliegt (oder `refresh` gesetzt ist). Blockiert
+        während der Prüfung und gehört daher nicht in den GUI-Thread.
+        """
+        with self._lock:
+            if not refresh:
+                cached = self._lookup(host)
+                if cached is not None:
+                    return cached
+
+            pending = self._pending.get(host)
+            owner = pending is None
+            if owner:
+                pending = self._pending[host] = _PendingCheck()
+
+        if not owner:
+            pending.done.wait()
+            return pending.result
+
+        try:
+            pending.result = bool(self.probe(host))
+        except Exception:
+            pending.result = False
+        finally:
+            with self._lock:
+                self._store(host, pending.result)
+                del self._pending[host]
+            pending.done.set()
+
+        self._notify(host, pending.result)
+        return pending.result
+
+    def invalidate(self, host: str | None = None):
+        """Verwirft das Ergebnis für `host` bzw. alle Ergebnisse."""
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(host, None)
+
+
+_cache: AvailabilityCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_availability_cache() -> AvailabilityCache:
+    """Gibt den gemeinsamen AvailabilityCache des Prozesses zurück."""
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = AvailabilityCache()
+
+    return _cache
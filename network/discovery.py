@@ -0,0 +1,179 @@
+# network/discovery.py
+
+import asyncio
+import ipaddress
+import socket
+from typing import Callable, Iterable, Iterator
+
+from .probes import PRINTER_PORTS, TcpProbe
+from .resolver import ResolverCache, get_resolver
+
+DEFAULT_CONCURRENCY = 256
+DEFAULT_TIMEOUT = 0.5
+# Zeitlimit für die Rückwärtsauflösung einer gefundenen Adresse
+REVERSE_LOOKUP_TIMEOUT = 1.0
+
+
+class DiscoveredDevice:
+    """Ein Gerät, das auf mindestens einem Druckerport antwortet."""
+
+    __slots__ = ("address", "ports", "hostname")
+
+    def __init__(
+        self, address: str, ports: tuple[int, ...], hostname: str | None = None
+    ):
+        self.address = address
+        self.ports = ports
+        self.hostname = hostname
+
+    @property
+    def dns(self) -> str:
+        """Name für den Katalog: der DNS-Name, falls bekannt, sonst die Adresse."""
+        return self.hostname or self.address
+
+    def __repr__(self) -> str:
+        return f"DiscoveredDevice({self.address!r}, {self.ports!r}, {self.hostname!r})"
+
+
+def _is_host(address, network) -> bool:
+    """Gibt an, ob `network.hosts()` die Adresse `address` liefert."""
+    if address not in network:
+        return False
+    # /31 und /32 (bzw. /127 und /128) haben keine Netz- und Broadcastadresse
+    if network.prefixlen >= network.max_prefixlen - 1:
+        return True
+    return address not in (network.network_address, network.broadcast_address)
+
+
+def iter_addresses(networks: Iterable[str]) -> Iterator[str]:
+    """
+    Alle Host-Adressen der angegebenen Netze (CIDR), jede nur einmal.
+
+    Doppelte werden über die bereits abgearbeiteten Netze erkannt, nicht über
+    die einzelnen Adressen; der Speicherbedarf hängt also nur von der Zahl der
+    Netze ab, nicht von ihrer Größe.
+    """
+    done = []
+
+    for network in networks:
+        network = ipaddress.ip_network(network.strip(), strict=False)
+        overlapping = [
+            earlier
+            for earlier in done
+            if earlier.version == network.version and earlier.overlaps(network)
+        ]
+        done.append(network)
+
+        for address in network.hosts():
+            if not any(_is_host(address, earlier) for earlier in overlapping):
+                yield str(address)
+
+
+async def reverse_lookup(
+    address: str, timeout: float = REVERSE_LOOKUP_TIMEOUT
+) -> str | None:
+    try:
+        hostname, _, _ = await asyncio.wait_for(
+            asyncio.to_thread(socket.gethostbyaddr, address), timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return None
+    return hostname
+
+
+async def scan(
+    networks: Iterable[str],
+    ports: tuple[int, ...] = PRINTER_PORTS,
+    timeout: float = DEFAULT_TIMEOUT,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    resolve_names: bool = True,
+    on_found: Callable[[DiscoveredDevice], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> list[DiscoveredDevice]:
+    """
+    Sucht in den Netzen `networks` nach Geräten mit offenen Druckerports.
+
+    `concurrency` Worker arbeiten die Adressen gemeinsam ab, es sind also nie
+    mehr als so viele Hosts gleichzeitig in Prüfung und die Adressliste wird
+    nicht vorab erzeugt. Gefundene Geräte werden sofort an `on_found` gemeldet
+    und am Ende nach Adresse sortiert zurückgegeben.
+    """
+    probe = TcpProbe(ports=ports, timeout=timeout)
+    addresses = iter_addresses(networks)
+    found: list[DiscoveredDevice] = []
+
+    async def worker():
+        # Alle Worker teilen sich den Iterator; in asyncio ohne Sperre sicher
+        for address in addresses:
+            if should_stop and should_stop():
+                return
+
+            open_ports = await probe.open_ports(address)
+            if not open_ports:
+                continue
+
+            device = DiscoveredDevice(address, open_ports)
+            if resolve_names:
+                device.hostname = await reverse_lookup(address)
+
+            found.append(device)
+            if on_found:
+                on_found(device)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+    found.sort(key=lambda device: ipaddress.ip_address(device.address))
+    return found
+
+
+def run_scan(networks: Iterable[str], **kwargs) -> list[DiscoveredDevice]:
+    """Synchroner Einstieg für Threads ohne eigene Ereignisschleife."""
+    return asyncio.run(scan(networks, **kwargs))
+
+
+def find_unregistered(
+    devices: Iterable[DiscoveredDevice],
+    known_dns: Iterable[str],
+    resolver: ResolverCache | None = None,
+) -> list[DiscoveredDevice]:
+    """
+    Filtert Geräte heraus, die bereits im Katalog stehen.
+
+    Einträge in `printers.dns` können Namen oder Adressen sein; Namen werden
+    über den ResolverCache aufgelöst und mit der Adresse des Geräts verglichen.
+    """
+    resolver = resolver or get_resolver()
+    known_dns = {dns.strip().lower() for dns in known_dns if dns}
+
+    known_addresses = {
+        address for address in resolver.resolve_many(known_dns).values() if address
+    }
+
+    return [
+        device
+        for device in devices
+        if device.address not in known_addresses
+        and (device.hostname or "").lower() not in known_dns
+    ]
+
+
+def to_import_rows(
+    devices: Iterable[DiscoveredDevice],
+    location: str,
+    model: str,
+    driver_name: str,
+    driver_inf_path: str,
+) -> Iterator[dict[str, str]]:
+    """Datensätze im Format von crud.bulk.import_printers für die gefundenen Geräte."""
+    for device in devices:
+        yield {
+            "location": location,
+            "dns": device.dns,
+            # Kurzname aus dem DNS-Namen, sonst die Adresse
+            "name": (
+                device.hostname.split(".")[0] if device.hostname else device.address
+            ),
+            "model": model,
+            "driver_name": driver_name,
+            "driver_inf_path": driver_inf_path,
+        }
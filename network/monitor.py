@@ -0,0 +1,237 @@
+# network/monitor.py
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import Any, Callable, Iterable
+
+from .probes import DEFAULT_PROBE, Probe
+
+# Prüfabstände in Sekunden
+MIN_INTERVAL = 15.0
+BASE_INTERVAL = 60.0
+MAX_INTERVAL = 900.0
+# Faktor, um den der Abstand bei unverändertem Zustand wächst
+BACKOFF = 1.5
+# Zufälliger Anteil am Abstand, damit sich die Prüfungen nicht bündeln
+JITTER = 0.1
+
+DEFAULT_CONCURRENCY = 256
+
+
+class MonitoredHost:
+    """Zustand und Zeitplan eines überwachten Druckers."""
+
+    __slots__ = (
+        "printer_id",
+        "dns",
+        "name",
+        "available",
+        "interval",
+        "next_due",
+        "last_checked",
+        "last_change",
+        "changes",
+        "in_flight",
+    )
+
+    def __init__(self, printer_id: int, dns: str, name: str, interval: float):
+        self.printer_id = printer_id
+        self.dns = dns
+        self.name = name
+        self.available: bool | None = None
+        self.interval = interval
+        self.next_due = 0.0
+        self.last_checked: float | None = None
+        self.last_change: float | None = None
+        self.changes = 0
+        self.in_flight = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.printer_id,
+            "name": self.name,
+            "dns": self.dns,
+            "available": self.available,
+            "last_checked": self.last_checked,
+            "last_change": self.last_change,
+            "changes": self.changes,
+            "interval": round(self.interval, 1),
+        }
+
+
+class Monitor:
+    """
+    Überwacht viele Drucker dauerhaft mit angepassten Prüfabständen.
+
+    Jeder Drucker hat seinen eigenen Abstand: bleibt der Zustand gleich, wächst
+    er um `backoff` bis `max_interval`; wechselt der Zustand (z.B. bei einem
+    flatternden Drucker), fällt er auf `min_interval` zurück. Fällige Prüfungen
+    liegen in einem Heap, gleichzeitig laufen höchstens `concurrency`.
+    Speicherbedarf: ein MonitoredHost und ein Heap-Eintrag pro Drucker.
+
+    Alle Methoden müssen im Thread der Ereignisschleife aufgerufen werden.
+    """
+
+    def __init__(
+        self,
+        probe: Probe = DEFAULT_PROBE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        min_interval: float = MIN_INTERVAL,
+        base_interval: float = BASE_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        backoff: float = BACKOFF,
+        on_result: Callable[[MonitoredHost], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.probe = probe
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.on_result = on_result
+        self._clock = clock
+
+        self.hosts: dict[int, MonitoredHost] = {}
+        # (fällig, laufende Nummer, Drucker-ID); veraltete Einträge werden übersprungen
+        self._heap: list[tuple[float, int, int]] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+
+    def _schedule(self, host: MonitoredHost, delay: float):
+        host.next_due = self._clock() + delay * random.uniform(1 - JITTER, 1 + JITTER)
+        heapq.heappush(
+            self._heap, (host.next_due, next(self._counter), host.printer_id)
+        )
+        self._wakeup.set()
+
+    def add_printer(self, printer_id: int, dns: str, name: str):
+        """Nimmt einen Drucker auf bzw. übernimmt geänderte Daten."""
+        host = self.hosts.get(printer_id)
+
+        if host is None:
+            host = self.hosts[printer_id] = MonitoredHost(
+                printer_id, dns, name, self.base_interval
+            )
+            # Erste Prüfung über `min_interval` verteilt, damit nicht alle auf einmal starten
+            self._schedule(host, random.uniform(0, self.min_interval))
+            return
+
+        host.name = name
+        if host.dns != dns:
+            host.dns = dns
+            host.available = None
+            host.interval = self.base_interval
+            if not host.in_flight:
+                self._schedule(host, 0)
+
+    def remove_printer(self, printer_id: int):
+        self.hosts.pop(printer_id, None)
+
+    def sync_printers(self, printers: Iterable):
+        """Gleicht die überwachten Drucker mit dem vollständigen Katalog ab."""
+        seen = set()
+        for printer in printers:
+            seen.add(printer["id"])
+            self.add_printer(printer["id"], printer["dns"], printer["name"])
+
+        for printer_id in set(self.hosts) - seen:
+            self.remove_printer(printer_id)
+
+        self._compact()
+
+    def _compact(self):
+        # Heap von Einträgen entfernter oder umgeplanter Drucker befreien
+        if len(self._heap) > 2 * len(self.hosts) + 64:
+            self._heap = [
+                entry
+                for entry in self._heap
+                if entry[2] in self.hosts and self.hosts[entry[2]].next_due == entry[0]
+            ]
+            heapq.heapify(self._heap)
+
+    def _pop_due(self, now: float) -> MonitoredHost | None:
+        while self._heap and self._heap[0][0] <= now:
+            due, _, printer_id = heapq.heappop(self._heap)
+            host = self.hosts.get(printer_id)
+            if host is not None and host.next_due == due and not host.in_flight:
+                return host
+        return None
+
+    def _apply_result(self, host: MonitoredHost, dns: str, is_available: bool):
+        if host.dns != dns:
+            # Der Name wurde während der Prüfung geändert: das Ergebnis gehört
+            # zum alten Host und wird verworfen, der neue sofort geprüft
+            if self.hosts.get(host.printer_id) is host:
+                self._schedule(host, 0)
+            return
+
+        if host.available is None or host.available == is_available:
+            host.interval = min(host.interval * self.backoff, self.max_interval)
+        else:
+            host.interval = self.min_interval
+            host.last_change = time.time()
+            host.changes += 1
+
+        if host.available is None:
+            host.last_change = time.time()
+
+        host.available = is_available
+        host.last_checked = time.time()
+
+        if self.hosts.get(host.printer_id) is host:
+            self._schedule(host, host.interval)
+
+        if self.on_result:
+            self.on_result(host)
+
+    async def _check(self, host: MonitoredHost, semaphore: asyncio.Semaphore):
+        dns = host.dns
+        try:
+            try:
+                is_available = await asyncio.wait_for(
+                    self.probe.check_async(dns), self.probe.timeout + 1.0
+                )
+            except asyncio.TimeoutError:
+                is_available = False
+            host.in_flight = False
+            self._apply_result(host, dns, is_available)
+        finally:
+            host.in_flight = False
+            semaphore.release()
+
+    async def run(self, stop: asyncio.Event):
+        """Prüft fällige Drucker, bis `stop` gesetzt wird."""
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        tasks: set[asyncio.Task] = set()
+
+        while not stop.is_set():
+            host = self._pop_due(self._clock())
+
+            if host is None:
+                # Bis zur nächsten Fälligkeit oder einer Änderung am Zeitplan warten
+                delay = self._heap[0][0] - self._clock() if self._heap else 1.0
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), max(0.01, min(delay, 1.0))
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await semaphore.acquire()
+            host.in_flight = True
+            task = asyncio.create_task(self._check(host, semaphore))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def status(self) -> list[dict[str, Any]]:
+        return [host.to_dict() for host in self.hosts.values()]
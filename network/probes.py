@@ -0,0 +1,180 @@
+# network/probes.py
+
+import asyncio
+from abc import ABC, abstractmethod
+
+from icmplib import async_ping, ping
+
+from .resolver import ResolverCache, get_resolver
+
+# RAW (JetDirect), LPD und IPP
+PRINTER_PORTS = (9100, 515, 631)
+
+
+class Probe(ABC):
+    """
+    Strategie zur Prüfung, ob ein Host erreichbar ist.
+
+    Der Name wird zuerst über den ResolverCache aufgelöst (nicht auflösbare
+    Namen gelten sofort als nicht erreichbar), danach prüft `check_address`
+    die Adresse. `check` ist die blockierende Variante für Threads ohne
+    Ereignisschleife. Jede Prüfung ist auf `timeout` Sekunden begrenzt und
+    liefert bei Fehlern False.
+    """
+
+    def __init__(self, timeout: float, resolver: ResolverCache | None = None):
+        self.timeout = timeout
+        self._resolver = resolver
+
+    @property
+    def resolver(self) -> ResolverCache:
+        return self._resolver or get_resolver()
+
+    async def check_async(self, host: str) -> bool:
+        address = await self.resolver.resolve_async(host)
+        if address is None:
+            return False
+        return await self.check_address(address)
+
+    @abstractmethod
+    async def check_address(self, address: str) -> bool:
+        """Prüft eine bereits aufgelöste Adresse (von Unterklassen zu implementieren)."""
+
+    def check(self, host: str) -> bool:
+        return asyncio.run(self.check_async(host))
+
+    def __call__(self, host: str) -> bool:
+        return self.check(host)
+
+
+class IcmpProbe(Probe):
+    """ICMP-Echo; benötigt je nach System Raw-Socket-Rechte."""
+
+    def __init__(
+        self,
+        timeout: float = 1.0,
+        count: int = 1,
+        resolver: ResolverCache | None = None,
+    ):
+        super().__init__(timeout, resolver)
+        self.count = count
+
+    async def check_address(self, address: str) -> bool:
+        try:
+            result = await async_ping(address, count=self.count, timeout=self.timeout)
+            return result.is_alive
+        except Exception:
+            return False
+
+    def check(self, host: str) -> bool:
+        address = self.resolver.resolve(host)
+        if address is None:
+            return False
+
+        try:
+            return ping(address, count=self.count, timeout=self.timeout).is_alive
+        except Exception:
+            return False
+
+
+class TcpProbe(Probe):
+    """
+    TCP-Verbindungsaufbau zu den Druckerports; erreichbar ist der Host, sobald
+    einer der Ports die Verbindung annimmt. Die Ports werden gleichzeitig geprüft.
+    """
+
+    def __init__(
+        self,
+        ports: tuple[int, ...] = PRINTER_PORTS,
+        timeout: float = 1.0,
+        resolver: ResolverCache | None = None,
+    ):
+        super().__init__(timeout, resolver)
+        self.ports = tuple(ports)
+
+    async def _connect(self, address: str, port: int) -> bool:
+        try:
+            _, writer = await asyncio.open_connection(address, port)
+        except (OSError, ValueError):
+            return False
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    async def check_address(self, address: str) -> bool:
+        return await first_success(
+            [self._connect(address, port) for port in self.ports], self.timeout
+        )
+
+    async def open_ports(self, address: str) -> tuple[int, ...]:
+        """Gibt alle Ports zurück, die innerhalb von `timeout` Verbindungen annehmen."""
+
+        async def connect(port: int) -> bool:
+            try:
+                return await asyncio.wait_for(
+                    self._connect(address, port), self.timeout
+                )
+            except asyncio.TimeoutError:
+                return False
+
+        results = await asyncio.gather(*(connect(port) for port in self.ports))
+        return tuple(port for port, is_open in zip(self.ports, results) if is_open)
+
+
+class CompositeProbe(Probe):
+    """
+    Führt mehrere Prüfungen gleichzeitig aus; die erste erfolgreiche gewinnt.
+    Der Name wird dabei nur einmal aufgelöst.
+    """
+
+    def __init__(self, *probes: Probe, resolver: ResolverCache | None = None):
+        super().__init__(
+            max((probe.timeout for probe in probes), default=0.0), resolver
+        )
+        self.probes = probes
+
+    async def check_address(self, address: str) -> bool:
+        return await first_success(
+            [_with_timeout(probe, address) for probe in self.probes], self.timeout
+        )
+
+
+async def _with_timeout(probe: Probe, address: str) -> bool:
+    try:
+        return await asyncio.wait_for(probe.check_address(address), probe.timeout)
+    except asyncio.TimeoutError:
+        return False
+
+
+async def first_success(coroutines, timeout: float) -> bool:
+    """
+    Wartet höchstens `timeout` Sekunden, bis eine der Coroutinen True liefert,
+    und bricht die übrigen dann ab.
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    if not tasks:
+        return False
+
+    success = False
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=timeout):
+            if await next_done:
+                success = True
+                break
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return success
+
+
+# Standard: Druckerports und ICMP parallel, damit auch Hosts hinter
+# ICMP-Filtern bzw. ohne offene Druckerports erkannt werden
+DEFAULT_PROBE = CompositeProbe(TcpProbe(timeout=1.0), IcmpProbe(timeout=1.0))
@@ -0,0 +1,187 @@
+# network/resolver.py
+
+import asyncio
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable
+
+# Gültigkeitsdauer einer Auflösung in Sekunden (gefunden / nicht gefunden)
+DEFAULT_TTL = 300.0
+DEFAULT_NEGATIVE_TTL = 30.0
+
+# Gleichzeitige Auflösungen bei resolve_many()
+DEFAULT_MAX_WORKERS = 32
+
+
+def system_resolve(host: str) -> str | None:
+    """Löst einen Namen über das Betriebssystem in eine IPv4-Adresse auf."""
+    try:
+        infos = socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError):
+        return None
+    return infos[0][4][0] if infos else None
+
+
+def is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class ResolverStats:
+    """Trefferstatistik des ResolverCache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.negative_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Anteil der aus dem Cache beantworteten Anfragen (0.0 bis 1.0)."""
+        return (self.hits + self.negative_hits) / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ResolverStats(hits={self.hits}, negative_hits={self.negative_hits}, "
+            f"misses={self.misses}, hit_rate={self.hit_rate:.1%})"
+        )
+
+
+class _PendingLookup:
+    def __init__(self):
+        self.done = threading.Event()
+        self.address: str | None = None
+
+
+class ResolverCache:
+    """
+    Zwischenspeicher für die Namensauflösung Hostname -> IP-Adresse.
+
+    Gefundene Adressen gelten `ttl` Sekunden, nicht auflösbare Namen
+    `negative_ttl` Sekunden. Gleichzeitige Anfragen für denselben Namen
+    teilen sich eine Auflösung. IP-Adressen werden unverändert zurückgegeben.
+    Die eigentliche Auflösung übernimmt `resolver` (für Tests austauschbar).
+    """
+
+    def __init__(
+        self,
+        resolver: Callable[[str], str | None] = system_resolve,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.resolver = resolver
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+
+        self.stats = ResolverStats()
+        self._lock = threading.Lock()
+        # Name -> (Adresse oder None, Ablaufzeitpunkt)
+        self._entries: dict[str, tuple[str | None, float]] = {}
+        self._pending: dict[str, _PendingLookup] = {}
+
+    def resolve(self, host: str) -> str | None:
+        """Gibt die Adresse zu `host` zurück, oder None, wenn der Name unbekannt ist."""
+        if is_ip_address(host):
+            return host
+
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None and self._clock() < entry[1]:
+                if entry[0] is None:
+                    self.stats.negative_hits += 1
+                else:
+                    self.stats.hits += 1
+                return entry[0]
+
+            self.stats.misses += 1
+            pending = self._pending.get(host)
+            owner = pending is None
+            if owner:
+                pending = self._pending[host] = _PendingLookup()
+
+        if not owner:
+            pending.done.wait()
+            return pending.address
+
+        try:
+            pending.address = self.resolver(host)
+        except Exception:
+            pending.address = None
+        finally:
+            ttl = self.ttl if pending.address is not None else self.negative_ttl
+            with self._lock:
+                self._entries[host] = (pending.address, self._clock() + ttl)
+                del self._pending[host]
+            pending.done.set()
+
+        return pending.address
+
+    async def resolve_async(self, host: str) -> str | None:
+        """Wie `resolve`, blockiert die Ereignisschleife aber nicht."""
+        if is_ip_address(host):
+            return host
+
+        with self._lock:
+            entry = self._entries.get(host)
+            cached = entry is not None and self._clock() < entry[1]
+
+        if cached:
+            return self.resolve(host)
+        return await asyncio.to_thread(self.resolve, host)
+
+    def resolve_many(
+        self, hosts: Iterable[str], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> dict[str, str | None]:
+        """Löst viele Namen gleichzeitig auf."""
+        hosts = list(dict.fromkeys(hosts))
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            return dict(zip(hosts, executor.map(self.resolve, hosts)))
+
+    async def resolve_many_async(self, hosts: Iterable[str]) -> dict[str, str | None]:
+        hosts = list(dict.fromkeys(hosts))
+        addresses = await asyncio.gather(*(self.resolve_async(host) for host in hosts))
+        return dict(zip(hosts, addresses))
+
+    def invalidate(self, host: str | None = None):
+        """Verwirft die Auflösung für `host` bzw. alle Auflösungen."""
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(host, None)
+
+
+_resolver: ResolverCache | None = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver() -> ResolverCache:
+    """Gibt den gemeinsamen ResolverCache des Prozesses zurück."""
+    global _resolver
+
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = ResolverCache()
+
+    return _resolver
@@ -0,0 +1,678 @@
+# network/snmp.py
+
+import asyncio
+import itertools
+import random
+import threading
+import time
+from typing import Any, Iterable
+
+from .resolver import get_resolver
+
+# SNMP v2c über UDP; BER-Kodierung nur für die hier benötigten Typen
+
+SNMP_PORT = 161
+DEFAULT_COMMUNITY = "public"
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_RETRIES = 1
+DEFAULT_CONCURRENCY = 256
+# Gültigkeitsdauer eines Druckerstatus in Sekunden
+DEFAULT_TTL = 120.0
+
+_VERSION_2C = 1
+
+# BER-Tags
+_INTEGER = 0x02
+_OCTET_STRING = 0x04
+_NULL = 0x05
+_OID = 0x06
+_SEQUENCE = 0x30
+_IP_ADDRESS = 0x40
+_COUNTER32 = 0x41
+_GAUGE32 = 0x42
+_TIMETICKS = 0x43
+_OPAQUE = 0x44
+_COUNTER64 = 0x46
+_NO_SUCH_OBJECT = 0x80
+_NO_SUCH_INSTANCE = 0x81
+_END_OF_MIB_VIEW = 0x82
+
+_GET_REQUEST = 0xA0
+_GET_NEXT_REQUEST = 0xA1
+_RESPONSE = 0xA2
+_GET_BULK_REQUEST = 0xA5
+
+# Platzhalter für noSuchObject, noSuchInstance und endOfMibView
+NO_SUCH_OBJECT = object()
+END_OF_MIB_VIEW = object()
+
+
+class SnmpError(Exception):
+    """Fehlerhafte oder vom Agenten mit Fehlerstatus beantwortete Anfrage."""
+
+
+# --- BER -------------------------------------------------------------------
+
+
+def _encode_length(length: int) -> bytes:
+    if length < 0x80:
+        return bytes((length,))
+    data = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((0x80 | len(data),)) + data
+
+
+def _tlv(tag: int, value: bytes) -> bytes:
+    return bytes((tag,)) + _encode_length(len(value)) + value
+
+
+def encode_integer(value: int, tag: int = _INTEGER) -> bytes:
+    length = max(1, (value + (value < 0)).bit_length() // 8 + 1)
+    return _tlv(tag, value.to_bytes(length, "big", signed=True))
+
+
+def encode_octet_string(value: bytes | str) -> bytes:
+    if isinstance(value, str):
+        value = value.encode()
+    return _tlv(_OCTET_STRING, value)
+
+
+def encode_null() -> bytes:
+    return b"\x05\x00"
+
+
+def encode_oid(oid: str) -> bytes:
+    arcs = [int(arc) for arc in oid.strip(".").split(".")]
+    if len(arcs) < 2:
+        raise ValueError(f"Ungültige OID: {oid}")
+
+    # Die ersten beiden Bögen bilden einen Subidentifier (bei 2.x auch > 127)
+    data = bytearray()
+    for arc in [40 * arcs[0] + arcs[1], *arcs[2:]]:
+        chunk = bytearray((arc & 0x7F,))
+        arc >>= 7
+        while arc:
+            chunk.insert(0, 0x80 | (arc & 0x7F))
+            arc >>= 7
+        data += chunk
+
+    return _tlv(_OID, bytes(data))
+
+
+def encode_sequence(*items: bytes, tag: int = _SEQUENCE) -> bytes:
+    return _tlv(tag, b"".join(items))
+
+
+def _decode_tlv(data: bytes, offset: int) -> tuple[int, int, int]:
+    """Gibt (Tag, Beginn des Inhalts, Ende des Inhalts) zurück."""
+    try:
+        tag = data[offset]
+        length = data[offset + 1]
+        offset += 2
+        if length & 0x80:
+            size = length & 0x7F
+            length = int.from_bytes(data[offset : offset + size], "big")
+            offset += size
+    except IndexError:
+        raise SnmpError("Unvollständiges BER-Element.") from None
+
+    end = offset + length
+    if end > len(data):
+        raise SnmpError("BER-Länge überschreitet die Nachricht.")
+    return tag, offset, end
+
+
+def _decode_oid(value: bytes) -> str:
+    if not value:
+        raise SnmpError("Leere OID.")
+
+    subidentifiers = []
+    arc = 0
+    for byte in value:
+        arc = (arc << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            subidentifiers.append(arc)
+            arc = 0
+    if value[-1] & 0x80:
+        raise SnmpError("Unvollständige OID.")
+
+    first = subidentifiers[0]
+    top = min(first // 40, 2)
+    arcs = [top, first - 40 * top, *subidentifiers[1:]]
+    return ".".join(str(arc) for arc in arcs)
+
+
+def _decode_value(tag: int, value: bytes) -> Any:
+    if tag == _INTEGER:
+        return int.from_bytes(value, "big", signed=True)
+    if tag in (_COUNTER32, _GAUGE32, _TIMETICKS, _COUNTER64):
+        return int.from_bytes(value, "big", signed=False)
+    if tag in (_OCTET_STRING, _OPAQUE):
+        return bytes(value)
+    if tag == _OID:
+        return _decode_oid(value)
+    if tag == _IP_ADDRESS:
+        return ".".join(str(byte) for byte in value)
+    if tag == _NULL:
+        return None
+    if tag in (_NO_SUCH_OBJECT, _NO_SUCH_INSTANCE):
+        return NO_SUCH_OBJECT
+    if tag == _END_OF_MIB_VIEW:
+        return END_OF_MIB_VIEW
+    raise SnmpError(f"Nicht unterstützter BER-Typ 0x{tag:02x}.")
+
+
+def _children(data: bytes, start: int, end: int) -> list[tuple[int, int, int]]:
+    items = []
+    while start < end:
+        tag, value_start, value_end = _decode_tlv(data, start)
+        items.append((tag, value_start, value_end))
+        start = value_end
+    return items
+
+
+def encode_request(
+    pdu_type: int,
+    request_id: int,
+    oids: Iterable[str],
+    community: str = DEFAULT_COMMUNITY,
+    non_repeaters: int = 0,
+    max_repetitions: int = 0,
+) -> bytes:
+    """Kodiert eine v2c-Anfrage (GET, GETNEXT oder GETBULK)."""
+    varbinds = encode_sequence(
+        *(encode_sequence(encode_oid(oid), encode_null()) for oid in oids)
+    )
+    pdu = encode_sequence(
+        encode_integer(request_id),
+        encode_integer(non_repeaters),
+        encode_integer(max_repetitions),
+        varbinds,
+        tag=pdu_type,
+    )
+    return encode_sequence(
+        encode_integer(_VERSION_2C), encode_octet_string(community), pdu
+    )
+
+
+def decode_message(data: bytes) -> tuple[int, int, int, int, list[tuple[str, Any]]]:
+    """
+    Zerlegt eine SNMP-Nachricht in (PDU-Typ, Request-ID, Fehlerstatus,
+    Fehlerindex, Varbinds). Bei GETBULK-Anfragen stehen in Fehlerstatus und
+    -index non-repeaters und max-repetitions.
+    """
+    tag, start, end = _decode_tlv(data, 0)
+    if tag != _SEQUENCE:
+        raise SnmpError("Keine SNMP-Nachricht.")
+
+    parts = _children(data, start, end)
+    if len(parts) != 3:
+        raise SnmpError("Unerwarteter Aufbau der SNMP-Nachricht.")
+
+    pdu_type, pdu_start, pdu_end = parts[2]
+    fields = _children(data, pdu_start, pdu_end)
+    if len(fields) != 4:
+        raise SnmpError("Unerwarteter Aufbau der PDU.")
+
+    request_id, error_status, error_index = (
+        _decode_value(tag, data[value_start:value_end])
+        for tag, value_start, value_end in fields[:3]
+    )
+
+    varbinds = []
+    _, list_start, list_end = fields[3]
+    for _, bind_start, bind_end in _children(data, list_start, list_end):
+        bind = _children(data, bind_start, bind_end)
+        if len(bind) != 2:
+            raise SnmpError("Unerwarteter Aufbau einer Variablenbindung.")
+        (_, oid_start, oid_end), (value_tag, value_start, value_end) = bind
+        varbinds.append(
+            (
+                _decode_oid(data[oid_start:oid_end]),
+                _decode_value(value_tag, data[value_start:value_end]),
+            )
+        )
+
+    return pdu_type, request_id, error_status, error_index, varbinds
+
+
+# --- Client ----------------------------------------------------------------
+
+
+class _ClientProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client: "SnmpClient"):
+        self.client = client
+
+    def datagram_received(self, data: bytes, addr):
+        self.client._on_datagram(data, addr)
+
+    def error_received(self, exc):
+        # z.B. ICMP "Port unreachable"; die Anfrage läuft in ihren Timeout
+        pass
+
+
+class SnmpClient:
+    """
+    Asynchroner SNMP-v2c-Client über einen einzigen UDP-Socket.
+
+    Beliebig viele Anfragen an beliebig viele Agenten laufen gleichzeitig;
+    Antworten werden über die Request-ID zugeordnet. Muss innerhalb einer
+    laufenden Ereignisschleife verwendet werden (`async with SnmpClient()`).
+    """
+
+    def __init__(
+        self,
+        community: str = DEFAULT_COMMUNITY,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        port: int = SNMP_PORT,
+    ):
+        self.community = community
+        self.timeout = timeout
+        self.retries = retries
+        self.port = port
+
+        self._transport: asyncio.DatagramTransport | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(random.randrange(1, 1 << 30))
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _ClientProtocol(self), local_addr=("0.0.0.0", 0)
+        )
+
+    def close(self):
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    async def __aenter__(self) -> "SnmpClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def _on_datagram(self, data: bytes, addr):
+        try:
+            message = decode_message(data)
+        except SnmpError:
+            return
+
+        pdu_type, request_id = message[0], message[1]
+        future = self._pending.get(request_id)
+        if pdu_type == _RESPONSE and future is not None and not future.done():
+            future.set_result(message)
+
+    async def _request(
+        self, host: str, pdu_type: int, oids: list[str], **kwargs
+    ) -> list[tuple[str, Any]]:
+        if self._transport is None:
+            raise SnmpError("Der SNMP-Client ist nicht geöffnet.")
+
+        loop = asyncio.get_running_loop()
+
+        for _ in range(self.retries + 1):
+            request_id = next(self._request_ids) & 0x7FFFFFFF
+            future = loop.create_future()
+            self._pending[request_id] = future
+            try:
+                self._transport.sendto(
+                    encode_request(
+                        pdu_type, request_id, oids, self.community, **kwargs
+                    ),
+                    (host, self.port),
+                )
+                _, _, error_status, error_index, varbinds = await asyncio.wait_for(
+                    future, self.timeout
+                )
+            except asyncio.TimeoutError:
+                continue
+            except OSError as e:
+                raise SnmpError(f"{host}: {e}") from e
+            finally:
+                self._pending.pop(request_id, None)
+
+            if error_status:
+                raise SnmpError(
+                    f"{host}: Fehlerstatus {error_status} bei Variable {error_index}."
+                )
+            return varbinds
+
+        raise SnmpError(f"{host}: Keine Antwort.")
+
+    async def get(self, host: str, oids: Iterable[str]) -> dict[str, Any]:
+        """GET auf mehrere OIDs in einer Anfrage."""
+        return dict(await self._request(host, _GET_REQUEST, list(oids)))
+
+    async def get_bulk(
+        self,
+        host: str,
+        oids: Iterable[str],
+        max_repetitions: int = 16,
+        non_repeaters: int = 0,
+    ) -> list[tuple[str, Any]]:
+        """GETBULK: liefert zu jeder OID bis zu `max_repetitions` Nachfolger."""
+        return await self._request(
+            host,
+            _GET_BULK_REQUEST,
+            list(oids),
+            non_repeaters=non_repeaters,
+            max_repetitions=max_repetitions,
+        )
+
+    async def walk_columns(
+        self, host: str, columns: list[str], max_repetitions: int = 16
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Liest mehrere Tabellenspalten parallel per GETBULK, bis alle Spalten
+        vollständig sind. Ergebnis: Spalte -> {Index: Wert}.
+        """
+        result: dict[str, dict[str, Any]] = {column: {} for column in columns}
+        cursors = {column: column for column in columns}
+
+        while cursors:
+            active = list(cursors)
+            varbinds = await self.get_bulk(
+                host, [cursors[column] for column in active], max_repetitions
+            )
+
+            # Antworten sind zeilenweise verschränkt: je Wiederholung eine OID pro Spalte
+            finished = set()
+            progressed = set()
+            for idx, (oid, value) in enumerate(varbinds):
+                column = active[idx % len(active)]
+                if column in finished:
+                    continue
+                if value is END_OF_MIB_VIEW or not oid.startswith(column + "."):
+                    finished.add(column)
+                    continue
+                result[column][oid[len(column) + 1 :]] = value
+                cursors[column] = oid
+                progressed.add(column)
+
+            # Fertige Spalten und solche ohne Fortschritt nicht weiter abfragen
+            for column in active:
+                if column in finished or column not in progressed:
+                    cursors.pop(column, None)
+
+        return result
+
+
+# --- Druckerstatus ---------------------------------------------------------
+
+OID_SYS_DESCR = "1.3.6.1.2.1.1.1.0"
+OID_DEVICE_STATUS = "1.3.6.1.2.1.25.3.2.1.5.1"
+OID_PRINTER_STATUS = "1.3.6.1.2.1.25.3.5.1.1.1"
+OID_ERROR_STATE = "1.3.6.1.2.1.25.3.5.1.2.1"
+OID_SUPPLY_DESCRIPTION = "1.3.6.1.2.1.43.11.1.1.6.1"
+OID_SUPPLY_MAX_CAPACITY = "1.3.6.1.2.1.43.11.1.1.8.1"
+OID_SUPPLY_LEVEL = "1.3.6.1.2.1.43.11.1.1.9.1"
+
+# hrDeviceStatus (HOST-RESOURCES-MIB)
+DEVICE_STATUS_TEXT = {
+    1: "Unbekannt",
+    2: "Bereit",
+    3: "Warnung",
+    4: "Test",
+    5: "Gestört",
+}
+
+# hrPrinterStatus
+PRINTER_STATUS_TEXT = {
+    1: "Sonstiges",
+    2: "Unbekannt",
+    3: "Bereit",
+    4: "Druckt",
+    5: "Aufwärmen",
+}
+
+# Bits von hrPrinterDetectedErrorState (Bit 0 = höchstwertiges Bit des ersten Bytes)
+ERROR_STATE_TEXT = (
+    "Wenig Papier",
+    "Kein Papier",
+    "Wenig Toner",
+    "Kein Toner",
+    "Klappe offen",
+    "Papierstau",
+    "Offline",
+    "Wartung erforderlich",
+    "Papierfach fehlt",
+    "Ausgabefach fehlt",
+    "Verbrauchsmaterial fehlt",
+    "Ausgabefach fast voll",
+    "Ausgabefach voll",
+    "Papierfach leer",
+    "Wartung überfällig",
+)
+
+
+def decode_error_state(value: bytes | None) -> list[str]:
+    if not isinstance(value, bytes):
+        return []
+
+    errors = []
+    for bit, text in enumerate(ERROR_STATE_TEXT):
+        byte_index, bit_index = divmod(bit, 8)
+        if byte_index < len(value) and value[byte_index] & (0x80 >> bit_index):
+            errors.append(text)
+    return errors
+
+
+# Füllstand bzw. Kapazität nicht bekannt (RFC 3805, -3: "etwas vorhanden")
+SUPPLY_UNKNOWN = -2
+
+
+class Supply:
+    """Füllstand eines Verbrauchsmaterials (Toner, Trommel, ...)."""
+
+    __slots__ = ("name", "level", "max_capacity")
+
+    def __init__(self, name: str, level: int, max_capacity: int):
+        self.name = name
+        self.level = level
+        self.max_capacity = max_capacity
+
+    @property
+    def percent(self) -> int | None:
+        """Füllstand in Prozent; None, wenn der Drucker ihn nicht angibt (-2, -3)."""
+        if self.level < 0 or self.max_capacity <= 0:
+            return None
+        return round(100 * self.level / self.max_capacity)
+
+    def __str__(self) -> str:
+        percent = self.percent
+        if percent is not None:
+            return f"{self.name} {percent} %"
+        if self.level == -3:
+            return f"{self.name} vorhanden"
+        return f"{self.name} ?"
+
+
+class PrinterStatus:
+    """Über SNMP ermittelter Zustand eines Druckers."""
+
+    def __init__(
+        self,
+        host: str,
+        description: str = "",
+        device_status: int | None = None,
+        printer_status: int | None = None,
+        errors: list[str] | None = None,
+        supplies: list[Supply] | None = None,
+    ):
+        self.host = host
+        self.description = description
+        self.device_status = device_status
+        self.printer_status = printer_status
+        self.errors = errors or []
+        self.supplies = supplies or []
+        self.collected_at = time.time()
+
+    @property
+    def status_text(self) -> str:
+        if self.printer_status in PRINTER_STATUS_TEXT:
+            return PRINTER_STATUS_TEXT[self.printer_status]
+        return DEVICE_STATUS_TEXT.get(self.device_status, "Unbekannt")
+
+    def summary(self) -> str:
+        """Einzeilige Zusammenfassung für die Detailansicht."""
+        parts = [self.status_text]
+        if self.errors:
+            parts.append(", ".join(self.errors))
+        if self.supplies:
+            parts.append(", ".join(str(supply) for supply in self.supplies))
+        return " · ".join(parts)
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace").strip("\x00 ")
+    return "" if value is None or value is NO_SUCH_OBJECT else str(value)
+
+
+def _number(value: Any) -> int | None:
+    return value if isinstance(value, int) else None
+
+
+def _supply_value(value: Any) -> int:
+    # 0 ist ein echter Wert (z.B. leerer Toner), nur fehlende Werte sind unbekannt
+    number = _number(value)
+    return SUPPLY_UNKNOWN if number is None else number
+
+
+async def query_printer_status(client: SnmpClient, host: str) -> PrinterStatus:
+    """Fragt Status und Füllstände eines Druckers mit einem GET und GETBULK ab."""
+    scalars, columns = await asyncio.gather(
+        client.get(
+            host,
+            [OID_SYS_DESCR, OID_DEVICE_STATUS, OID_PRINTER_STATUS, OID_ERROR_STATE],
+        ),
+        client.walk_columns(
+            host, [OID_SUPPLY_DESCRIPTION, OID_SUPPLY_MAX_CAPACITY, OID_SUPPLY_LEVEL]
+        ),
+    )
+
+    descriptions = columns[OID_SUPPLY_DESCRIPTION]
+    supplies = [
+        Supply(
+            _text(description),
+            _supply_value(columns[OID_SUPPLY_LEVEL].get(index)),
+            _supply_value(columns[OID_SUPPLY_MAX_CAPACITY].get(index)),
+        )
+        for index, description in sorted(
+            descriptions.items(), key=lambda item: int(item[0].split(".")[0])
+        )
+    ]
+
+    return PrinterStatus(
+        host,
+        description=_text(scalars.get(OID_SYS_DESCR)),
+        device_status=_number(scalars.get(OID_DEVICE_STATUS)),
+        printer_status=_number(scalars.get(OID_PRINTER_STATUS)),
+        errors=decode_error_state(scalars.get(OID_ERROR_STATE)),
+        supplies=supplies,
+    )
+
+
+class PrinterStatusCollector:
+    """
+    Sammelt den SNMP-Status vieler Drucker und hält ihn `ttl` Sekunden vor.
+
+    `collect_many` fragt alle nicht zwischengespeicherten Drucker über einen
+    gemeinsamen UDP-Socket gleichzeitig ab (höchstens `concurrency`). Drucker
+    ohne Antwort werden mit None gespeichert.
+    """
+
+    def __init__(
+        self,
+        community: str = DEFAULT_COMMUNITY,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        port: int = SNMP_PORT,
+        ttl: float = DEFAULT_TTL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        self.community = community
+        self.timeout = timeout
+        self.retries = retries
+        self.port = port
+        self.ttl = ttl
+        self.concurrency = concurrency
+
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[PrinterStatus | None, float]] = {}
+
+    def cached(self, host: str) -> tuple[bool, PrinterStatus | None]:
+        """Gibt (vorhanden?, Status) aus dem Zwischenspeicher zurück."""
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None or time.monotonic() >= entry[1]:
+                return False, None
+            return True, entry[0]
+
+    async def collect_many(
+        self, hosts: Iterable[str], refresh: bool = False
+    ) -> dict[str, PrinterStatus | None]:
+        results: dict[str, PrinterStatus | None] = {}
+        missing = []
+
+        for host in dict.fromkeys(hosts):
+            found, status = (False, None) if refresh else self.cached(host)
+            if found:
+                results[host] = status
+            else:
+                missing.append(host)
+
+        if not missing:
+            return results
+
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async with SnmpClient(
+            self.community, self.timeout, self.retries, self.port
+        ) as client:
+
+            async def collect(host: str):
+                async with semaphore:
+                    status = None
+                    address = await get_resolver().resolve_async(host)
+                    if address is not None:
+                        try:
+                            status = await query_printer_status(client, address)
+                            status.host = host
+                        except SnmpError:
+                            pass
+
+                results[host] = status
+                with self._lock:
+                    self._entries[host] = (status, time.monotonic() + self.ttl)
+
+            await asyncio.gather(*(collect(host) for host in missing))
+
+        return results
+
+    def collect(self, host: str, refresh: bool = False) -> PrinterStatus | None:
+        """Blockierende Abfrage eines Druckers (für Arbeitsthreads)."""
+        found, status = (False, None) if refresh else self.cached(host)
+        if found:
+            return status
+        return asyncio.run(self.collect_many([host], refresh=True))[host]
+
+
+_collector: PrinterStatusCollector | None = None
+_collector_lock = threading.Lock()
+
+
+def get_status_collector() -> PrinterStatusCollector:
+    """Gibt den gemeinsamen PrinterStatusCollector des Prozesses zurück."""
+    global _collector
+
+    with _collector_lock:
+        if _collector is None:
+            _collector = PrinterStatusCollector()
+
+    return _collector
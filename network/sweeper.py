@@ -0,0 +1,120 @@
+# network/sweeper.py
+
+import asyncio
+import queue
+import threading
+import time
+from typing import Callable, Hashable, Iterable, Iterator
+
+from .probes import DEFAULT_PROBE, Probe
+
+# Standardwerte für eine Prüfung aller Drucker
+DEFAULT_CONCURRENCY = 128
+DEFAULT_HOST_TIMEOUT = 1.0
+DEFAULT_BUDGET = 15.0
+
+
+async def sweep(
+    hosts: Iterable[tuple[Hashable, str]],
+    on_result: Callable[[Hashable, bool], None] | None = None,
+    probe: Probe = DEFAULT_PROBE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    host_timeout: float = DEFAULT_HOST_TIMEOUT,
+    budget: float = DEFAULT_BUDGET,
+    should_stop: Callable[[], bool] | None = None,
+) -> dict[Hashable, bool | None]:
+    """
+    Prüft viele Hosts gleichzeitig auf Erreichbarkeit.
+
+    `hosts` enthält Paare aus Schlüssel (z.B. Drucker-ID) und Adresse. Höchstens
+    `concurrency` Prüfungen laufen gleichzeitig, jede ist zusätzlich zum
+    Timeout der `probe` auf `host_timeout` Sekunden begrenzt. Jedes Ergebnis
+    wird sofort an `on_result` gemeldet.
+    Nach `budget` Sekunden (oder wenn `should_stop()` wahr wird) werden
+    offene Prüfungen abgebrochen; ihr Ergebnis ist None.
+    """
+    hosts = list(hosts)
+    results: dict[Hashable, bool | None] = {key: None for key, _ in hosts}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    deadline = time.monotonic() + budget
+
+    async def check(key: Hashable, host: str):
+        async with semaphore:
+            if should_stop and should_stop():
+                return
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+            timeout = min(host_timeout, remaining)
+            try:
+                is_available = await asyncio.wait_for(probe.check_async(host), timeout)
+            except asyncio.TimeoutError:
+                is_available = False
+
+            results[key] = is_available
+            if on_result:
+                on_result(key, is_available)
+
+    tasks = [asyncio.create_task(check(key, host)) for key, host in hosts]
+    if not tasks:
+        return results
+
+    _, pending = await asyncio.wait(tasks, timeout=max(0.0, budget))
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    return results
+
+
+def run_sweep(
+    hosts: Iterable[tuple[Hashable, str]], **kwargs
+) -> dict[Hashable, bool | None]:
+    """Synchroner Einstieg für Threads ohne eigene Ereignisschleife."""
+    return asyncio.run(sweep(hosts, **kwargs))
+
+
+def iter_sweep(
+    hosts: Iterable[tuple[Hashable, str]], **kwargs
+) -> Iterator[tuple[Hashable, bool | None]]:
+    """
+    Wie `run_sweep`, liefert die Ergebnisse aber fortlaufend in der Reihenfolge,
+    in der sie feststehen, als Paare (Schlüssel, Ergebnis). Nicht geprüfte
+    Hosts folgen am Ende mit None. Die Prüfung läuft in einem eigenen Thread;
+    wird der Generator vorzeitig geschlossen, bricht sie ab.
+    """
+    results: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    done = object()
+    errors: list[BaseException] = []
+
+    def run():
+        try:
+            final = run_sweep(
+                hosts,
+                on_result=lambda key, is_available: results.put((key, is_available)),
+                should_stop=stop.is_set,
+                **kwargs,
+            )
+            for key, is_available in final.items():
+                if is_available is None:
+                    results.put((key, None))
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            results.put(done)
+
+    thread = threading.Thread(target=run, name="sweep", daemon=True)
+    thread.start()
+
+    try:
+        while (item := results.get()) is not done:
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+    if errors:
+        raise errors[0]
@@ -0,0 +1,32 @@
+# tests/conftest.py
+
+import os
+
+import pytest
+
+import crud.database as database
+from crud.migrations import migrate_db
+from crud.pool import ConnectionPool
+from crud.rows import record_factory
+
+
+@pytest.fixture
+def empty_db_path(tmp_path, monkeypatch):
+    """Leere Datenbank im Temp-Verzeichnis ohne Schema und ohne lokale Kopie."""
+    # structure.sql wird relativ zum Projektverzeichnis gelesen
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    path = str(tmp_path / "dv.db")
+    pool = ConnectionPool(path, row_factory=record_factory)
+    monkeypatch.setattr(database, "_pool", pool)
+    monkeypatch.setattr(database, "_replica", None)
+
+    yield path
+    pool.close_all()
+
+
+@pytest.fixture
+def db_path(empty_db_path):
+    """Wie `empty_db_path`, aber auf dem aktuellen Schemastand."""
+    migrate_db()
+    return empty_db_path
@@ -0,0 +1,80 @@
+# tests/fake_powershell.py
+
+"""
+Stand-in für powershell.exe in Tests: liest ein von `render_script` erzeugtes
+Skript und simuliert dessen Schritte, statt sie auszuführen. Das Verhalten
+eines Schritts hängt von Markierungen im Rumpf ab (z.B. im Druckernamen):
+
+- FAIL:  Schritt schlägt fehl
+- HANG:  Schritt hängt in einem Kindprozess (wie ein hängendes pnputil)
+- FLAKY: vorübergehender Fehler, solange der Zähler in $FAKE_PS_STATE
+         kleiner als $FAKE_PS_FLAKY (Standard 1) ist
+
+Jeder ausgeführte Schritt gibt eine OUT-Zeile und eine Zeile auf stderr aus.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+EXIT_RETRY = 75
+
+_DONE = re.compile(r"^\$s(\d+) = \$(true|false)$", re.M)
+_STEP = re.compile(
+    r"^\$s(\d+) = Invoke-Step \d+ \((.*?)\) \$(true|false) \{\n(.*?)\n\}",
+    re.M | re.S,
+)
+
+
+def status(line: str):
+    print(line, flush=True)
+
+
+def flaky() -> bool:
+    path = os.environ["FAKE_PS_STATE"]
+    count = int(open(path).read()) if os.path.exists(path) else 0
+    with open(path, "w") as f:
+        f.write(str(count + 1))
+    return count < int(os.environ.get("FAKE_PS_FLAKY", "1"))
+
+
+def main(script_path: str):
+    with open(script_path, encoding="utf-8-sig") as f:
+        script = f.read()
+
+    ok = {int(m.group(1)): m.group(2) == "true" for m in _DONE.finditer(script)}
+    for m in _STEP.finditer(script):
+        index = int(m.group(1))
+        depends = [int(number) for number in re.findall(r"\$s(\d+)", m.group(2))]
+        can_retry = m.group(3) == "true"
+        body = m.group(4)
+
+        if not all(ok[number] for number in depends):
+            status(f"##STEP {index} SKIP")
+            ok[index] = False
+            continue
+
+        status(f"##STEP {index} START")
+        status(f"##STEP {index} OUT Ausgabe von Schritt {index}")
+        print(f"stderr von Schritt {index}", file=sys.stderr, flush=True)
+
+        if "HANG" in body:
+            # Enkelprozess hält die geerbte Ausgabe offen
+            subprocess.run(["sh", "-c", "sleep 30 | cat"])
+        if "FAIL" in body:
+            status(f"##STEP {index} FAIL Zugriff verweigert")
+            ok[index] = False
+        elif "FLAKY" in body and flaky():
+            if can_retry:
+                status(f"##STEP {index} RETRY Der RPC-Server ist nicht verfügbar.")
+                sys.exit(EXIT_RETRY)
+            status(f"##STEP {index} FAIL Der RPC-Server ist nicht verfügbar.")
+            ok[index] = False
+        else:
+            status(f"##STEP {index} OK")
+            ok[index] = True
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -0,0 +1,76 @@
+# Erzeugt von Drucker-Verwaltung - nicht bearbeiten
+$ErrorActionPreference = 'Stop'
+$ProgressPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+
+function Write-Status([string]$Line) {
+    [Console]::Out.WriteLine($Line)
+    [Console]::Out.Flush()
+}
+
+function Invoke-Step([int]$Index, [bool]$Ready, [bool]$CanRetry, [scriptblock]$Action) {
+    if (-not $Ready) {
+        Write-Status "##STEP $Index SKIP"
+        return $false
+    }
+    Write-Status "##STEP $Index START"
+    try {
+        & $Action | ForEach-Object { Write-Status "##STEP $Index OUT $_" }
+        Write-Status "##STEP $Index OK"
+        return $true
+    } catch {
+        $message = ($_.Exception.Message -replace '\s+', ' ').Trim()
+        if ($CanRetry -and $message -match $TransientErrors) {
+            Write-Status "##STEP $Index RETRY $message"
+            exit 75
+        }
+        Write-Status "##STEP $Index FAIL $message"
+        return $false
+    }
+}
+
+$TransientErrors = 'RPC|Spooler|0x800706BA|0x800706BE|0x80070079|Zeitüberschreitung|Zeitlimit|timed out'
+
+# Port IP_h1 wird angelegt
+$s0 = Invoke-Step 0 ($true) $true {
+    Add-PrinterPort -Name 'IP_h1' -PrinterHostAddress 'h1' -PortNumber 9100
+}
+
+# Port IP_h3 wird angelegt
+$s1 = Invoke-Step 1 ($true) $true {
+    Add-PrinterPort -Name 'IP_h3' -PrinterHostAddress 'h3' -PortNumber 9100
+}
+
+# Treiber 'Treiber A' wird installiert
+$s2 = Invoke-Step 2 ($true) $true {
+    $ErrorActionPreference = 'Continue'
+    pnputil.exe /add-driver '\\srv\Treiber\O''Brien\drv.inf' /install 2>&1 | ForEach-Object { "$_" }
+    $ErrorActionPreference = 'Stop'
+    if ($LASTEXITCODE -notin 0, 3010) { throw "pnputil: Exit-Code $LASTEXITCODE" }
+    Add-PrinterDriver -Name 'Treiber A'
+}
+
+# Warteschlange '[A] P1' wird eingerichtet
+$s3 = Invoke-Step 3 ($s0 -and $s2) $true {
+    Add-Printer -Name '[A] P1' -DriverName 'Treiber A' -PortName 'IP_h1'
+}
+
+# Warteschlange '[B] P1' wird eingerichtet
+$s4 = Invoke-Step 4 ($s0 -and $s2) $true {
+    Add-Printer -Name '[B] P1' -DriverName 'Treiber A' -PortName 'IP_h1'
+}
+
+# Veraltete Warteschlange '[A] P2' wird entfernt
+$s5 = Invoke-Step 5 ($s2) $true {
+    Remove-Printer -Name '[A] P2'
+}
+
+# Warteschlange '[A] P2' wird eingerichtet
+$s6 = Invoke-Step 6 ($s5) $true {
+    Add-Printer -Name '[A] P2' -DriverName 'Treiber A' -PortName 'IP_h2'
+}
+
+# Warteschlange '[A] P3' wird eingerichtet
+$s7 = Invoke-Step 7 ($s1) $true {
+    Add-Printer -Name '[A] P3' -DriverName 'Treiber B' -PortName 'IP_h3'
+}
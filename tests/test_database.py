@@ -0,0 +1,46 @@
+# tests/test_database.py
+
+import sqlite3
+
+import pytest
+
+from crud.bulk import import_file
+from crud.database import get_db_cursor, get_read_cursor
+from crud.locations import create_location
+
+
+def count_printers() -> int:
+    with get_read_cursor() as cursor:
+        return cursor.execute("SELECT COUNT(*) AS n FROM printers").fetchone()["n"]
+
+
+def test_other_errors_roll_back_the_pooled_transaction(db_path):
+    with pytest.raises(RuntimeError):
+        with get_db_cursor() as cursor:
+            cursor.execute("INSERT INTO locations (name) VALUES ('A')")
+            raise RuntimeError("kaputt")
+
+    # Die nächste Schreiboperation darf die halbe Transaktion nicht festschreiben
+    create_location("B")
+    with get_read_cursor() as cursor:
+        names = [row["name"] for row in cursor.execute("SELECT name FROM locations")]
+    assert names == ["B"]
+
+
+def test_broken_import_file_releases_the_write_lock(db_path, tmp_path):
+    path = tmp_path / "drucker.jsonl"
+    path.write_text(
+        '{"location": "A", "dns": "h1", "name": "P1", "model": "M", '
+        '"driver_name": "D", "driver_inf_path": "x.inf"}\n{"location": ',
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError):
+        import_file(str(path))
+
+    # Eine zweite Verbindung kann schreiben, der Import hat nichts hinterlassen
+    other = sqlite3.connect(db_path, timeout=0.5)
+    other.execute("INSERT INTO locations (name) VALUES ('Fremd')")
+    other.commit()
+    other.close()
+    assert count_printers() == 0
@@ -0,0 +1,171 @@
+# tests/test_discovery.py
+
+import asyncio
+import ipaddress
+import socket
+
+import pytest
+
+from crud.bulk import import_printers
+from crud.printers import iter_printers
+from network.discovery import (
+    DiscoveredDevice,
+    find_unregistered,
+    iter_addresses,
+    scan,
+    to_import_rows,
+)
+from network.resolver import ResolverCache
+
+
+@pytest.fixture
+def listening_port():
+    """Port auf 127.0.0.1, der Verbindungen annimmt."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(16)
+        yield server.getsockname()[1]
+
+
+def _expected(networks):
+    # Referenz: Vereinigung von hosts() aller Netze, in Reihenfolge des ersten Auftretens
+    result = []
+    for network in networks:
+        for address in ipaddress.ip_network(network, strict=False).hosts():
+            if str(address) not in result:
+                result.append(str(address))
+    return result
+
+
+def test_overlapping_networks_yield_each_address_once():
+    networks = ["10.0.0.0/25", "10.0.0.0/24", "10.0.0.64/26"]
+
+    addresses = list(iter_addresses(networks))
+
+    assert addresses == _expected(networks)
+    assert len(addresses) == len(set(addresses)) == 254
+
+
+def test_network_and_broadcast_of_earlier_range_are_still_yielded():
+    # 10.0.0.127 ist Broadcast von /25, aber Host im /24 danach
+    networks = ["10.0.0.0/25", "10.0.0.0/24", "10.0.0.4/31", "10.0.0.255/32"]
+
+    assert list(iter_addresses(networks)) == _expected(networks)
+
+
+def test_disjoint_networks_and_mixed_versions():
+    networks = [" 192.168.1.0/30 ", "192.168.2.0/30", "fd00::/126", "fd00::1/128"]
+
+    assert list(iter_addresses(networks)) == _expected(
+        [network.strip() for network in networks]
+    )
+
+
+def test_scan_finds_local_listener(listening_port):
+    reported = []
+
+    devices = asyncio.run(
+        scan(
+            ["127.0.0.1/32"],
+            ports=(listening_port,),
+            resolve_names=False,
+            on_found=reported.append,
+        )
+    )
+
+    assert [(device.address, device.ports, device.hostname) for device in devices] == [
+        ("127.0.0.1", (listening_port,), None)
+    ]
+    assert reported == devices
+
+
+def test_scan_skips_hosts_without_open_port(listening_port):
+    # 127.0.0.2 ist erreichbar, lauscht aber nicht auf dem Port
+    devices = asyncio.run(
+        scan(
+            ["127.0.0.0/30"],
+            ports=(listening_port,),
+            timeout=1.0,
+            concurrency=4,
+            resolve_names=False,
+        )
+    )
+
+    assert [device.address for device in devices] == ["127.0.0.1"]
+
+
+def test_scan_stops_when_asked(listening_port):
+    devices = asyncio.run(
+        scan(
+            ["127.0.0.1/32"],
+            ports=(listening_port,),
+            resolve_names=False,
+            should_stop=lambda: True,
+        )
+    )
+
+    assert devices == []
+
+
+def _resolver():
+    addresses = {"drucker-a.firma.local": "10.0.0.5", "drucker-c": "10.0.0.7"}
+    return ResolverCache(resolver=addresses.get)
+
+
+def test_find_unregistered_compares_names_and_addresses():
+    devices = [
+        # Katalogeintrag per Name, der auf die Adresse des Geräts zeigt
+        DiscoveredDevice("10.0.0.5", (9100,)),
+        # Katalogeintrag über den Rückwärtsnamen (Groß-/Kleinschreibung egal)
+        DiscoveredDevice("10.0.0.8", (631,), "Drucker-B.firma.local"),
+        # Katalogeintrag per Adresse
+        DiscoveredDevice("10.0.0.9", (515,)),
+        DiscoveredDevice("10.0.0.6", (9100, 515), "neu.firma.local"),
+        DiscoveredDevice("10.0.0.10", (9100,)),
+    ]
+    known = ["DRUCKER-A.firma.local", "drucker-b.firma.local", "10.0.0.9", "", None]
+
+    unregistered = find_unregistered(devices, known, resolver=_resolver())
+
+    assert [device.address for device in unregistered] == ["10.0.0.6", "10.0.0.10"]
+
+
+def test_unregistered_devices_can_be_imported(db_path):
+    import_printers(
+        to_import_rows(
+            [DiscoveredDevice("10.0.0.5", (9100,), "drucker-a.firma.local")],
+            "Lager",
+            "Alt",
+            "Treiber",
+            r"C:\Treiber\a.inf",
+        )
+    )
+    devices = [
+        DiscoveredDevice("10.0.0.5", (9100,)),
+        DiscoveredDevice("10.0.0.6", (9100,), "neu.firma.local"),
+        DiscoveredDevice("10.0.0.10", (515,)),
+    ]
+
+    unregistered = find_unregistered(
+        devices,
+        (printer["dns"] for printer in iter_printers()),
+        resolver=_resolver(),
+    )
+    rows = list(
+        to_import_rows(unregistered, "Lager", "M1", "Treiber", r"C:\Treiber\m1.inf")
+    )
+
+    assert [(row["dns"], row["name"]) for row in rows] == [
+        ("neu.firma.local", "neu"),
+        ("10.0.0.10", "10.0.0.10"),
+    ]
+    assert all((row["location"], row["model"]) == ("Lager", "M1") for row in rows)
+
+    report = import_printers(rows)
+
+    assert (report.imported, report.errors) == (2, [])
+    assert sorted(printer["dns"] for printer in iter_printers()) == [
+        "10.0.0.10",
+        "drucker-a.firma.local",
+        "neu.firma.local",
+    ]
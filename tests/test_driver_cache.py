@@ -0,0 +1,160 @@
+# tests/test_driver_cache.py
+
+import hashlib
+import os
+
+import pytest
+
+from installer.driver_cache import INDEX_NAME, DriverCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        self.now += 1
+        return self.now
+
+
+def make_package(directory, content: bytes = b"x" * 100, name="drv"):
+    os.makedirs(directory, exist_ok=True)
+    (directory / f"{name}.inf").write_bytes(b"[Version]\n" + name.encode())
+    (directory / f"{name}.dll").write_bytes(content)
+    return str(directory / f"{name}.inf")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DriverCache(str(tmp_path / "cache"), chunk_size=16, clock=Clock())
+
+
+def package_dirs(cache: DriverCache) -> list[str]:
+    return sorted(os.listdir(os.path.join(cache.root, "packages")))
+
+
+def test_stage_copies_package(cache, tmp_path):
+    inf = make_package(tmp_path / "share")
+
+    local = cache.stage(inf)
+
+    assert local.startswith(cache.root)
+    with open(os.path.join(os.path.dirname(local), "drv.dll"), "rb") as f:
+        assert f.read() == b"x" * 100
+    assert cache.size == 100 + len(b"[Version]\ndrv")
+
+
+def test_unchanged_source_is_not_read_again(cache, tmp_path, monkeypatch):
+    inf = make_package(tmp_path / "share")
+    first = cache.stage(inf)
+
+    def no_copy(*args):
+        raise AssertionError("Quelle wurde erneut gelesen")
+
+    monkeypatch.setattr(cache, "_copy", no_copy)
+    assert cache.stage(inf) == first
+
+
+def test_touched_file_with_same_content_reuses_package(cache, tmp_path):
+    inf = make_package(tmp_path / "share")
+    first = cache.stage(inf)
+
+    dll = tmp_path / "share" / "drv.dll"
+    os.utime(dll, ns=(1, 1))
+
+    assert cache.stage(inf) == first
+    assert len(package_dirs(cache)) == 1
+
+
+def test_same_content_from_other_source_shares_package(cache, tmp_path):
+    first = cache.stage(make_package(tmp_path / "share1"))
+    second = cache.stage(make_package(tmp_path / "share2"))
+
+    assert first == second
+    assert len(package_dirs(cache)) == 1
+
+
+def test_changed_content_creates_new_package(cache, tmp_path):
+    inf = make_package(tmp_path / "share")
+    first = cache.stage(inf)
+
+    (tmp_path / "share" / "drv.dll").write_bytes(b"y" * 100)
+
+    second = cache.stage(inf)
+    assert second != first
+    with open(os.path.join(os.path.dirname(second), "drv.dll"), "rb") as f:
+        assert f.read() == b"y" * 100
+
+
+def test_interrupted_copy_resumes_from_part_file(cache, tmp_path):
+    inf = make_package(tmp_path / "share")
+    source_dir = os.path.dirname(os.path.abspath(inf))
+    stat = os.stat(os.path.join(source_dir, "drv.dll"))
+
+    # Erste Hälfte einer früheren Kopie; abweichender Inhalt zeigt, dass sie
+    # übernommen und nicht neu gelesen wird
+    staging = os.path.join(
+        cache.root,
+        "staging",
+        hashlib.sha1(os.path.normcase(source_dir).encode()).hexdigest()[:16],
+    )
+    os.makedirs(staging)
+    part = os.path.join(staging, f"drv.dll.{stat.st_size}-{stat.st_mtime_ns}.part")
+    with open(part, "wb") as f:
+        f.write(b"R" * 48)
+
+    local = cache.stage(inf)
+
+    with open(os.path.join(os.path.dirname(local), "drv.dll"), "rb") as f:
+        assert f.read() == b"R" * 48 + b"x" * 52
+    assert not os.path.exists(staging)
+
+
+def test_least_recently_used_packages_are_evicted(tmp_path):
+    cache = DriverCache(str(tmp_path / "cache"), max_size=250, clock=Clock())
+    a = cache.stage(make_package(tmp_path / "a", b"a" * 100))
+    b = cache.stage(make_package(tmp_path / "b", b"b" * 100))
+    cache.stage(make_package(tmp_path / "a", b"a" * 100))  # a zuletzt benutzt
+
+    cache.stage(make_package(tmp_path / "c", b"c" * 100))
+
+    assert os.path.exists(a)
+    assert not os.path.exists(b)
+    assert cache.size <= 250
+
+
+def test_lost_index_does_not_block_staging(cache, tmp_path):
+    inf = make_package(tmp_path / "share")
+    first = cache.stage(inf)
+
+    os.remove(os.path.join(cache.root, INDEX_NAME))
+    reopened = DriverCache(cache.root, clock=Clock())
+
+    assert reopened.stage(inf) == first
+    assert os.path.exists(first)
+    assert package_dirs(reopened) == [os.path.basename(os.path.dirname(first))]
+
+
+def test_package_without_index_entry_is_replaced(cache, tmp_path):
+    # Abbruch zwischen dem Anlegen des Pakets und dem Speichern des Index
+    inf = make_package(tmp_path / "share")
+    first = cache.stage(inf)
+    cache._sources.clear()
+    cache._packages.clear()
+
+    assert cache.stage(inf) == first
+    assert package_dirs(cache) == [os.path.basename(os.path.dirname(first))]
+
+
+def test_leftovers_are_cleaned_up_on_start(cache, tmp_path):
+    packages = os.path.join(cache.root, "packages")
+    os.makedirs(os.path.join(packages, "0123456789abcdef.tmp"))
+    os.makedirs(os.path.join(packages, "fedcba9876543210"))
+    old_staging = os.path.join(cache.root, "staging", "alt")
+    os.makedirs(old_staging)
+    os.utime(old_staging, (0, 0))
+
+    reopened = DriverCache(cache.root, clock=Clock())
+
+    assert package_dirs(reopened) == []
+    assert not os.path.exists(old_staging)
@@ -0,0 +1,91 @@
+# tests/test_history.py
+
+import sqlite3
+
+import pytest
+
+from crud.history import RAW_RETENTION, AvailabilityHistory
+
+NOW = 2_000_000_000
+# Beginn einer Stunde, die downsample() bereits verdichtet
+OLD_HOUR = (NOW - RAW_RETENTION) // 3600 * 3600 - 10 * 3600
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = AvailabilityHistory(str(tmp_path / "history.db"), flush_interval=3600)
+    yield history
+    history.close()
+
+
+def downsample(
+    history: AvailabilityHistory, host: str, results: list[tuple[int, bool]]
+):
+    for offset, is_available in results:
+        history.record(host, is_available, ts=OLD_HOUR + offset)
+    history.flush()
+    history.downsample(now=NOW)
+
+
+def test_never_up_host_keeps_last_seen_empty_across_merges(history):
+    downsample(history, "h1", [(0, False), (60, False)])
+    downsample(history, "h1", [(120, False)])
+
+    assert history.last_seen("h1") is None
+    assert history.uptime("h1", since=0) == 0.0
+
+
+def test_merge_keeps_latest_up_time(history):
+    downsample(history, "h1", [(0, True), (60, False)])
+    downsample(history, "h1", [(120, False)])
+    assert history.last_seen("h1") == OLD_HOUR
+
+    downsample(history, "h1", [(180, True)])
+    assert history.last_seen("h1") == OLD_HOUR + 180
+
+
+def _fail_sample_writes(path: str, fail: bool):
+    # Trigger in einer eigenen Verbindung: lässt jedes Einfügen in `samples` scheitern
+    with sqlite3.connect(path) as conn:
+        if fail:
+            conn.execute(
+                "CREATE TRIGGER fail_samples BEFORE INSERT ON samples "
+                "BEGIN SELECT RAISE(ABORT, 'Schreibfehler'); END;"
+            )
+        else:
+            conn.execute("DROP TRIGGER fail_samples")
+    conn.close()
+
+
+def test_failed_flush_keeps_samples_for_the_next_attempt(history):
+    _fail_sample_writes(history.path, True)
+    history.record("h1", True, ts=NOW - 60)
+    history.record("h2", False, ts=NOW - 60)
+
+    with pytest.raises(sqlite3.Error):
+        history.flush()
+    assert history.uptime("h1", since=0) is None
+
+    # Weitere Ergebnisse kommen nach den zurückgelegten
+    history.record("h1", False, ts=NOW - 30)
+    _fail_sample_writes(history.path, False)
+    history.flush()
+
+    assert history.uptime("h1", since=0) == 50.0
+    assert history.uptime("h2", since=0) == 0.0
+    assert history.last_seen("h1") == NOW - 60
+
+
+def test_failed_flush_does_not_keep_rolled_back_host_ids(history):
+    _fail_sample_writes(history.path, True)
+    history.record("h1", True, ts=NOW)
+    with pytest.raises(sqlite3.Error):
+        history.flush()
+
+    # h2 erhält die ID, die h1 im verworfenen Versuch hatte; h1 muss neu angelegt werden
+    _fail_sample_writes(history.path, False)
+    history.record("h2", False, ts=NOW)
+    history.flush()
+
+    assert history.uptime("h1", since=0) == 100.0
+    assert history.uptime("h2", since=0) == 0.0
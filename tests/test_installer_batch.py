@@ -0,0 +1,329 @@
+# tests/test_installer_batch.py
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from installer.batch import (
+    RESULT_FAILED,
+    RESULT_INSTALLED,
+    RESULT_UNCHANGED,
+    BatchReport,
+    RetryPolicy,
+    filter_printers,
+    plan_batch,
+    run_batch,
+    run_shell_command,
+)
+from installer.planner import STEP_DRIVER, STEP_PORT, InstalledPrinter, SystemState
+from models.location import Location
+from models.printer import Printer
+
+posix_only = pytest.mark.skipif(os.name == "nt", reason="Stand-in-Befehle für POSIX")
+
+FAST_RETRY = RetryPolicy(attempts=3, delay=0.01, backoff=2.0)
+
+
+def make_printer(id: int, name: str, dns: str | None = None, inf="C:/drv/a.inf"):
+    return Printer(id, 1, dns or f"host{id}", name, "Modell", "Treiber A", inf)
+
+
+LOCATION = Location(1, "A")
+
+
+def python_command(code: str) -> str:
+    return f'"{sys.executable}" -c "{code}"'
+
+
+@posix_only
+def test_run_shell_command_streams_stdout_and_stderr():
+    lines = []
+    run_shell_command(
+        "sh -c 'echo eins; echo zwei >&2; echo; echo drei'", on_output=lines.append
+    )
+    assert lines == ["eins", "zwei", "drei"]
+
+
+@posix_only
+def test_run_shell_command_does_not_use_a_shell():
+    lines = []
+    run_shell_command("echo a | b", on_output=lines.append)
+    assert lines == ["a | b"]
+
+
+@posix_only
+def test_run_shell_command_raises_on_exit_code_with_output_tail():
+    with pytest.raises(subprocess.CalledProcessError) as info:
+        run_shell_command(
+            "sh -c 'for i in 1 2 3 4 5 6 7; do echo Zeile $i; done; exit 3'"
+        )
+    assert info.value.returncode == 3
+    assert info.value.output.splitlines() == [f"Zeile {i}" for i in range(3, 8)]
+
+
+@posix_only
+def test_run_shell_command_timeout_kills_process_tree():
+    # Der Enkelprozess (sleep) hält die Pipe offen, wenn nur sh beendet würde
+    started = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_shell_command("sh -c 'sleep 5 | cat'", timeout=0.3)
+    assert time.monotonic() - started < 2.0
+
+
+def test_run_shell_command_missing_program_raises_oserror():
+    with pytest.raises(OSError):
+        run_shell_command("dv-gibt-es-nicht --version")
+
+
+def test_retry_policy_backoff():
+    policy = RetryPolicy(attempts=4, delay=1.0, backoff=2.0)
+    assert [policy.delay_for(attempt) for attempt in (1, 2, 3)] == [1.0, 2.0, 4.0]
+    assert policy.is_transient("Der RPC-Server ist nicht verfügbar. (0x800706BA)")
+    assert policy.is_transient("Der Spoolerdienst wird nicht ausgeführt.")
+    assert not policy.is_transient("Zugriff verweigert")
+
+
+class FakeCommands:
+    """run_command für run_batch: Ergebnis pro Befehl aus einer Liste von Fehlern."""
+
+    def __init__(self, errors: dict[str, list[Exception]] | None = None):
+        self.errors = errors or {}
+        self.calls: list[str] = []
+
+    def __call__(self, command, timeout=None, on_output=None):
+        self.calls.append(command)
+        if on_output:
+            on_output(f"Ausgabe: {command}")
+        for marker, errors in self.errors.items():
+            if marker in command and errors:
+                raise errors.pop(0)
+
+
+def rpc_error(command="x"):
+    return subprocess.CalledProcessError(
+        1, command, stderr="Der RPC-Server ist nicht verfügbar."
+    )
+
+
+def test_run_batch_retries_transient_errors_with_callbacks():
+    plan = plan_batch([(make_printer(1, "P1"), LOCATION)], SystemState())
+    commands = FakeCommands({"prnport": [rpc_error(), rpc_error()]})
+    started, output, retries = [], [], []
+
+    report = run_batch(
+        plan,
+        commands,
+        on_start=lambda step: started.append(step.kind),
+        on_output=lambda step, line: output.append(step.kind),
+        on_retry=lambda step, attempt, message: retries.append((step.kind, attempt)),
+        policy=FAST_RETRY,
+    )
+
+    assert report.results == [("[A] P1", RESULT_INSTALLED, "")]
+    assert retries == [(STEP_PORT, 2), (STEP_PORT, 3)]
+    assert sum("prnport" in command for command in commands.calls) == 3
+    assert started[0] == STEP_PORT and STEP_DRIVER in started
+    assert output.count(STEP_PORT) == 3
+
+
+def test_run_batch_gives_up_after_last_attempt():
+    plan = plan_batch([(make_printer(1, "P1"), LOCATION)], SystemState())
+    commands = FakeCommands({"pnputil": [rpc_error()] * 5})
+
+    report = run_batch(plan, commands, policy=FAST_RETRY)
+
+    assert sum("pnputil" in command for command in commands.calls) == 3
+    ((_, result, message),) = report.results
+    assert result == RESULT_FAILED
+    assert "RPC-Server" in message
+
+
+def test_run_batch_does_not_retry_permanent_errors():
+    plan = plan_batch([(make_printer(1, "P1"), LOCATION)], SystemState())
+    error = subprocess.CalledProcessError(1, "x", stderr="Zugriff verweigert")
+    commands = FakeCommands({"prnport": [error]})
+    retries = []
+
+    report = run_batch(
+        plan, commands, on_retry=lambda *args: retries.append(args), policy=FAST_RETRY
+    )
+
+    assert retries == []
+    assert report.results[0][1] == RESULT_FAILED
+
+
+def test_run_batch_retries_timeouts():
+    plan = plan_batch([(make_printer(1, "P1"), LOCATION)], SystemState())
+    commands = FakeCommands({"pnputil": [subprocess.TimeoutExpired("pnputil", 600)]})
+    retries = []
+
+    report = run_batch(
+        plan,
+        commands,
+        on_retry=lambda step, attempt, message: retries.append(message),
+        policy=FAST_RETRY,
+    )
+
+    assert retries == ["Zeitüberschreitung nach 600 s"]
+    assert report.results[0][1] == RESULT_INSTALLED
+
+
+def test_run_batch_stops_waiting_for_retry_when_cancelled():
+    plan = plan_batch([(make_printer(1, "P1"), LOCATION)], SystemState())
+    commands = FakeCommands({"prnport": [rpc_error()]})
+    stop = []
+
+    started = time.monotonic()
+    report = run_batch(
+        plan,
+        commands,
+        should_stop=lambda: bool(stop),
+        on_retry=lambda *args: stop.append(True),
+        policy=RetryPolicy(attempts=3, delay=30.0),
+    )
+
+    assert time.monotonic() - started < 2.0
+    assert report.results[0] == ("[A] P1", RESULT_FAILED, report.results[0][2])
+    assert "abgebrochen" in report.results[0][2]
+
+
+# --- Planung und Fehlerweitergabe der Sammelinstallation ---------------------
+
+
+def test_plan_batch_shares_ports_and_drivers():
+    b = Location(2, "B")
+    printers = [
+        (make_printer(1, "P1", dns="h1"), LOCATION),
+        (make_printer(2, "P1", dns="h1"), b),
+        (make_printer(3, "P2", dns="h2", inf=" C:/drv/./a.inf "), LOCATION),
+    ]
+
+    plan = plan_batch(printers, SystemState())
+
+    assert list(plan.ports) == ["ip_h1", "ip_h2"]
+    assert len(plan.drivers) == 1
+    assert [item.queue_name for item in plan.items] == ["[A] P1", "[B] P1", "[A] P2"]
+    assert plan.items[0].port == plan.items[1].port
+    assert len({item.driver for item in plan.items}) == 1
+    assert plan.step_count == 2 + 1 + 3
+
+
+def test_plan_batch_stages_each_driver_package_once():
+    staged = []
+    printers = [
+        (make_printer(1, "P1", inf="C:/drv/a.inf"), LOCATION),
+        (make_printer(2, "P2", inf="C:/drv/./a.inf"), LOCATION),
+        (make_printer(3, "P3", inf="C:/drv/b.inf"), LOCATION),
+    ]
+
+    plan = plan_batch(
+        printers,
+        SystemState(),
+        stage_driver=lambda path: staged.append(path) or f"D:/cache/{len(staged)}.inf",
+    )
+
+    assert staged == ["C:/drv/a.inf", "C:/drv/b.inf"]
+    assert plan.drivers[plan.items[0].driver].params["inf_path"] == "D:/cache/1.inf"
+    assert plan.items[1].steps[0].params["inf_path"] == "D:/cache/1.inf"
+
+
+def test_plan_batch_skips_existing_parts():
+    state = SystemState(
+        ports=["IP_host1"],
+        drivers=["treiber a"],
+        printers=[InstalledPrinter("[A] P1", "IP_host1", "Treiber A")],
+    )
+    plan = plan_batch(
+        [(make_printer(1, "P1"), LOCATION), (make_printer(2, "P2"), LOCATION)], state
+    )
+
+    assert list(plan.ports) == ["ip_host2"]
+    assert plan.drivers == {}
+    assert [len(item.steps) for item in plan.items] == [0, 1]
+
+    report = run_batch(plan, FakeCommands())
+    assert dict((name, result) for name, result, _ in report.results) == {
+        "[A] P1": RESULT_UNCHANGED,
+        "[A] P2": RESULT_INSTALLED,
+    }
+
+
+def test_failed_port_fails_only_printers_using_it():
+    printers = [
+        (make_printer(1, "P1", dns="h1"), LOCATION),
+        (make_printer(2, "P1", dns="h1"), Location(2, "B")),
+        (make_printer(3, "P2", dns="h2"), LOCATION),
+    ]
+    plan = plan_batch(printers, SystemState())
+    error = subprocess.CalledProcessError(1, "x", stderr="Zugriff verweigert")
+    commands = FakeCommands({"-h h1": [error]})
+    steps = []
+
+    report = run_batch(plan, commands, on_step=lambda: steps.append(1))
+
+    results = dict(
+        (name, (result, message)) for name, result, message in report.results
+    )
+    assert results["[A] P1"] == (
+        RESULT_FAILED,
+        "Port IP_h1 wird angelegt: Zugriff verweigert",
+    )
+    assert results["[B] P1"] == results["[A] P1"]
+    assert results["[A] P2"] == (RESULT_INSTALLED, "")
+    # Übersprungene Schritte zählen für den Fortschritt mit
+    assert len(steps) == plan.step_count
+    assert not any("[A] P1" in command for command in commands.calls)
+
+
+def test_failed_driver_fails_only_printers_using_it():
+    printers = [
+        (make_printer(1, "P1", inf="C:/drv/a.inf"), LOCATION),
+        (make_printer(2, "P2", inf="C:/drv/b.inf"), LOCATION),
+    ]
+    plan = plan_batch(printers, SystemState())
+    error = subprocess.CalledProcessError(1, "x", stderr="Paket beschädigt")
+    commands = FakeCommands({"a.inf": [error]})
+
+    report = run_batch(plan, commands)
+
+    results = dict((name, result) for name, result, _ in report.results)
+    assert results == {"[A] P1": RESULT_FAILED, "[A] P2": RESULT_INSTALLED}
+
+
+def test_failed_queue_step_stops_remaining_steps_of_that_printer():
+    state = SystemState(
+        ports=["IP_host1"],
+        drivers=["Treiber A"],
+        printers=[InstalledPrinter("[A] P1", "IP_host1", "Treiber Alt")],
+    )
+    plan = plan_batch([(make_printer(1, "P1"), LOCATION)], state)
+    error = subprocess.CalledProcessError(1, "x", stderr="Warteschlange gesperrt")
+    commands = FakeCommands({"/dl": [error]})
+
+    report = run_batch(plan, commands)
+
+    assert report.results == [
+        (
+            "[A] P1",
+            RESULT_FAILED,
+            "Veraltete Warteschlange '[A] P1' wird entfernt: Warteschlange gesperrt",
+        )
+    ]
+    assert not any("/if" in command for command in commands.calls)
+
+
+def test_filter_printers_reports_rejected_printers():
+    report = BatchReport()
+    printers = [(make_printer(1, "P1"), LOCATION), (make_printer(2, "P2"), LOCATION)]
+
+    accepted = filter_printers(
+        printers,
+        lambda printer: "nicht erreichbar" if printer.name == "P2" else None,
+        report,
+    )
+
+    assert accepted == printers[:1]
+    assert report.results == [("[A] P2", RESULT_FAILED, "nicht erreichbar")]
@@ -0,0 +1,272 @@
+# tests/test_installer_script.py
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from installer.batch import RESULT_FAILED, RESULT_INSTALLED, RetryPolicy, plan_batch
+from installer.planner import STEP_PORT, STEP_PRINTER, InstalledPrinter, SystemState
+from installer.script import parse_status_line, render_script, run_script
+from models.location import Location
+from models.printer import Printer
+
+posix_only = pytest.mark.skipif(os.name == "nt", reason="Stand-in-Befehle für POSIX")
+
+FAKE_POWERSHELL = (
+    sys.executable,
+    os.path.join(os.path.dirname(__file__), "fake_powershell.py"),
+)
+FAST_RETRY = RetryPolicy(attempts=3, delay=0.01, backoff=2.0)
+LOCATION = Location(1, "A")
+
+
+def make_printer(id: int, name: str, driver="Treiber A", inf="C:/drv/a.inf"):
+    return Printer(id, 1, f"host{id}", name, "Modell", driver, inf)
+
+
+def make_plan(*names: str):
+    return plan_batch(
+        [(make_printer(id, name), LOCATION) for id, name in enumerate(names, 1)],
+        SystemState(),
+    )
+
+
+@pytest.fixture
+def flaky_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_PS_STATE", str(tmp_path / "flaky"))
+    return monkeypatch
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def kwargs(self):
+        return {
+            "on_start": lambda step: self.events.append(("start", step.kind)),
+            "on_output": lambda step, line: self.events.append(("out", line)),
+            "on_retry": lambda step, attempt, message: self.events.append(
+                ("retry", step.kind, attempt, message)
+            ),
+        }
+
+    def of(self, kind: str):
+        return [event for event in self.events if event[0] == kind]
+
+
+def test_run_script_streams_output_and_merged_stderr():
+    recorder = Recorder()
+    report = run_script(make_plan("P1"), command=FAKE_POWERSHELL, **recorder.kwargs())
+
+    assert report.results == [("[A] P1", RESULT_INSTALLED, "")]
+    assert recorder.of("start") == [
+        ("start", STEP_PORT),
+        ("start", "driver"),
+        ("start", STEP_PRINTER),
+    ]
+    assert ("out", "Ausgabe von Schritt 0") in recorder.events
+    assert ("out", "stderr von Schritt 0") in recorder.events
+
+
+def test_run_script_retries_transient_step_without_repeating_finished_ones(
+    flaky_state,
+):
+    recorder = Recorder()
+    report = run_script(
+        make_plan("FLAKY"),
+        command=FAKE_POWERSHELL,
+        policy=FAST_RETRY,
+        **recorder.kwargs(),
+    )
+
+    assert report.results == [("[A] FLAKY", RESULT_INSTALLED, "")]
+    assert recorder.of("retry") == [
+        ("retry", STEP_PRINTER, 2, "Der RPC-Server ist nicht verfügbar.")
+    ]
+    # Port und Treiber laufen nur im ersten Skript
+    assert recorder.of("start").count(("start", STEP_PORT)) == 1
+    assert recorder.of("start").count(("start", STEP_PRINTER)) == 2
+
+
+def test_run_script_fails_step_after_last_attempt(flaky_state):
+    flaky_state.setenv("FAKE_PS_FLAKY", "10")
+    recorder = Recorder()
+    report = run_script(
+        make_plan("FLAKY", "P2"),
+        command=FAKE_POWERSHELL,
+        policy=FAST_RETRY,
+        **recorder.kwargs(),
+    )
+
+    results = dict(
+        (name, (result, message)) for name, result, message in report.results
+    )
+    assert results["[A] P2"] == (RESULT_INSTALLED, "")
+    assert results["[A] FLAKY"][0] == RESULT_FAILED
+    assert "RPC-Server" in results["[A] FLAKY"][1]
+    assert [event[2] for event in recorder.of("retry")] == [2, 3]
+
+
+@posix_only
+def test_run_script_timeout_kills_hanging_child_and_continues():
+    recorder = Recorder()
+    started = time.monotonic()
+    report = run_script(
+        make_plan("HANG", "P2"),
+        command=FAKE_POWERSHELL,
+        timeouts={STEP_PRINTER: 0.5},
+        policy=RetryPolicy(attempts=1),
+        **recorder.kwargs(),
+    )
+
+    assert time.monotonic() - started < 5.0
+    results = dict(
+        (name, (result, message)) for name, result, message in report.results
+    )
+    assert results["[A] HANG"] == (
+        RESULT_FAILED,
+        "Warteschlange '[A] HANG' wird eingerichtet: Zeitüberschreitung nach 0.5 s",
+    )
+    assert results["[A] P2"] == (RESULT_INSTALLED, "")
+
+
+@posix_only
+def test_run_script_timeout_is_retried():
+    recorder = Recorder()
+    report = run_script(
+        make_plan("HANG"),
+        command=FAKE_POWERSHELL,
+        timeouts={STEP_PRINTER: 0.3},
+        policy=RetryPolicy(attempts=2, delay=0.01),
+        **recorder.kwargs(),
+    )
+
+    assert recorder.of("retry") == [
+        ("retry", STEP_PRINTER, 2, "Zeitüberschreitung nach 0.3 s")
+    ]
+    assert report.results[0][1] == RESULT_FAILED
+
+
+@posix_only
+def test_run_script_cancel_stops_hanging_step():
+    stop = threading.Event()
+    threading.Timer(0.5, stop.set).start()
+    started = time.monotonic()
+
+    report = run_script(
+        make_plan("HANG"), command=FAKE_POWERSHELL, should_stop=stop.is_set
+    )
+
+    assert time.monotonic() - started < 3.0
+    assert report.results == [
+        (
+            "[A] HANG",
+            RESULT_FAILED,
+            "Warteschlange '[A] HANG' wird eingerichtet: abgebrochen",
+        )
+    ]
+
+
+def test_run_script_reports_missing_interpreter():
+    report = run_script(make_plan("P1"), command=("dv-gibt-es-nicht",))
+    ((_, result, message),) = report.results
+    assert result == RESULT_FAILED
+    assert "dv-gibt-es-nicht" in message
+
+
+@posix_only
+def test_run_script_reports_exit_code_without_status():
+    report = run_script(make_plan("P1"), command=("sh", "-c", "exit 4"))
+    ((_, result, message),) = report.results
+    assert result == RESULT_FAILED
+    assert message.endswith("Das Installationsskript endete mit Exit-Code 4.")
+
+
+# --- Erzeugtes Skript (Vergleich mit Golden Files) ---------------------------
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+
+
+def assert_matches_golden(name: str, script: str):
+    """
+    Vergleicht ein erzeugtes Skript mit tests/golden/<name>. Mit
+    DV_UPDATE_GOLDEN=1 werden die Dateien stattdessen neu geschrieben.
+    """
+    path = os.path.join(GOLDEN_DIR, name)
+    if os.environ.get("DV_UPDATE_GOLDEN"):
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(script)
+
+    with open(path, encoding="utf-8", newline="") as f:
+        assert script == f.read()
+
+
+SHARE_INF = "\\\\srv\\Treiber\\O'Brien\\drv.inf"
+
+
+def batch_plan():
+    # Zwei Standorte teilen sich Port und Treiber, eine Warteschlange mit
+    # falschem Treiber wird ersetzt, ein Treiber und ein Port sind vorhanden
+    a, b = Location(1, "A"), Location(2, "B")
+    printers = [
+        (Printer(1, 1, "h1", "P1", "M", "Treiber A", SHARE_INF), a),
+        (Printer(2, 2, "h1", "P1", "M", "Treiber A", SHARE_INF), b),
+        (Printer(3, 1, "h2", "P2", "M", "Treiber A", SHARE_INF), a),
+        (Printer(4, 1, "h3", "P3", "M", "Treiber B", "C:/drv/b.inf"), a),
+    ]
+    state = SystemState(
+        ports=["IP_h2"],
+        drivers=["Treiber B"],
+        printers=[InstalledPrinter("[A] P2", "IP_h2", "Treiber Alt")],
+    )
+    return plan_batch(printers, state)
+
+
+def test_render_single_printer_matches_golden():
+    plan = plan_batch([(make_printer(1, "P1", inf=SHARE_INF), LOCATION)], SystemState())
+    assert_matches_golden("single_printer.ps1", render_script(plan))
+
+
+def test_render_batch_matches_golden():
+    plan = batch_plan()
+    assert plan.step_count == 8
+    assert_matches_golden("batch.ps1", render_script(plan))
+
+
+def test_render_rerun_matches_golden():
+    # Wiederholung: Ports fertig, Treiber fehlgeschlagen, letzter Versuch für Schritt 5
+    done = {0: True, 1: True, 2: False}
+    retryable = {3, 4, 6, 7}
+    assert_matches_golden("rerun.ps1", render_script(batch_plan(), done, retryable))
+
+
+def test_render_script_is_deterministic():
+    assert render_script(batch_plan()) == render_script(batch_plan())
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("##STEP 3 START\n", (3, "START", "")),
+        (
+            "##STEP 12 OUT Treiberpaket hinzugefügt.\r\n",
+            (12, "OUT", "Treiberpaket hinzugefügt."),
+        ),
+        ("##STEP 0 FAIL Zugriff verweigert", (0, "FAIL", "Zugriff verweigert")),
+        (
+            "##STEP 1 RETRY Der RPC-Server ist nicht verfügbar.",
+            (1, "RETRY", "Der RPC-Server ist nicht verfügbar."),
+        ),
+        ("##STEP 4 SKIP", (4, "SKIP", "")),
+        ("##STEP 4 DONE", None),
+        ("##STEP x OK", None),
+        ("Treiberpaket hinzugefügt.", None),
+        ("  ##STEP 1 OK", None),
+    ],
+)
+def test_parse_status_line(line, expected):
+    assert parse_status_line(line) == expected
@@ -0,0 +1,56 @@
+# tests/test_migrations.py
+
+import sqlite3
+
+import pytest
+
+from crud.migrations import LATEST_VERSION, MigrationError, migrate_db
+
+
+def create_v1_database(path: str, printers: list[tuple[str, str]]):
+    conn = sqlite3.connect(path)
+    with open("structure.sql", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.execute("INSERT INTO locations (name) VALUES ('A')")
+    conn.executemany(
+        "INSERT INTO printers (dns, name, model, driver_name, driver_inf_path, "
+        "location_id) VALUES (?, ?, 'M', 'D', 'x.inf', 1)",
+        printers,
+    )
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+
+def schema_version(path: str) -> int:
+    conn = sqlite3.connect(path)
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    conn.close()
+    return version
+
+
+def test_migrate_db_brings_schema_to_latest_version(empty_db_path):
+    create_v1_database(empty_db_path, [("h1", "P1"), ("h2", "P2")])
+
+    assert migrate_db() == LATEST_VERSION
+    assert schema_version(empty_db_path) == LATEST_VERSION
+
+
+def test_duplicate_dns_is_reported_before_creating_unique_index(empty_db_path):
+    create_v1_database(
+        empty_db_path, [("h1", "P1"), ("h1", "P1 alt"), ("h2", "P2"), ("h3", "P3")]
+    )
+
+    with pytest.raises(MigrationError) as info:
+        migrate_db()
+
+    assert "h1 (P1, P1 alt)" in str(info.value)
+    assert "h2" not in str(info.value)
+    # Nichts angewendet, die Datenbank bleibt auf Version 1 und benutzbar
+    assert schema_version(empty_db_path) == 1
+    conn = sqlite3.connect(empty_db_path, timeout=0.5)
+    conn.execute("DELETE FROM printers WHERE name = 'P1 alt'")
+    conn.commit()
+    conn.close()
+
+    assert migrate_db() == LATEST_VERSION
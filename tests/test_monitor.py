@@ -0,0 +1,157 @@
+# tests/test_monitor.py
+
+import asyncio
+
+import pytest
+
+import network.monitor as monitor_module
+from network.monitor import Monitor
+from network.probes import Probe
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class GateProbe(Probe):
+    """Prüfung, deren Ergebnis der Test pro Host vorgibt."""
+
+    def __init__(self):
+        super().__init__(timeout=5.0)
+        self.checked: list[str] = []
+        self._answers: dict[str, asyncio.Future] = {}
+
+    def answer(self, host: str) -> asyncio.Future:
+        if host not in self._answers:
+            self._answers[host] = asyncio.get_running_loop().create_future()
+        return self._answers[host]
+
+    async def check_address(self, address: str) -> bool:
+        raise AssertionError("nicht verwendet")
+
+    async def check_async(self, host: str) -> bool:
+        self.checked.append(host)
+        return await self.answer(host)
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(monitor_module, "JITTER", 0.0)
+
+
+def make_monitor(clock=None, **kwargs) -> Monitor:
+    kwargs.setdefault("min_interval", 10.0)
+    kwargs.setdefault("base_interval", 60.0)
+    kwargs.setdefault("max_interval", 200.0)
+    kwargs.setdefault("backoff", 2.0)
+    return Monitor(probe=GateProbe(), clock=clock or FakeClock(), **kwargs)
+
+
+def test_interval_backs_off_while_state_is_stable():
+    clock = FakeClock()
+    monitor = make_monitor(clock)
+    monitor.add_printer(1, "h1", "P1")
+    host = monitor.hosts[1]
+
+    monitor._apply_result(host, "h1", True)
+    assert host.interval == 120.0
+    assert host.next_due == clock.now + 120.0
+
+    monitor._apply_result(host, "h1", True)
+    monitor._apply_result(host, "h1", True)
+    # Nie über max_interval
+    assert host.interval == 200.0
+    assert (host.available, host.changes) == (True, 0)
+
+
+def test_interval_tightens_on_state_changes():
+    clock = FakeClock()
+    monitor = make_monitor(clock)
+    monitor.add_printer(1, "h1", "P1")
+    host = monitor.hosts[1]
+    for _ in range(3):
+        monitor._apply_result(host, "h1", True)
+
+    monitor._apply_result(host, "h1", False)
+    assert host.interval == 10.0
+    assert host.next_due == clock.now + 10.0
+
+    monitor._apply_result(host, "h1", True)
+    assert (host.interval, host.changes) == (10.0, 2)
+
+    # Wieder stabil: der Abstand wächst erneut
+    monitor._apply_result(host, "h1", True)
+    assert host.interval == 20.0
+
+
+def test_due_hosts_come_out_in_order_without_stale_entries():
+    clock = FakeClock()
+    monitor = make_monitor(clock)
+    for printer_id in (1, 2, 3):
+        monitor.add_printer(printer_id, f"h{printer_id}", f"P{printer_id}")
+    monitor.remove_printer(2)
+    clock.now += 10.0
+
+    due = [monitor._pop_due(clock.now) for _ in range(3)]
+
+    assert sorted(host.printer_id for host in due if host) == [1, 3]
+    assert due[-1] is None
+
+
+def test_dns_change_resets_interval_and_schedules_check():
+    clock = FakeClock()
+    monitor = make_monitor(clock)
+    monitor.add_printer(1, "alt", "P1")
+    host = monitor.hosts[1]
+    monitor._apply_result(host, "alt", True)
+
+    monitor.add_printer(1, "neu", "P1")
+
+    assert (host.dns, host.available, host.interval) == ("neu", None, 60.0)
+    assert monitor._pop_due(clock.now) is host
+
+
+def test_result_for_old_dns_is_dropped_and_new_host_checked():
+    results = []
+
+    async def main():
+        monitor = make_monitor(
+            asyncio.get_running_loop().time,
+            min_interval=0.01,
+            on_result=lambda host: results.append((host.dns, host.available)),
+        )
+        probe = monitor.probe
+        stop = asyncio.Event()
+        runner = asyncio.create_task(monitor.run(stop))
+
+        async def until(condition):
+            for _ in range(200):
+                if condition():
+                    return
+                await asyncio.sleep(0.01)
+            raise AssertionError("Bedingung nicht erreicht")
+
+        monitor.add_printer(1, "alt", "P1")
+        await until(lambda: probe.checked == ["alt"])
+
+        # Umbenennung während die Prüfung des alten Namens läuft
+        monitor.add_printer(1, "neu", "P1")
+        probe.answer("alt").set_result(True)
+        await until(lambda: probe.checked == ["alt", "neu"])
+        assert results == []
+
+        probe.answer("neu").set_result(False)
+        await until(lambda: results)
+
+        stop.set()
+        await runner
+        return monitor.hosts[1]
+
+    host = asyncio.run(asyncio.wait_for(main(), 10))
+
+    assert results == [("neu", False)]
+    assert (host.dns, host.available) == ("neu", False)
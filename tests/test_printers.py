@@ -0,0 +1,53 @@
+# tests/test_printers.py
+
+import pytest
+
+from crud.locations import create_location
+from crud.printers import (
+    PrinterConflictError,
+    create_printer,
+    get_printer_by_id,
+    search_printers,
+    update_printer,
+)
+
+
+def printer_data(location_id: int, dns: str, name: str) -> dict:
+    return {
+        "location_id": location_id,
+        "dns": dns,
+        "name": name,
+        "model": "Modell",
+        "driver_name": "Treiber",
+        "driver_inf_path": "C:/drv/a.inf",
+    }
+
+
+def test_create_printer_with_duplicate_dns_raises(db_path):
+    location = create_location("A")
+    create_printer(printer_data(location["id"], "h1", "P1"))
+
+    with pytest.raises(PrinterConflictError, match="'h1'"):
+        create_printer(printer_data(location["id"], "h1", "P2"))
+
+
+def test_update_printer_with_duplicate_dns_raises_and_keeps_row(db_path):
+    location = create_location("A")
+    create_printer(printer_data(location["id"], "h1", "P1"))
+    second = create_printer(printer_data(location["id"], "h2", "P2"))
+
+    with pytest.raises(PrinterConflictError, match="'h1'"):
+        update_printer(second["id"], {"dns": "h1", "name": "P2 neu"})
+
+    assert get_printer_by_id(second["id"])["dns"] == "h2"
+
+
+def test_search_printers_returns_at_most_limit_matches(db_path):
+    location = create_location("Lager")
+    for number in range(5):
+        create_printer(printer_data(location["id"], f"prn-{number}.lan", f"P{number}"))
+
+    assert len(search_printers("prn", limit=3)) == 3
+    assert len(search_printers("prn")) == 5
+    assert [row["name"] for row in search_printers("prn-4")] == ["P4"]
+    assert len(search_printers("lager", limit=10)) == 5
@@ -0,0 +1,111 @@
+# tests/test_probes.py
+
+import asyncio
+import socket
+import time
+
+import pytest
+
+from network.probes import CompositeProbe, Probe, TcpProbe, first_success
+from network.resolver import ResolverCache
+
+
+@pytest.fixture
+def listening_port():
+    """Port auf 127.0.0.1, der Verbindungen annimmt."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(16)
+        yield server.getsockname()[1]
+
+
+@pytest.fixture
+def closed_port():
+    """Port auf 127.0.0.1, auf dem niemand lauscht."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return port
+
+
+class FixedProbe(Probe):
+    def __init__(self, result: bool, resolver: ResolverCache | None = None):
+        super().__init__(0.5, resolver)
+        self.result = result
+
+    async def check_address(self, address: str) -> bool:
+        return self.result
+
+
+def test_probe_is_abstract():
+    with pytest.raises(TypeError):
+        Probe(1.0)
+
+    class Incomplete(Probe):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(1.0)
+
+
+def test_composite_probe_succeeds_if_any_probe_succeeds():
+    probe = CompositeProbe(FixedProbe(False), FixedProbe(True))
+    assert asyncio.run(probe.check_address("127.0.0.1"))
+    assert not asyncio.run(CompositeProbe(FixedProbe(False)).check_address("127.0.0.1"))
+
+
+def test_tcp_probe_open_port(listening_port):
+    probe = TcpProbe(ports=(listening_port,), timeout=1.0)
+
+    assert asyncio.run(probe.check_address("127.0.0.1"))
+
+
+def test_tcp_probe_closed_port_fails_quickly(closed_port):
+    probe = TcpProbe(ports=(closed_port,), timeout=5.0)
+
+    started = time.monotonic()
+    assert not asyncio.run(probe.check_address("127.0.0.1"))
+    # Abgewiesene Verbindungen warten nicht auf den Timeout
+    assert time.monotonic() - started < 1.0
+
+
+def test_tcp_probe_succeeds_if_any_port_is_open(listening_port, closed_port):
+    probe = TcpProbe(ports=(closed_port, listening_port), timeout=1.0)
+
+    assert asyncio.run(probe.check_address("127.0.0.1"))
+
+
+def test_open_ports_returns_exactly_the_listening_port(listening_port, closed_port):
+    probe = TcpProbe(ports=(closed_port, listening_port), timeout=1.0)
+
+    assert asyncio.run(probe.open_ports("127.0.0.1")) == (listening_port,)
+
+
+def test_check_resolves_names_through_the_cache(listening_port):
+    resolver = ResolverCache(resolver=lambda host: {"drucker1": "127.0.0.1"}.get(host))
+    probe = TcpProbe(ports=(listening_port,), timeout=1.0, resolver=resolver)
+
+    assert probe.check("drucker1")
+    # Nicht auflösbare Namen gelten ohne Verbindungsversuch als nicht erreichbar
+    assert not probe.check("unbekannt")
+
+
+def test_first_success_gives_up_after_timeout():
+    cancelled = []
+
+    async def never():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return True
+
+    async def fails():
+        return False
+
+    started = time.monotonic()
+    assert not asyncio.run(first_success([fails(), never(), never()], 0.2))
+    assert time.monotonic() - started < 1.0
+    # Die hängenden Prüfungen werden abgebrochen
+    assert cancelled == [True, True]
@@ -0,0 +1,183 @@
+# tests/test_replica.py
+
+import os
+import sqlite3
+
+import pytest
+
+import crud.database as database
+from crud.database import DatabaseOfflineError, get_read_cursor, is_read_only
+from crud.locations import create_location
+from crud.replica import Replica
+from crud.rows import record_factory
+
+
+def write_primary(path: str, *names: str):
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS t (name TEXT)")
+        conn.executemany("INSERT INTO t (name) VALUES (?)", [(n,) for n in names])
+    conn.close()
+
+
+def read_names(replica: Replica) -> list[str]:
+    conn = replica.pool.acquire()
+    return [row[0] for row in conn.execute("SELECT name FROM t ORDER BY rowid")]
+
+
+@pytest.fixture
+def primary(tmp_path) -> str:
+    path = str(tmp_path / "share" / "dv.db")
+    os.makedirs(os.path.dirname(path))
+    write_primary(path, "a")
+    return path
+
+
+def make_replica(primary: str, tmp_path, check_interval: float = 0.0) -> Replica:
+    return Replica(
+        primary, str(tmp_path / "local" / "replica.db"), check_interval=check_interval
+    )
+
+
+def count_copies(replica: Replica, monkeypatch) -> list:
+    copies = []
+    copy = replica._copy_from_primary
+
+    def counting_copy():
+        copies.append(True)
+        copy()
+
+    monkeypatch.setattr(replica, "_copy_from_primary", counting_copy)
+    return copies
+
+
+def test_copy_is_refreshed_only_when_fingerprint_changes(
+    primary, tmp_path, monkeypatch
+):
+    replica = make_replica(primary, tmp_path)
+    copies = count_copies(replica, monkeypatch)
+
+    replica.ensure_fresh()
+    replica.ensure_fresh()
+    assert read_names(replica) == ["a"]
+    assert len(copies) == 1
+
+    write_primary(primary, "b")
+    replica.ensure_fresh()
+    assert read_names(replica) == ["a", "b"]
+    assert len(copies) == 2
+    replica.close()
+
+
+def test_unchanged_primary_is_not_copied_again_after_restart(
+    primary, tmp_path, monkeypatch
+):
+    first = make_replica(primary, tmp_path)
+    first.ensure_fresh()
+    first.close()
+
+    second = make_replica(primary, tmp_path)
+    copies = count_copies(second, monkeypatch)
+    second.ensure_fresh()
+
+    assert copies == []
+    assert read_names(second) == ["a"]
+    second.close()
+
+
+def test_check_interval_defers_refresh_until_marked_stale(primary, tmp_path):
+    replica = make_replica(primary, tmp_path, check_interval=3600)
+    replica.ensure_fresh()
+
+    write_primary(primary, "b")
+    replica.ensure_fresh()
+    assert read_names(replica) == ["a"]
+
+    replica.mark_stale()
+    replica.ensure_fresh()
+    assert read_names(replica) == ["a", "b"]
+    replica.close()
+
+
+def test_missing_primary_keeps_last_copy_and_sets_offline(primary, tmp_path):
+    replica = make_replica(primary, tmp_path)
+    replica.ensure_fresh()
+
+    os.rename(primary, primary + ".weg")
+    replica.ensure_fresh()
+    assert replica.offline
+    assert read_names(replica) == ["a"]
+
+    os.rename(primary + ".weg", primary)
+    replica.ensure_fresh()
+    assert not replica.offline
+    replica.close()
+
+
+def test_missing_primary_without_copy_is_not_available(tmp_path):
+    replica = make_replica(str(tmp_path / "share" / "dv.db"), tmp_path)
+
+    replica.ensure_fresh()
+
+    assert replica.offline
+    assert not replica.available
+    replica.close()
+
+
+# --- Zusammenspiel mit crud.database -------------------------------------
+
+
+@pytest.fixture
+def replicated_db(db_path, tmp_path, monkeypatch):
+    """Migrierte Primärdatenbank mit lokaler Kopie für Lesezugriffe."""
+    replica = Replica(
+        db_path,
+        str(tmp_path / "local" / "replica.db"),
+        row_factory=record_factory,
+        check_interval=3600,
+    )
+    monkeypatch.setattr(database, "_replica", replica)
+    yield replica
+    replica.close()
+
+
+def location_names() -> list[str]:
+    with get_read_cursor() as cursor:
+        return [row["name"] for row in cursor.execute("SELECT name FROM locations")]
+
+
+def test_own_writes_are_visible_in_the_next_read(replicated_db):
+    assert location_names() == []
+
+    # Trotz langem Prüfintervall: der Schreibzugriff markiert die Kopie als veraltet
+    create_location("Lager")
+
+    assert location_names() == ["Lager"]
+
+
+def test_offline_reads_use_last_copy_and_writes_are_refused(replicated_db, db_path):
+    create_location("Lager")
+    assert location_names() == ["Lager"]
+
+    os.rename(db_path, db_path + ".weg")
+    replicated_db.mark_stale()
+
+    assert location_names() == ["Lager"]
+    assert is_read_only()
+    with pytest.raises(DatabaseOfflineError):
+        create_location("Büro")
+
+
+def test_first_start_offline_raises_offline_error(tmp_path, monkeypatch):
+    replica = Replica(
+        str(tmp_path / "share" / "dv.db"),
+        str(tmp_path / "local" / "replica.db"),
+        row_factory=record_factory,
+    )
+    monkeypatch.setattr(database, "_replica", replica)
+
+    with pytest.raises(DatabaseOfflineError, match="keine lokale Kopie"):
+        location_names()
+    assert is_read_only()
+    # Es wurde keine leere Kopie angelegt
+    assert not replica.available
+    replica.close()
@@ -0,0 +1,201 @@
+# tests/test_resolver.py
+
+import asyncio
+import threading
+import time
+
+from network.resolver import ResolverCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeResolver:
+    """Feste Namenstabelle, zählt die Auflösungen pro Name."""
+
+    def __init__(self, addresses: dict):
+        self.addresses = addresses
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, host: str) -> str | None:
+        with self._lock:
+            self.calls[host] = self.calls.get(host, 0) + 1
+        return self.addresses.get(host)
+
+
+def _cache(addresses: dict) -> tuple[ResolverCache, FakeResolver, FakeClock]:
+    resolver, clock = FakeResolver(addresses), FakeClock()
+    return (
+        ResolverCache(resolver, ttl=60, negative_ttl=10, clock=clock),
+        resolver,
+        clock,
+    )
+
+
+def test_positive_entries_expire_after_ttl():
+    cache, resolver, clock = _cache({"drucker1": "10.0.0.1"})
+
+    assert cache.resolve("drucker1") == "10.0.0.1"
+    clock.now += 59
+    assert cache.resolve("drucker1") == "10.0.0.1"
+    assert resolver.calls == {"drucker1": 1}
+
+    # Nach Ablauf wird neu aufgelöst und die neue Adresse übernommen
+    resolver.addresses["drucker1"] = "10.0.0.2"
+    clock.now += 1
+    assert cache.resolve("drucker1") == "10.0.0.2"
+    assert resolver.calls == {"drucker1": 2}
+
+
+def test_negative_entries_use_their_own_ttl():
+    cache, resolver, clock = _cache({})
+
+    assert cache.resolve("weg") is None
+    clock.now += 9
+    assert cache.resolve("weg") is None
+    assert resolver.calls == {"weg": 1}
+
+    resolver.addresses["weg"] = "10.0.0.9"
+    clock.now += 1
+    assert cache.resolve("weg") == "10.0.0.9"
+    assert resolver.calls == {"weg": 2}
+
+
+def test_resolver_errors_are_cached_as_unknown():
+    def failing(host):
+        raise OSError("DNS-Server nicht erreichbar")
+
+    cache = ResolverCache(failing, clock=FakeClock())
+
+    assert cache.resolve("drucker1") is None
+    assert cache.stats.misses == 1
+    assert cache.resolve("drucker1") is None
+    assert cache.stats.negative_hits == 1
+
+
+def test_ip_addresses_are_not_resolved_or_counted():
+    cache, resolver, _ = _cache({})
+
+    assert cache.resolve("192.168.1.20") == "192.168.1.20"
+    assert asyncio.run(cache.resolve_async("192.168.1.20")) == "192.168.1.20"
+    assert resolver.calls == {}
+    assert cache.stats.lookups == 0
+
+
+def test_invalidate_forces_a_new_lookup():
+    cache, resolver, _ = _cache({"a": "10.0.0.1", "b": "10.0.0.2"})
+    cache.resolve_many(["a", "b"])
+
+    cache.invalidate("a")
+    cache.resolve_many(["a", "b"])
+    assert resolver.calls == {"a": 2, "b": 1}
+
+    cache.invalidate()
+    cache.resolve_many(["a", "b"])
+    assert resolver.calls == {"a": 3, "b": 2}
+
+
+def test_concurrent_requests_share_one_lookup():
+    release = threading.Event()
+    calls = []
+
+    def slow_resolver(host):
+        calls.append(host)
+        release.wait(5)
+        return "10.0.0.1"
+
+    cache = ResolverCache(slow_resolver, clock=FakeClock())
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.resolve("drucker1")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Warten, bis alle Threads auf die laufende Auflösung warten
+    deadline = time.monotonic() + 5
+    while cache.stats.misses < len(threads) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ["drucker1"]
+    assert results == ["10.0.0.1"] * len(threads)
+
+
+def test_concurrent_async_requests_share_one_lookup():
+    release = threading.Event()
+    calls = []
+
+    def slow_resolver(host):
+        calls.append(host)
+        release.wait(5)
+        return "10.0.0.1"
+
+    cache = ResolverCache(slow_resolver, clock=FakeClock())
+
+    async def main():
+        tasks = [asyncio.create_task(cache.resolve_async("drucker1")) for _ in range(4)]
+        while cache.stats.misses < len(tasks):
+            await asyncio.sleep(0.01)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(asyncio.wait_for(main(), 5)) == ["10.0.0.1"] * 4
+    assert calls == ["drucker1"]
+
+
+def test_resolve_many_deduplicates_and_keeps_order():
+    cache, resolver, _ = _cache({"a": "10.0.0.1", "b": "10.0.0.2"})
+
+    result = cache.resolve_many(["b", "a", "b", "unbekannt", "10.0.0.3"])
+
+    assert list(result.items()) == [
+        ("b", "10.0.0.2"),
+        ("a", "10.0.0.1"),
+        ("unbekannt", None),
+        ("10.0.0.3", "10.0.0.3"),
+    ]
+    assert resolver.calls == {"a": 1, "b": 1, "unbekannt": 1}
+
+
+def test_resolve_many_async_uses_the_cache():
+    cache, resolver, _ = _cache({"a": "10.0.0.1", "b": "10.0.0.2"})
+    cache.resolve("a")
+
+    result = asyncio.run(cache.resolve_many_async(["a", "b", "a", "c"]))
+
+    assert result == {"a": "10.0.0.1", "b": "10.0.0.2", "c": None}
+    assert resolver.calls == {"a": 1, "b": 1, "c": 1}
+
+
+def test_stats_count_hits_misses_and_hit_rate():
+    cache, _, clock = _cache({"a": "10.0.0.1"})
+    assert cache.stats.hit_rate == 0.0
+
+    cache.resolve("a")  # Fehlschlag
+    cache.resolve("a")  # Treffer
+    cache.resolve("a")  # Treffer
+    cache.resolve("x")  # Fehlschlag, negativ gespeichert
+    cache.resolve("x")  # negativer Treffer
+    clock.now += 60
+    cache.resolve("a")  # abgelaufen: Fehlschlag
+
+    assert cache.stats.to_dict() == {
+        "hits": 2,
+        "negative_hits": 1,
+        "misses": 3,
+        "hit_rate": 0.5,
+    }
+    assert cache.stats.lookups == 6
+    assert repr(cache.stats) == (
+        "ResolverStats(hits=2, negative_hits=1, misses=3, hit_rate=50.0%)"
+    )
@@ -0,0 +1,419 @@
+# tests/test_snmp.py
+
+import asyncio
+
+import pytest
+
+from network.snmp import (
+    _GET_BULK_REQUEST,
+    _GET_REQUEST,
+    _RESPONSE,
+    END_OF_MIB_VIEW,
+    NO_SUCH_OBJECT,
+    OID_DEVICE_STATUS,
+    OID_ERROR_STATE,
+    OID_PRINTER_STATUS,
+    OID_SUPPLY_DESCRIPTION,
+    OID_SUPPLY_LEVEL,
+    OID_SUPPLY_MAX_CAPACITY,
+    OID_SYS_DESCR,
+    SUPPLY_UNKNOWN,
+    SnmpClient,
+    SnmpError,
+    Supply,
+    _decode_tlv,
+    _decode_value,
+    decode_message,
+    encode_integer,
+    encode_octet_string,
+    encode_oid,
+    encode_request,
+    encode_sequence,
+    query_printer_status,
+)
+
+
+class FakeClient:
+    """Liefert feste Werte statt einer SNMP-Abfrage."""
+
+    def __init__(self, scalars: dict, columns: dict):
+        self.scalars = scalars
+        self.columns = columns
+
+    async def get(self, host, oids):
+        return {oid: self.scalars.get(oid) for oid in oids}
+
+    async def walk_columns(self, host, columns):
+        return {column: self.columns.get(column, {}) for column in columns}
+
+
+def test_empty_supply_keeps_level_zero():
+    client = FakeClient(
+        {OID_SYS_DESCR: b"Drucker", OID_DEVICE_STATUS: 2},
+        {
+            OID_SUPPLY_DESCRIPTION: {"1": b"Toner Schwarz", "2": b"Trommel"},
+            OID_SUPPLY_MAX_CAPACITY: {"1": 100, "2": 0},
+            OID_SUPPLY_LEVEL: {"1": 0},
+        },
+    )
+
+    status = asyncio.run(query_printer_status(client, "h1"))
+
+    toner, drum = status.supplies
+    assert (toner.level, toner.max_capacity, toner.percent) == (0, 100, 0)
+    assert str(toner) == "Toner Schwarz 0 %"
+    assert drum.level == SUPPLY_UNKNOWN
+    assert drum.percent is None
+
+
+def test_supply_percent_and_special_values():
+    assert Supply("Toner", 25, 50).percent == 50
+    assert str(Supply("Toner", -3, 100)) == "Toner vorhanden"
+    assert str(Supply("Toner", SUPPLY_UNKNOWN, 100)) == "Toner ?"
+
+
+# --- BER -------------------------------------------------------------------
+
+
+def _decode(data: bytes):
+    tag, start, end = _decode_tlv(data, 0)
+    assert end == len(data)
+    return _decode_value(tag, data[start:end])
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        0,
+        1,
+        127,
+        128,
+        255,
+        256,
+        -1,
+        -128,
+        -129,
+        -256,
+        -32768,
+        -32769,
+        2**31 - 1,
+        -(2**31),
+    ],
+)
+def test_integer_round_trip(value):
+    assert _decode(encode_integer(value)) == value
+
+
+def test_negative_integers_use_minimal_twos_complement():
+    assert encode_integer(-1) == b"\x02\x01\xff"
+    assert encode_integer(-128) == b"\x02\x01\x80"
+    assert encode_integer(-129) == b"\x02\x02\xff\x7f"
+    assert encode_integer(128) == b"\x02\x02\x00\x80"
+
+
+@pytest.mark.parametrize(
+    "oid",
+    [
+        "1.3.6.1.2.1.1.1.0",
+        "1.3.6.1.4.1.2011.128.16383.16384.4294967295",
+        "2.999.3",
+        "0.39",
+    ],
+)
+def test_oid_round_trip(oid):
+    assert _decode(encode_oid(oid)) == oid
+
+
+def test_multi_byte_oid_arcs():
+    # 2011 = 0x0F 0x5B in Basis 128, 2.999 -> Subidentifier 1079
+    assert encode_oid("1.3.6.1.4.1.2011") == b"\x06\x07\x2b\x06\x01\x04\x01\x8f\x5b"
+    assert encode_oid("2.999.3") == b"\x06\x03\x88\x37\x03"
+
+
+def test_truncated_oid_is_rejected():
+    with pytest.raises(SnmpError):
+        _decode(b"\x06\x02\x2b\x8f")
+
+
+@pytest.mark.parametrize("size", [0, 127, 128, 255, 256, 70000])
+def test_long_form_length_round_trip(size):
+    value = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+
+    encoded = encode_octet_string(value)
+
+    if size >= 0x80:
+        assert encoded[1] & 0x80
+    assert _decode(encoded) == value
+
+
+def test_request_round_trip_with_long_varbind_list():
+    oids = [f"{OID_SUPPLY_LEVEL}.{index}" for index in range(1, 60)]
+
+    message = encode_request(_GET_BULK_REQUEST, 4711, oids, "geheim", 0, 12)
+
+    pdu_type, request_id, non_repeaters, max_repetitions, varbinds = decode_message(
+        message
+    )
+    assert (pdu_type, request_id, non_repeaters, max_repetitions) == (
+        _GET_BULK_REQUEST,
+        4711,
+        0,
+        12,
+    )
+    assert varbinds == [(oid, None) for oid in oids]
+
+
+def test_truncated_message_is_rejected():
+    message = encode_request(_GET_REQUEST, 1, [OID_SYS_DESCR])
+
+    with pytest.raises(SnmpError):
+        decode_message(message[:-3])
+
+
+# --- Client gegen einen lokalen UDP-Agenten --------------------------------
+
+
+def _oid_key(oid: str) -> tuple[int, ...]:
+    return tuple(int(arc) for arc in oid.split("."))
+
+
+class FakeAgent(asyncio.DatagramProtocol):
+    """
+    Minimaler SNMP-Agent für Tests: beantwortet GET und GETBULK aus einem
+    festen MIB-Auszug (OID -> kodierter Wert).
+    """
+
+    def __init__(self, mib: dict[str, bytes]):
+        self.mib = dict(sorted(mib.items(), key=lambda item: _oid_key(item[0])))
+        self.requests: list[tuple[int, list[str]]] = []
+        # So viele Anfragen bleiben unbeantwortet
+        self.drop = 0
+        # Vor jeder Antwort eine mit fremder Request-ID senden
+        self.stray = False
+        # Fehlerstatus für alle Antworten
+        self.error_status = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        pdu_type, request_id, non_repeaters, max_repetitions, varbinds = decode_message(
+            data
+        )
+        oids = [oid for oid, _ in varbinds]
+        self.requests.append((pdu_type, oids))
+
+        if self.drop:
+            self.drop -= 1
+            return
+
+        if pdu_type == _GET_REQUEST:
+            binds = [(oid, self.mib.get(oid, b"\x80\x00")) for oid in oids]
+        else:
+            binds = []
+            cursors = list(oids)
+            for _ in range(max_repetitions):
+                for idx, cursor in enumerate(cursors):
+                    following = self._next(cursor)
+                    if following is None:
+                        binds.append((cursor, b"\x82\x00"))
+                    else:
+                        binds.append(following)
+                        cursors[idx] = following[0]
+
+        if self.stray:
+            self.transport.sendto(self._response(request_id + 1, []), addr)
+        self.transport.sendto(self._response(request_id, binds), addr)
+
+    def _next(self, oid: str) -> tuple[str, bytes] | None:
+        key = _oid_key(oid)
+        for candidate, value in self.mib.items():
+            if _oid_key(candidate) > key:
+                return candidate, value
+        return None
+
+    def _response(self, request_id: int, binds: list[tuple[str, bytes]]) -> bytes:
+        varbinds = encode_sequence(
+            *(encode_sequence(encode_oid(oid), value) for oid, value in binds)
+        )
+        pdu = encode_sequence(
+            encode_integer(request_id),
+            encode_integer(self.error_status),
+            encode_integer(1 if self.error_status else 0),
+            varbinds,
+            tag=_RESPONSE,
+        )
+        return encode_sequence(encode_integer(1), encode_octet_string("public"), pdu)
+
+
+def run_against_agent(mib: dict, body, **client_kwargs):
+    """Startet den Agenten auf 127.0.0.1 und führt `body(client, agent)` aus."""
+    client_kwargs.setdefault("timeout", 0.5)
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        transport, agent = await loop.create_datagram_endpoint(
+            lambda: FakeAgent(mib), local_addr=("127.0.0.1", 0)
+        )
+        port = transport.get_extra_info("sockname")[1]
+        try:
+            async with SnmpClient(port=port, **client_kwargs) as client:
+                return await body(client, agent)
+        finally:
+            transport.close()
+
+    return asyncio.run(main())
+
+
+COLUMN_A = "1.3.6.1.4.1.99.1.1"
+COLUMN_B = "1.3.6.1.4.1.99.1.2"
+
+TABLE_MIB = {
+    OID_SYS_DESCR: encode_octet_string("Testdrucker"),
+    **{f"{COLUMN_A}.{index}": encode_integer(10 * index) for index in range(1, 6)},
+    **{f"{COLUMN_B}.{index}": encode_octet_string(f"b{index}") for index in (1, 2)},
+}
+
+
+def test_get_returns_values_and_no_such_object():
+    mib = {
+        OID_SYS_DESCR: encode_octet_string("Testdrucker"),
+        OID_DEVICE_STATUS: encode_integer(2),
+        OID_SUPPLY_LEVEL + ".1": encode_integer(-3),
+    }
+
+    async def body(client, agent):
+        return await client.get(
+            "127.0.0.1",
+            [OID_SYS_DESCR, OID_DEVICE_STATUS, OID_SUPPLY_LEVEL + ".1", "1.3.6.1.9.9"],
+        )
+
+    values = run_against_agent(mib, body)
+
+    assert values == {
+        OID_SYS_DESCR: b"Testdrucker",
+        OID_DEVICE_STATUS: 2,
+        OID_SUPPLY_LEVEL + ".1": -3,
+        "1.3.6.1.9.9": NO_SUCH_OBJECT,
+    }
+
+
+def test_get_bulk_returns_successors_and_end_of_mib_view():
+    async def body(client, agent):
+        return await client.get_bulk("127.0.0.1", [f"{COLUMN_B}.1"], max_repetitions=3)
+
+    varbinds = run_against_agent(TABLE_MIB, body)
+
+    assert varbinds == [
+        (f"{COLUMN_B}.2", b"b2"),
+        (f"{COLUMN_B}.2", END_OF_MIB_VIEW),
+        (f"{COLUMN_B}.2", END_OF_MIB_VIEW),
+    ]
+
+
+def test_walk_columns_stops_at_column_end():
+    async def body(client, agent):
+        columns = await client.walk_columns("127.0.0.1", [COLUMN_A], max_repetitions=2)
+        return columns, agent.requests
+
+    columns, requests = run_against_agent(TABLE_MIB, body)
+
+    # Spalte A endet, wo Spalte B beginnt; mehrere Runden wegen max_repetitions=2
+    assert columns == {COLUMN_A: {str(index): 10 * index for index in range(1, 6)}}
+    assert len(requests) == 3
+    assert all(pdu_type == _GET_BULK_REQUEST for pdu_type, _ in requests)
+
+
+def test_walk_columns_in_parallel_until_end_of_mib_view():
+    async def body(client, agent):
+        return await client.walk_columns(
+            "127.0.0.1", [COLUMN_A, COLUMN_B], max_repetitions=4
+        )
+
+    columns = run_against_agent(TABLE_MIB, body)
+
+    # Spalte B ist die letzte im MIB-Auszug und endet mit endOfMibView
+    assert columns == {
+        COLUMN_A: {str(index): 10 * index for index in range(1, 6)},
+        COLUMN_B: {"1": b"b1", "2": b"b2"},
+    }
+
+
+def test_walk_of_missing_column_is_empty():
+    async def body(client, agent):
+        return await client.walk_columns("127.0.0.1", ["1.3.6.1.4.1.99.2"])
+
+    assert run_against_agent(TABLE_MIB, body) == {"1.3.6.1.4.1.99.2": {}}
+
+
+def test_query_printer_status_reads_supply_table():
+    mib = {
+        OID_SYS_DESCR: encode_octet_string("Laser 9000"),
+        OID_DEVICE_STATUS: encode_integer(3),
+        OID_PRINTER_STATUS: encode_integer(3),
+        # Bit 1 (Kein Papier) und Bit 5 (Papierstau)
+        OID_ERROR_STATE: encode_octet_string(b"\x44"),
+        OID_SUPPLY_DESCRIPTION + ".1": encode_octet_string("Toner Schwarz"),
+        OID_SUPPLY_DESCRIPTION + ".2": encode_octet_string("Trommel"),
+        OID_SUPPLY_DESCRIPTION + ".10": encode_octet_string("Resttoner"),
+        OID_SUPPLY_MAX_CAPACITY + ".1": encode_integer(200),
+        OID_SUPPLY_MAX_CAPACITY + ".2": encode_integer(-2),
+        OID_SUPPLY_MAX_CAPACITY + ".10": encode_integer(100),
+        OID_SUPPLY_LEVEL + ".1": encode_integer(0),
+        OID_SUPPLY_LEVEL + ".2": encode_integer(-3),
+        # Füllstand von Index 10 fehlt; danach folgt eine andere Tabelle
+        "1.3.6.1.2.1.43.12.1.1.4.1.1": encode_octet_string("black"),
+    }
+
+    async def body(client, agent):
+        return await query_printer_status(client, "127.0.0.1")
+
+    status = run_against_agent(mib, body)
+
+    assert status.description == "Laser 9000"
+    assert status.status_text == "Bereit"
+    assert status.errors == ["Kein Papier", "Papierstau"]
+    assert [str(supply) for supply in status.supplies] == [
+        "Toner Schwarz 0 %",
+        "Trommel vorhanden",
+        "Resttoner ?",
+    ]
+
+
+def test_lost_request_is_retried():
+    async def body(client, agent):
+        agent.drop = 1
+        values = await client.get("127.0.0.1", [OID_SYS_DESCR])
+        return values, len(agent.requests)
+
+    values, requests = run_against_agent(TABLE_MIB, body, timeout=0.2, retries=1)
+
+    assert values == {OID_SYS_DESCR: b"Testdrucker"}
+    assert requests == 2
+
+
+def test_no_answer_after_retries_raises():
+    async def body(client, agent):
+        agent.drop = 10
+        with pytest.raises(SnmpError, match="Keine Antwort"):
+            await client.get("127.0.0.1", [OID_SYS_DESCR])
+        return len(agent.requests)
+
+    assert run_against_agent(TABLE_MIB, body, timeout=0.1, retries=2) == 3
+
+
+def test_reply_with_foreign_request_id_is_ignored():
+    async def body(client, agent):
+        agent.stray = True
+        return await client.get("127.0.0.1", [OID_SYS_DESCR])
+
+    assert run_against_agent(TABLE_MIB, body) == {OID_SYS_DESCR: b"Testdrucker"}
+
+
+def test_error_status_raises():
+    async def body(client, agent):
+        agent.error_status = 5
+        with pytest.raises(SnmpError, match="Fehlerstatus 5"):
+            await client.get("127.0.0.1", [OID_SYS_DESCR])
+
+    run_against_agent(TABLE_MIB, body)
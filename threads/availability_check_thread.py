@@ -1,18 +1,23 @@
 # threads/availability_check_thread.py
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QObject, Signal
 from models.printer import Printer
+from network.availability import get_availability_cache
+from threads.task_executor import Task
 
 
-class AvailabilityCheckThread(QThread):
-    """Prüft die Verfügbarkeit eines Druckers in einem separaten Thread."""
+class AvailabilityCheckThread(Task):
+    """Prüft die Verfügbarkeit eines Druckers auf dem TaskExecutor."""
 
-    availability_check_finished = Signal(bool)
+    # DNS/IP des Druckers, erreichbar?
+    availability_check_finished = Signal(str, bool)
 
-    def __init__(self, printer: Printer):
-        super().__init__()
+    def __init__(self, printer: Printer, parent: QObject | None = None):
+        super().__init__(parent)
         self.__printer = printer
 
     def run(self) -> None:
-        is_printer_available = self.__printer.is_available()
-        self.availability_check_finished.emit(is_printer_available)
+        is_printer_available = get_availability_cache().check(self.__printer.dns)
+        if self.is_cancelled():
+            return
+        self.availability_check_finished.emit(self.__printer.dns, is_printer_available)
@@ -0,0 +1,61 @@
+# threads/availability_sweep_thread.py
+
+from PySide6.QtCore import Signal
+
+from network.availability import get_availability_cache
+from network.sweeper import (
+    DEFAULT_BUDGET,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_HOST_TIMEOUT,
+    run_sweep,
+)
+from threads.task_executor import Task
+
+
+class AvailabilitySweepThread(Task):
+    """Prüft die Verfügbarkeit vieler Drucker gleichzeitig auf dem TaskExecutor."""
+
+    # Drucker-ID, erreichbar?
+    printer_checked = Signal(int, bool)
+    # Anzahl erreichbarer, nicht erreichbarer und nicht geprüfter Drucker
+    sweep_finished = Signal(int, int, int)
+
+    def __init__(
+        self,
+        hosts: list[tuple[int, str]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        host_timeout: float = DEFAULT_HOST_TIMEOUT,
+        budget: float = DEFAULT_BUDGET,
+    ):
+        super().__init__()
+        self.__hosts = hosts
+        self.__concurrency = concurrency
+        self.__host_timeout = host_timeout
+        self.__budget = budget
+
+    def run(self) -> None:
+        cache = get_availability_cache()
+        dns_names = dict(self.__hosts)
+
+        def on_result(printer_id: int, is_available: bool):
+            # Ergebnisse stehen danach auch Detailansicht und Installation zur Verfügung
+            cache.put(dns_names[printer_id], is_available)
+            if not self.is_cancelled():
+                self.printer_checked.emit(printer_id, is_available)
+
+        results = run_sweep(
+            self.__hosts,
+            on_result=on_result,
+            concurrency=self.__concurrency,
+            host_timeout=self.__host_timeout,
+            budget=self.__budget,
+            should_stop=self.is_cancelled,
+        )
+
+        if self.is_cancelled():
+            return
+
+        values = list(results.values())
+        self.sweep_finished.emit(
+            values.count(True), values.count(False), values.count(None)
+        )
@@ -0,0 +1,127 @@
+# threads/batch_installer_thread.py
+
+from typing import Callable
+from PySide6.QtCore import Signal
+from installer.batch import BatchReport, filter_printers, plan_batch
+from installer.driver_cache import stage_driver
+from installer.planner import SystemState, WmiSystemState
+from installer.script import run_script
+from models.location import Location
+from models.printer import Printer
+from network.availability import get_availability_cache
+from network.resolver import get_resolver
+from network.sweeper import run_sweep
+from threads.task_executor import Task, TaskCancelled
+
+
+class BatchInstallerThread(Task):
+    """
+    Installiert mehrere Drucker auf dem TaskExecutor (Mehrfachauswahl oder
+    ganzer Standort). Alle Schritte laufen gemeinsam in einem Skript; ein
+    Abbruch beendet es.
+    """
+
+    # Anzahl aller geplanten Schritte, bevor der erste beginnt
+    plan_ready = Signal(int)
+    # Nach jedem (auch übersprungenen) Schritt
+    step_finished = Signal()
+    # Beschreibung des Schritts, der gerade beginnt
+    step_started = Signal(str)
+    # Ausgabezeile des laufenden Schritts
+    step_output = Signal(str)
+    # Beschreibung, Nummer des nächsten Versuchs, Fehlermeldung
+    step_retrying = Signal(str, int, str)
+    # Warteschlange, Ergebnis, Meldung
+    printer_finished = Signal(str, str, str)
+    # BatchReport mit dem Ergebnis aller Drucker
+    batch_finished = Signal(object)
+    # Fehler vor Beginn der Installation (mit Fehlermeldung)
+    batch_failed = Signal(str)
+
+    def __init__(
+        self,
+        printers: list[tuple[Printer, Location]],
+        system_state: Callable[[], SystemState] = WmiSystemState,
+        backend: Callable[..., BatchReport] = run_script,
+    ):
+        super().__init__()
+        self.__printers = printers
+        self.__system_state = system_state
+        # Führt den Plan aus (Skript in einem Prozess oder Befehl für Befehl)
+        self.__backend = backend
+
+    def run(self) -> None:
+        try:
+            report = BatchReport()
+
+            # Nicht auflösbare Namen scheitern sofort, der Rest wird installiert
+            addresses = get_resolver().resolve_many(
+                printer.dns for printer, _ in self.__printers
+            )
+            printers = filter_printers(
+                self.__printers,
+                lambda printer: (
+                    f"Der Name '{printer.dns}' konnte nicht aufgelöst werden."
+                    if addresses[printer.dns] is None
+                    else None
+                ),
+                report,
+            )
+
+            # Wie bei der Einzelinstallation nur erreichbare Drucker installieren
+            availability = self.__check_availability(
+                {printer.dns for printer, _ in printers}
+            )
+            self.token.raise_if_cancelled()
+            printers = filter_printers(
+                printers,
+                lambda printer: (
+                    None
+                    if availability.get(printer.dns)
+                    else f"Der Drucker '{printer.dns}' ist nicht erreichbar."
+                ),
+                report,
+            )
+
+            plan = plan_batch(printers, self.__system_state(), stage_driver)
+            self.plan_ready.emit(plan.step_count)
+
+            self.__backend(
+                plan,
+                should_stop=self.is_cancelled,
+                on_step=self.step_finished.emit,
+                on_start=lambda step: self.step_started.emit(step.description),
+                on_output=lambda step, line: self.step_output.emit(line),
+                on_retry=lambda step, attempt, message: self.step_retrying.emit(
+                    step.description, attempt, message
+                ),
+                on_result=self.printer_finished.emit,
+                report=report,
+            )
+            self.batch_finished.emit(report)
+
+        except TaskCancelled:
+            self.batch_failed.emit("Die Installation wurde abgebrochen.")
+        except Exception as e:
+            self.batch_failed.emit(f"Ein unerwarteter Fehler ist aufgetreten: {e}")
+
+    def __check_availability(self, hosts: set[str]) -> dict[str, bool | None]:
+        """
+        Verfügbarkeit aus dem gemeinsamen Cache; fehlende oder abgelaufene
+        Ergebnisse werden gemeinsam neu geprüft und im Cache abgelegt.
+        """
+        cache = get_availability_cache()
+        availability = {host: cache.get(host) for host in hosts}
+        missing = [
+            (host, host) for host, known in availability.items() if known is None
+        ]
+
+        if missing:
+            availability.update(
+                run_sweep(
+                    missing,
+                    on_result=cache.put,
+                    should_stop=self.is_cancelled,
+                )
+            )
+        return availability
@@ -0,0 +1,94 @@
+# threads/database_worker.py
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, Signal
+
+
+class DatabaseWorker(QObject):
+    """
+    Führt Datenbankzugriffe auf einem eigenen Arbeitsthread aus.
+
+    Ergebnisse und Fehler werden über ein Signal zurück an den GUI-Thread
+    geliefert und dort an die übergebenen Callbacks weitergereicht. Alle
+    Aufträge laufen nacheinander auf demselben Thread, Schreibzugriffe
+    behalten also ihre Reihenfolge.
+
+    Aufträge mit gleichem `key` ersetzen sich gegenseitig: ein noch nicht
+    gestarteter älterer Auftrag wird übersprungen, und von bereits laufenden
+    älteren Aufträgen wird nur das Ergebnis des neuesten zugestellt.
+    """
+
+    # (key, generation, on_result, on_error), Ergebnis, Fehler
+    _finished = Signal(object, object, object)
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+        self._generations: dict[str, int] = {}
+
+        self._finished.connect(self._deliver)
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        on_result: Callable[[Any], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        key: str | None = None,
+    ) -> Future:
+        """Stellt `func(*args)` in die Warteschlange und gibt das Future zurück."""
+        generation = 0
+        if key is not None:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+
+        def run():
+            if self.is_superseded(key, generation):
+                return None
+
+            try:
+                result = func(*args)
+            except Exception as e:
+                self._finished.emit((key, generation, on_result, on_error), None, e)
+                raise
+
+            self._finished.emit((key, generation, on_result, on_error), result, None)
+            return result
+
+        return self._executor.submit(run)
+
+    def is_superseded(self, key: str | None, generation: int) -> bool:
+        return key is not None and self._generations.get(key) != generation
+
+    def _deliver(self, meta: tuple, result: Any, error: Exception | None):
+        key, generation, on_result, on_error = meta
+
+        # Ergebnis eines überholten Auftrags verwerfen
+        if self.is_superseded(key, generation):
+            return
+
+        if error is not None:
+            if on_error:
+                on_error(error)
+        elif on_result:
+            on_result(result)
+
+    def shutdown(self):
+        """Verwirft wartende Aufträge und wartet auf den laufenden."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_worker: DatabaseWorker | None = None
+
+
+def get_database_worker() -> DatabaseWorker:
+    """Gibt den gemeinsamen DatabaseWorker zurück (wird im GUI-Thread angelegt)."""
+    global _worker
+
+    if _worker is None:
+        _worker = DatabaseWorker()
+
+    return _worker
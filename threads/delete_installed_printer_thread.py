@@ -1,10 +1,11 @@
 # threads/delete_installed_printer_thread.py
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import Signal
+from threads.task_executor import Task
 import wmi
 
 
-class UninstallPrinterThread(QThread):
+class UninstallPrinterThread(Task):
 
     printer_uninstalled = Signal(str)
     printer_uninstall_failed = Signal(str)
@@ -21,6 +22,9 @@ class UninstallPrinterThread(QThread):
             printers = wmi_connection.Win32_Printer(Name=self.printer_name)
 
             for printer in printers:
+                # Letzte Gelegenheit für einen Abbruch vor der Änderung
+                if self.is_cancelled():
+                    return
                 printer.Delete_()
                 self.printer_uninstalled.emit(self.printer_name)
                 return
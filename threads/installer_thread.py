@@ -1,73 +1,104 @@
 # threads/installer_thread.py
 
-import subprocess
-from PySide6.QtCore import QThread, Signal
+from typing import Callable
+from PySide6.QtCore import Signal
+from installer.batch import RESULT_FAILED, RESULT_UNCHANGED, BatchReport, plan_batch
+from installer.driver_cache import stage_driver
+from installer.planner import SystemState, WmiSystemState
+from installer.script import run_script
 from models.printer import Printer
 from models.location import Location
+from network.resolver import get_resolver
+from threads.task_executor import Task, TaskCancelled
 
 
-class InstallerThread(QThread):
+class InstallerThread(Task):
     """
-    Führt die Installationsbefehle für einen Drucker in einem separaten Thread aus.
-    Kommuniziert das Ergebnis über Signale.
+    Installiert einen Drucker auf dem TaskExecutor. Vorher wird der Ist-Zustand
+    des Rechners gelesen; nur fehlende Schritte laufen, gemeinsam in einem
+    Skript. Kommuniziert das Ergebnis über Signale. Ein Abbruch beendet das
+    laufende Skript.
     """
 
-    # Signal für jeden erfolgreich abgeschlossenen Schritt
+    # Signal mit der Anzahl der geplanten Schritte, bevor der erste beginnt
+    plan_ready = Signal(int)
+    # Signal für jeden abgeschlossenen Schritt
     step_finished = Signal()
+    # Signal zu Beginn eines Schritts (mit Beschreibung)
+    step_started = Signal(str)
+    # Signal für jede Ausgabezeile des laufenden Schritts
+    step_output = Signal(str)
+    # Signal vor einer Wiederholung (Beschreibung, Versuch, Fehlermeldung)
+    step_retrying = Signal(str, int, str)
     # Signal bei erfolgreichem Abschluss der gesamten Installation (mit Erfolgsmeldung)
     installation_finished = Signal(str)
     # Signal bei einem Fehler während der Installation (mit Fehlermeldung)
     installation_failed = Signal(str)
 
-    def __init__(self, printer: Printer, location: Location):
+    def __init__(
+        self,
+        printer: Printer,
+        location: Location,
+        system_state: Callable[[], SystemState] = WmiSystemState,
+        backend: Callable[..., BatchReport] = run_script,
+    ):
         super().__init__()
         self.__printer = printer
         self.__location = location
-
-        self.__commands = self._build_commands()
-
-    def _build_commands(self) -> list[str]:
-        """Baut die Liste der auszuführenden Shell-Befehle."""
-
-        printer_name = f"[{self.__location.name}] {self.__printer.name}"
-
-        port_name = f"IP_{self.__printer.dns}"
-        return [
-            (
-                f'cscript "C:/Windows/System32/Printing_Admin_Scripts/de-DE/prnport.vbs" '
-                f"-a -r {port_name} -h {self.__printer.dns} -o raw -n 9100"
-            ),
-            (f'pnputil /add-driver "{self.__printer.driver_inf_path}" /install'),
-            (
-                f'rundll32 printui.dll,PrintUIEntry /if /b "{printer_name}" /r "{port_name}" '
-                f'/f "{self.__printer.driver_inf_path}" /m "{self.__printer.driver_name}" /z'
-            ),
-        ]
+        # Liefert den Ist-Zustand; für Tests durch eine feste SystemState ersetzbar
+        self.__system_state = system_state
+        # Führt den Plan aus (Skript in einem Prozess oder Befehl für Befehl)
+        self.__backend = backend
 
     def run(self) -> None:
-        """Führt die Installationsschritte nacheinander aus."""
+        """Führt die fehlenden Installationsschritte in einem Skript aus."""
         try:
 
-            for cmd in self.__commands:
-                self.__run_command(cmd)
-                self.step_finished.emit()
+            # Nicht auflösbare Namen früh melden; der Port behält den Namen,
+            # damit er eine spätere Adressänderung des Druckers übersteht
+            if get_resolver().resolve(self.__printer.dns) is None:
+                self.installation_failed.emit(
+                    f"Der Name '{self.__printer.dns}' konnte nicht aufgelöst werden."
+                )
+                return
 
-            success_msg = (
-                f"Drucker '{self.__printer.name}' wurde erfolgreich installiert!"
+            # Treiberpaket wird bei Bedarf vorher in den lokalen Cache kopiert
+            plan = plan_batch(
+                [(self.__printer, self.__location)],
+                self.__system_state(),
+                stage_driver,
             )
-            self.installation_finished.emit(success_msg)
+            self.plan_ready.emit(plan.step_count)
+            self.token.raise_if_cancelled()
 
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr or str(e)
-            self.installation_failed.emit(error_msg)
+            report = self.__backend(
+                plan,
+                should_stop=self.is_cancelled,
+                on_step=self.step_finished.emit,
+                on_start=lambda step: self.step_started.emit(step.description),
+                on_output=lambda step, line: self.step_output.emit(line),
+                on_retry=lambda step, attempt, message: self.step_retrying.emit(
+                    step.description, attempt, message
+                ),
+            )
+            _, result, message = report.results[0]
+
+            if self.is_cancelled():
+                raise TaskCancelled()
+            if result == RESULT_FAILED:
+                self.installation_failed.emit(message)
+            elif result == RESULT_UNCHANGED:
+                self.installation_finished.emit(
+                    f"Drucker '{self.__printer.name}' ist bereits installiert."
+                )
+            else:
+                self.installation_finished.emit(
+                    f"Drucker '{self.__printer.name}' wurde erfolgreich installiert!"
+                )
+
+        except TaskCancelled:
+            self.installation_failed.emit("Die Installation wurde abgebrochen.")
         except Exception as e:
             self.installation_failed.emit(
                 f"Ein unerwarteter Fehler ist aufgetreten: {e}"
             )
-
-    def __run_command(self, command: str):
-        """Führt einen einzelnen Shell-Befehl aus und wirft bei Fehlern eine Exception."""
-        # capture_output=True, text=True sind wichtig für Fehlermeldungen
-
-        subprocess.run(command, shell=True, capture_output=True, text=True)
-        # Der `check=True` Parameter sorgt dafür, dass bei einem non-zero return code eine CalledProcessError ausgelöst wird.
@@ -1,12 +1,13 @@
 # threads/load_installed_printers_thread.py
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import Signal
 from models.printer import Printer
+from threads.task_executor import Task
 import win32print
 import wmi
 
 
-class LoadInstalledPrintersThread(QThread):
+class LoadInstalledPrintersThread(Task):
 
     # Signal bei einem Fehler während der Installation (mit Fehlermeldung)
     printer_found = Signal(Printer, int)
@@ -27,6 +28,7 @@ class LoadInstalledPrintersThread(QThread):
             self.printer_collection_found.emit(len(printers))
 
             for idx, printer in enumerate(printers):
+                self.token.raise_if_cancelled()
 
                 printer_name = printer[2]
                 wmi_connection = wmi.WMI()
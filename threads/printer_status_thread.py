@@ -0,0 +1,23 @@
+# threads/printer_status_thread.py
+
+from PySide6.QtCore import QObject, Signal
+from models.printer import Printer
+from network.snmp import get_status_collector
+from threads.task_executor import Task
+
+
+class PrinterStatusThread(Task):
+    """Fragt Gerätestatus und Füllstände eines Druckers per SNMP ab."""
+
+    # DNS/IP des Druckers, PrinterStatus oder None (keine SNMP-Antwort)
+    printer_status_finished = Signal(str, object)
+
+    def __init__(self, printer: Printer, parent: QObject | None = None):
+        super().__init__(parent)
+        self.__printer = printer
+
+    def run(self) -> None:
+        status = get_status_collector().collect(self.__printer.dns)
+        if self.is_cancelled():
+            return
+        self.printer_status_finished.emit(self.__printer.dns, status)
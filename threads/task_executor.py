@@ -0,0 +1,199 @@
+# threads/task_executor.py
+
+import itertools
+import queue
+import threading
+import traceback
+from typing import Callable
+
+from PySide6.QtCore import QObject, Signal
+
+# Prioritäten: kleinere Werte laufen zuerst
+PRIORITY_HIGH = 0  # vom Benutzer ausgelöste Aktionen und Prüfungen
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20  # Hintergrundarbeit, z.B. Prüfung aller Drucker
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class TaskCancelled(Exception):
+    """Wird von `CancellationToken.raise_if_cancelled` ausgelöst."""
+
+
+class CancellationToken:
+    """Signalisiert einer laufenden Aufgabe, dass sie sich beenden soll."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+    def wait(self, timeout: float) -> bool:
+        """Wartet höchstens `timeout` Sekunden; gibt True zurück, wenn abgebrochen wurde."""
+        return self._event.wait(timeout)
+
+
+class Task(QObject):
+    """
+    Eine Aufgabe, die auf dem gemeinsamen TaskExecutor läuft.
+
+    Unterklassen müssen `run()` implementieren (die eigentliche Arbeit, im
+    Arbeitsthread), prüfen an geeigneten Stellen `self.token` und melden
+    Ergebnisse über eigene Signale. Nach Abbruch sollen keine Ergebnissignale
+    mehr gesendet werden.
+    """
+
+    # Von Unterklassen bereitzustellen; bewusst ohne Standardimplementierung,
+    # QObject verträgt sich nicht zuverlässig mit ABCMeta
+    run: Callable[[], None]
+
+    # Wird nach dem Ende von run() gesendet, auch bei Abbruch oder Fehler
+    finished = Signal()
+
+    QUEUED, RUNNING, FINISHED = range(3)
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self.token = CancellationToken()
+        self.slot: str | None = None
+        self.state: int | None = None
+
+    def cancel(self):
+        self.token.cancel()
+
+    def is_cancelled(self) -> bool:
+        return self.token.is_cancelled
+
+    def is_running(self) -> bool:
+        return self.state in (Task.QUEUED, Task.RUNNING)
+
+    def is_finished(self) -> bool:
+        return self.state == Task.FINISHED
+
+
+class TaskExecutor(QObject):
+    """
+    Führt Tasks auf einer begrenzten Zahl wiederverwendeter Arbeitsthreads aus.
+
+    Wartende Tasks werden nach Priorität und innerhalb einer Priorität in
+    Reihenfolge des Eingangs gestartet. Ein Task mit `slot` bricht den
+    vorherigen Task desselben Slots ab (kooperativ über dessen Token):
+    ein noch wartender wird gar nicht erst gestartet.
+    """
+
+    _task_done = Signal(object)
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._slots: dict[str, Task] = {}
+        # Tasks bis zur Zustellung ihrer Signale festhalten
+        self._active: set[Task] = set()
+        self._shutdown = False
+
+        self._task_done.connect(self._release)
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"task-{idx}", daemon=True)
+            for idx in range(max(1, max_workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def start(
+        self, task: Task, priority: int = PRIORITY_NORMAL, slot: str | None = None
+    ) -> Task:
+        """Stellt `task` in die Warteschlange und gibt ihn zurück."""
+        if not callable(getattr(task, "run", None)):
+            raise TypeError(f"{type(task).__name__} implementiert run() nicht.")
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("TaskExecutor wurde bereits beendet.")
+
+            if slot is not None:
+                previous = self._slots.get(slot)
+                if previous is not None and previous is not task:
+                    previous.cancel()
+                self._slots[slot] = task
+
+            task.slot = slot
+            task.state = Task.QUEUED
+            self._active.add(task)
+            self._queue.put((priority, next(self._counter), task))
+
+        return task
+
+    def cancel(self, slot: str):
+        """Bricht den aktuellen Task in `slot` ab, falls vorhanden."""
+        with self._lock:
+            task = self._slots.get(slot)
+        if task is not None:
+            task.cancel()
+
+    def _work(self):
+        while True:
+            _, _, task = self._queue.get()
+            if task is None:
+                return
+
+            try:
+                if not task.is_cancelled():
+                    task.state = Task.RUNNING
+                    task.run()
+            except TaskCancelled:
+                pass
+            except Exception:
+                traceback.print_exc()
+            finally:
+                task.state = Task.FINISHED
+                with self._lock:
+                    if task.slot is not None and self._slots.get(task.slot) is task:
+                        del self._slots[task.slot]
+                task.finished.emit()
+                self._task_done.emit(task)
+
+    def _release(self, task: Task):
+        self._active.discard(task)
+
+    def shutdown(self, wait: bool = True):
+        """Bricht alle Tasks ab und beendet die Arbeitsthreads."""
+        with self._lock:
+            self._shutdown = True
+            tasks = list(self._active)
+
+        for task in tasks:
+            task.cancel()
+
+        # Sentinels laufen nach allen regulären Tasks
+        for _ in self._workers:
+            self._queue.put((float("inf"), next(self._counter), None))
+
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+
+_executor: TaskExecutor | None = None
+
+
+def get_task_executor() -> TaskExecutor:
+    """Gibt den gemeinsamen TaskExecutor zurück (wird im GUI-Thread angelegt)."""
+    global _executor
+
+    if _executor is None:
+        _executor = TaskExecutor()
+
+    return _executor
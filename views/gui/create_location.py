@@ -3,6 +3,7 @@
 from PySide6.QtWidgets import QDialog, QMessageBox
 from .ui.create_location_ui import Ui_CreateLocationDialog
 from crud.locations import get_location_by_name
+from threads.database_worker import get_database_worker
 
 
 class CreateLocationDialog(QDialog, Ui_CreateLocationDialog):
@@ -10,6 +11,8 @@ class CreateLocationDialog(QDialog, Ui_CreateLocationDialog):
         super().__init__()
         self.setupUi(self)
 
+        self._db = get_database_worker()
+
         self.createButton.clicked.connect(self.on_accept)
         self.cancelButton.clicked.connect(self.reject)
 
@@ -22,7 +25,21 @@ class CreateLocationDialog(QDialog, Ui_CreateLocationDialog):
             return
 
         # Optionale, aber benutzerfreundliche Prüfung auf Duplikate direkt in der UI
-        if get_location_by_name(location_name):
+        self.createButton.setEnabled(False)
+        self._db.submit(
+            get_location_by_name,
+            location_name,
+            on_result=lambda location: self._on_duplicate_checked(
+                location_name, location
+            ),
+            on_error=lambda error: self._on_duplicate_checked(location_name, None),
+            key="create_location.check",
+        )
+
+    def _on_duplicate_checked(self, location_name: str, location):
+        self.createButton.setEnabled(True)
+
+        if location:
             QMessageBox.warning(
                 self,
                 "Konflikt",
@@ -9,7 +9,8 @@ from models.location import Location
 
 from typing import Optional, Tuple, Dict, Any
 
-from crud.locations import get_locations, get_location_by_id, get_location_by_name
+from crud.locations import get_locations
+from threads.database_worker import get_database_worker
 
 
 class CreatePrinterDialog(QDialog, Ui_CreatePrinterDialog):
@@ -26,6 +27,10 @@ class CreatePrinterDialog(QDialog, Ui_CreatePrinterDialog):
         self.location = location
         self.edit_mode = edit_mode
 
+        # Standortname -> ID, wird asynchron geladen
+        self._location_ids: Dict[str, int] = {}
+        self._db = get_database_worker()
+
         self._populate_locations()
         self._configure_ui()
 
@@ -43,12 +48,30 @@ class CreatePrinterDialog(QDialog, Ui_CreatePrinterDialog):
             self.setWindowTitle("Neuen Drucker erstellen")
 
     def _populate_locations(self):
-        locations = get_locations()
+        # Erst nach dem Laden der Standorte kann der Dialog bestätigt werden
+        self.createButton.setEnabled(False)
+        self._db.submit(
+            get_locations,
+            on_result=self._on_locations_loaded,
+            on_error=lambda error: self._on_locations_loaded([]),
+            key="create_printer.locations",
+        )
+
+    def _on_locations_loaded(self, locations):
+        locations = locations or []
+
         for location in locations:
             self.locationComboBox.addItem(location["name"])
+            self._location_ids[location["name"]] = location["id"]
 
         if self.location:
             self.locationComboBox.setCurrentText(self.location.name)
+        elif self.printer:
+            # Den Standort des Druckers in der ComboBox auswählen
+            for name, location_id in self._location_ids.items():
+                if location_id == self.printer.location_id:
+                    self.locationComboBox.setCurrentText(name)
+                    break
 
         if not locations and not self.edit_mode:
             QMessageBox.warning(
@@ -56,7 +79,9 @@ class CreatePrinterDialog(QDialog, Ui_CreatePrinterDialog):
                 "Keine Standorte",
                 "Bitte erstellen Sie zuerst einen Standort, bevor Sie einen Drucker hinzufügen.",
             )
-            self.createButton.setEnabled(False)
+            return
+
+        self.createButton.setEnabled(True)
 
     def _load_printer_data(self):
         self.DNSNameEdit.setText(self.printer.dns)
@@ -65,12 +90,6 @@ class CreatePrinterDialog(QDialog, Ui_CreatePrinterDialog):
         self.driverNameEdit.setText(self.printer.driver_name)
         self.driverPathEdit.setText(self.printer.driver_inf_path)
 
-        # Den Standort des Druckers in der ComboBox auswählen
-        location = get_location_by_id(self.printer.location_id)
-
-        if location:
-            self.locationComboBox.setCurrentText(location["name"])
-
     def _on_accept(self):
         # Einfache Validierung, ob alle Felder ausgefüllt sind
         fields = [
@@ -95,9 +114,7 @@ class CreatePrinterDialog(QDialog, Ui_CreatePrinterDialog):
             "model": self.printerModelEdit.text().strip(),
             "driver_name": self.driverNameEdit.text().strip(),
             "driver_inf_path": self.driverPathEdit.text().strip(),
-            "location_id": get_location_by_name(self.locationComboBox.currentText())[
-                "id"
-            ],
+            "location_id": self._location_ids[self.locationComboBox.currentText()],
         }
 
         # Gibt die neuen Daten und den ausgewählten Standortnamen zurück
@@ -1,7 +1,14 @@
 # views/gui/main_window.py
 
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QMainWindow, QMessageBox, QTreeWidgetItem, QListWidgetItem
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QColor, QIcon, QPainter, QPixmap
+from PySide6.QtWidgets import (
+    QFileDialog,
+    QListWidgetItem,
+    QMainWindow,
+    QMessageBox,
+    QTreeWidgetItem,
+)
 
 from .ui.main_window_ui import Ui_MainWindow
 from .create_printer import CreatePrinterDialog
@@ -11,26 +18,84 @@ from models.printer import Printer
 from models.location import Location
 
 from threads.installer_thread import InstallerThread
+from threads.batch_installer_thread import BatchInstallerThread
 from threads.availability_check_thread import AvailabilityCheckThread
+from threads.availability_sweep_thread import AvailabilitySweepThread
+from threads.printer_status_thread import PrinterStatusThread
 from threads.load_installed_printers_thread import LoadInstalledPrintersThread
 from threads.delete_installed_printer_thread import UninstallPrinterThread
+from threads.database_worker import get_database_worker
+from threads.task_executor import PRIORITY_HIGH, PRIORITY_LOW, get_task_executor
+from network.availability import get_availability_cache
+from network.snmp import PrinterStatus, get_status_collector
 
 from crud.locations import (
-    get_locations,
     get_location_by_name,
     get_location_by_id,
     create_location,
     delete_location,
 )
 from crud.printers import (
+    SEARCH_LIMIT,
     get_printer_by_dns,
     get_printers_by_location_id,
+    search_printers,
     create_printer,
     update_printer,
     delete_printer,
 )
+from crud.catalog import get_catalog_snapshot
+from crud.changes import ChangeSet, changes_since
+from crud.bulk import export_file, import_file
+from crud.database import is_read_only
 import webbrowser
 
+# Abstand, in dem Änderungen anderer Clients abgefragt werden
+CHANGE_POLL_INTERVAL_MS = 5000
+
+# Farben der Statussymbole im Baum: erreichbar, nicht erreichbar, unbekannt
+STATUS_COLORS = {True: "lightgreen", False: "salmon", None: "gray"}
+
+
+def _status_icon(color: str, size: int = 12) -> QIcon:
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.transparent)
+
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor(color))
+    painter.drawEllipse(1, 1, size - 2, size - 2)
+    painter.end()
+
+    return QIcon(pixmap)
+
+
+def _load_printer_with_location(dns: str):
+    printer = get_printer_by_dns(dns)
+    if not printer:
+        return None, None
+    return printer, get_location_by_id(printer["location_id"])
+
+
+def _load_printers_with_locations(dns_list: list[str]):
+    locations = {}
+    result = []
+    for dns in dns_list:
+        printer = get_printer_by_dns(dns)
+        if not printer:
+            continue
+        location_id = printer["location_id"]
+        if location_id not in locations:
+            locations[location_id] = get_location_by_id(location_id)
+        result.append((printer, locations[location_id]))
+    return result
+
+
+def _load_location_printers(location_id: int):
+    location = get_location_by_id(location_id)
+    return [(printer, location) for printer in get_printers_by_location_id(location_id)]
+
 
 class MainWindow(QMainWindow, Ui_MainWindow):
     def __init__(self):
@@ -42,12 +107,42 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.installed_printer_collection_count: int = 0
 
         self._check_availability_thread = None
+        self._availability_cache = get_availability_cache()
+        self._availability_dns: str | None = None
+        self._printer_status_thread = None
+        self._status_collector = get_status_collector()
+        self._status_dns: str | None = None
         self._load_installed_printers_thread = None
         self._uninstall_printer_thread = None
         self._installer_thread = None
+        self._batch_installer_thread = None
+        self._sweep_thread = None
+        # Hinweis auf abgeschnittene Suchergebnisse steht in der Statusleiste
+        self._search_truncated = False
+
+        # Prüfungen, Installation und WMI-Abfragen laufen auf dem TaskExecutor
+        self._tasks = get_task_executor()
+
+        # Alle Datenbankzugriffe laufen über den Arbeitsthread
+        self._db = get_database_worker()
+
+        # Baum-Einträge nach Datenbank-ID, damit Änderungen direkt angewendet werden können
+        self._location_items: dict[int, QTreeWidgetItem] = {}
+        self._printer_items: dict[int, QTreeWidgetItem] = {}
+        self._change_seq: int = 0
+
+        # Letztes bekanntes Prüfergebnis pro Drucker-ID
+        self._availability: dict[int, bool] = {}
+        self._status_icons = {
+            state: _status_icon(color) for state, color in STATUS_COLORS.items()
+        }
+
+        self._change_timer = QTimer(self)
+        self._change_timer.setInterval(CHANGE_POLL_INTERVAL_MS)
 
         self._connect_signals()
         self.load_storage_to_gui()
+        self._change_timer.start()
         self.on_installed_printers_refresh()
 
     def _connect_signals(self):
@@ -65,6 +160,10 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.on_installed_printers_refresh
         )
         self.uninstallPrinterButton.clicked.connect(self.on_printer_uninstall)
+        self.importPrintersAction.triggered.connect(self.on_import_printers)
+        self.exportPrintersAction.triggered.connect(self.on_export_printers)
+        self.sweepAvailabilityAction.triggered.connect(self.start_availability_sweep)
+        self._change_timer.timeout.connect(self.refresh_changes)
 
     def on_printer_uninstalled(self, printer_name: str):
         QMessageBox.information(
@@ -86,11 +185,6 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.uninstallPrinterButton.setEnabled(False)
             printer_name = self.installedPrintersListWidget.currentItem().text()
 
-            if self._uninstall_printer_thread:
-                self._uninstall_printer_thread.terminate()
-                self._uninstall_printer_thread.quit()
-                self._uninstall_printer_thread.wait()
-
             self._uninstall_printer_thread = UninstallPrinterThread(printer_name)
             self._uninstall_printer_thread.printer_uninstalled.connect(
                 self.on_printer_uninstalled
@@ -98,7 +192,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self._uninstall_printer_thread.printer_uninstall_failed.connect(
                 self.on_printer_uninstall_failed
             )
-            self._uninstall_printer_thread.start()
+            self._tasks.start(
+                self._uninstall_printer_thread,
+                priority=PRIORITY_HIGH,
+                slot="uninstall_printer",
+            )
 
     def on_installed_printer_found(self, printer: Printer, index: int):
         self.statusbar.showMessage(
@@ -118,7 +216,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     def on_installed_printers_refresh(self):
 
         if self._load_installed_printers_thread:
-            if self._load_installed_printers_thread.isRunning():
+            if self._load_installed_printers_thread.is_running():
                 return
 
         self.installedPrintersRefreshButton.setEnabled(False)
@@ -131,63 +229,335 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self._load_installed_printers_thread.printer_collection_found.connect(
             self.on_printer_collection_found
         )
-        self._load_installed_printers_thread.start()
+        self._load_installed_printers_thread.finished.connect(
+            self.on_installed_printers_loaded
+        )
+        self._tasks.start(
+            self._load_installed_printers_thread, slot="installed_printers"
+        )
+
+    def on_installed_printers_loaded(self):
+        # Auch nach Abbruch oder wenn keine Drucker gefunden wurden
+        self.installedPrintersRefreshButton.setEnabled(True)
+
+    def on_import_printers(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Drucker importieren", "", "Druckerlisten (*.csv *.json *.jsonl)"
+        )
+        if not path:
+            return
+
+        self.importPrintersAction.setEnabled(False)
+        self.statusbar.showMessage("Import läuft...")
+        self._db.submit(
+            import_file,
+            path,
+            on_result=self._on_import_finished,
+            on_error=self._on_import_failed,
+        )
+
+    def _on_import_finished(self, report):
+        self.importPrintersAction.setEnabled(True)
+        self.statusbar.clearMessage()
+        self.refresh_changes()
+
+        if report.errors:
+            details = "\n".join(
+                f"Datensatz {row_number}: {message}"
+                for row_number, message in report.errors[:20]
+            )
+            if report.failed > 20:
+                details += f"\n... und {report.failed - 20} weitere."
+            QMessageBox.warning(
+                self, "Import abgeschlossen", f"{report.summary()}\n\n{details}"
+            )
+        else:
+            QMessageBox.information(self, "Import abgeschlossen", report.summary())
+
+    def _on_import_failed(self, error: Exception):
+        self.importPrintersAction.setEnabled(True)
+        self.statusbar.clearMessage()
+        QMessageBox.critical(self, "Importfehler", str(error))
+
+    def on_export_printers(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Drucker exportieren",
+            "drucker.csv",
+            "CSV (*.csv);;JSON (*.json);;JSON Lines (*.jsonl)",
+        )
+        if not path:
+            return
+
+        self.statusbar.showMessage("Export läuft...")
+        self._db.submit(
+            export_file,
+            path,
+            on_result=lambda count: self.statusbar.showMessage(
+                f"{count} Drucker exportiert.", 3000
+            ),
+            on_error=lambda error: QMessageBox.critical(
+                self, "Exportfehler", str(error)
+            ),
+        )
 
     def on_documentation_load(self):
         webbrowser.open("https://docs.nachtblau.tv/node/36630/")
 
     def load_storage_to_gui(self):
+        self.statusbar.showMessage("Daten werden geladen...")
+        self._db.submit(
+            get_catalog_snapshot,
+            on_result=self._on_catalog_loaded,
+            on_error=self._on_database_error,
+            key="catalog",
+        )
+
+    def _on_catalog_loaded(self, snapshot):
         self.printersTreeWidget.clear()
-        locations = get_locations()
+        self._location_items.clear()
+        self._printer_items.clear()
 
-        if locations:
-            for location in locations:
-                location_item = QTreeWidgetItem([location["name"]])
-                self.printersTreeWidget.addTopLevelItem(location_item)
+        # Stand des Änderungsprotokolls vor dem Laden, damit nichts verloren geht
+        self._change_seq, catalog = snapshot
 
-                printers = get_printers_by_location_id(location["id"])
-                for printer in printers:
-                    printer_item = QTreeWidgetItem([printer["name"]])
-                    printer_item.setData(0, Qt.UserRole, printer["dns"])
-                    location_item.addChild(printer_item)
+        if catalog:
+            for location in catalog:
+                location_item = self._add_location_item(location)
+
+                for printer in location["printers"]:
+                    self._add_printer_item(location_item, printer)
 
         self.printersTreeWidget.expandAll()
-        self.statusbar.showMessage("Daten erfolgreich geladen.", 3000)
+        self.on_search(self.searchEdit.text())
+        self.start_availability_sweep()
+
+        if self.apply_read_only_state():
+            self.statusbar.showMessage(
+                "Datenbank nicht erreichbar – es wird die lokale Kopie angezeigt (nur lesen)."
+            )
+        else:
+            self.statusbar.showMessage("Daten erfolgreich geladen.", 3000)
+
+    def _add_location_item(self, location) -> QTreeWidgetItem:
+        location_item = QTreeWidgetItem([location["name"]])
+        self.printersTreeWidget.addTopLevelItem(location_item)
+        self._location_items[location["id"]] = location_item
+        return location_item
+
+    def _add_printer_item(self, location_item: QTreeWidgetItem, printer):
+        printer_item = QTreeWidgetItem([printer["name"]])
+        printer_item.setData(0, Qt.UserRole, printer["dns"])
+        printer_item.setIcon(
+            0, self._status_icons[self._availability.get(printer["id"])]
+        )
+        location_item.addChild(printer_item)
+        self._printer_items[printer["id"]] = printer_item
+        return printer_item
+
+    def start_availability_sweep(self):
+        """Prüft alle Drucker im Baum gleichzeitig und zeigt das Ergebnis als Symbol."""
+        hosts = [
+            (printer_id, printer_item.data(0, Qt.UserRole))
+            for printer_id, printer_item in self._printer_items.items()
+        ]
+        if not hosts:
+            return
+
+        self.sweepAvailabilityAction.setEnabled(False)
+        self.statusbar.showMessage(
+            f"Verfügbarkeit von {len(hosts)} Druckern wird geprüft..."
+        )
+
+        self._sweep_thread = AvailabilitySweepThread(hosts)
+        self._sweep_thread.printer_checked.connect(self.on_printer_checked)
+        self._sweep_thread.sweep_finished.connect(self.on_sweep_finished)
+        # Ersetzt eine noch laufende Prüfung, z.B. nach dem Neuladen des Baums
+        self._tasks.start(self._sweep_thread, priority=PRIORITY_LOW, slot="sweep")
+
+    def on_printer_checked(self, printer_id: int, is_available: bool):
+        self._availability[printer_id] = is_available
+
+        printer_item = self._printer_items.get(printer_id)
+        if printer_item:
+            printer_item.setIcon(0, self._status_icons[is_available])
+
+    def on_sweep_finished(self, available: int, unavailable: int, unchecked: int):
+        self.sweepAvailabilityAction.setEnabled(True)
+
+        message = f"Verfügbarkeit geprüft: {available} erreichbar, {unavailable} nicht erreichbar"
+        if unchecked:
+            message += f", {unchecked} nicht geprüft"
+        self.statusbar.showMessage(message + ".", 5000)
+
+    def refresh_changes(self):
+        """Übernimmt alle Änderungen seit dem letzten Abgleich in den Baum."""
+        self._db.submit(
+            changes_since,
+            self._change_seq,
+            on_result=self._on_changes_loaded,
+            on_error=self._on_database_error,
+            key="changes",
+        )
+
+    def _on_changes_loaded(self, change_set: ChangeSet | None):
+        if change_set is None:
+            # Protokoll reicht nicht mehr zurück: vollständig neu laden
+            self.load_storage_to_gui()
+            return
+
+        if not change_set.is_empty():
+            self.apply_changes(change_set)
+
+        self.apply_read_only_state()
+
+    def apply_changes(self, change_set: ChangeSet):
+        """Wendet eingefügte, geänderte und gelöschte Einträge direkt im Baum an."""
+        current_item = self.printersTreeWidget.currentItem()
+        current_changed = False
+        current_deleted = False
+
+        for printer_id in change_set.deleted_printers:
+            printer_item = self._printer_items.pop(printer_id, None)
+            if printer_item is None:
+                continue
+            current_deleted |= printer_item is current_item
+            if printer_item.parent():
+                printer_item.parent().removeChild(printer_item)
+
+        for location_id in change_set.deleted_locations:
+            location_item = self._location_items.pop(location_id, None)
+            if location_item is None:
+                continue
+
+            # Die Drucker des Standorts verschwinden mit ihm aus dem Baum
+            for printer_id in [
+                printer_id
+                for printer_id, printer_item in self._printer_items.items()
+                if printer_item.parent() is location_item
+            ]:
+                current_deleted |= self._printer_items.pop(printer_id) is current_item
+
+            current_deleted |= location_item is current_item
+            self.printersTreeWidget.takeTopLevelItem(
+                self.printersTreeWidget.indexOfTopLevelItem(location_item)
+            )
+
+        for location in change_set.locations:
+            location_item = self._location_items.get(location["id"])
+            if location_item:
+                location_item.setText(0, location["name"])
+                current_changed |= location_item is current_item
+            else:
+                self._add_location_item(location).setExpanded(True)
+
+        for printer in change_set.printers:
+            location_item = self._location_items.get(printer["location_id"])
+            if location_item is None:
+                continue
+
+            printer_item = self._printer_items.get(printer["id"])
+            if printer_item is None:
+                self._add_printer_item(location_item, printer)
+                continue
+
+            printer_item.setText(0, printer["name"])
+            printer_item.setData(0, Qt.UserRole, printer["dns"])
+            if printer_item.parent() is not location_item:
+                printer_item.parent().removeChild(printer_item)
+                location_item.addChild(printer_item)
+            current_changed |= printer_item is current_item
+
+        self._change_seq = max(self._change_seq, change_set.seq)
+        self.on_search(self.searchEdit.text())
+
+        if current_deleted:
+            # Auswahl und Detailansicht dürfen nicht auf gelöschte Einträge zeigen
+            self.printersTreeWidget.setCurrentItem(None)
+            self.on_item_changed(None)
+        elif current_changed:
+            # Detailansicht auffrischen, wenn der ausgewählte Eintrag geändert wurde
+            self.on_item_changed(current_item)
+
+    def apply_read_only_state(self) -> bool:
+        """Sperrt alle ändernden Aktionen, solange nur die lokale Kopie verfügbar ist."""
+        read_only = is_read_only()
+
+        self.createItemComboBox.setEnabled(not read_only)
+        self.importPrintersAction.setEnabled(not read_only)
+        self.deleteItemButton.setEnabled(not read_only)
+        if read_only:
+            self.editPrinterButton.setEnabled(False)
+
+        return read_only
 
     def on_item_changed(self, current: QTreeWidgetItem):
         self.current_item = current
         self.current_printer = None
         self.current_location = None
 
-        item_name = self.printersTreeWidget.currentItem().text(0)
+        self.installPrinterButton.setEnabled(False)
+        self.editPrinterButton.setEnabled(False)
 
-        if not current or current.parent() is None:
-            self.current_location = Location.from_dict(get_location_by_name(item_name))
-            self.installPrinterButton.setEnabled(False)
-            self.editPrinterButton.setEnabled(False)
-            if self._check_availability_thread:
-                self._check_availability_thread.terminate()
-                self._check_availability_thread.quit()
-                self._check_availability_thread.wait()
+        if not current:
+            # Ergebnisse noch laufender Abfragen gehören zu keiner Auswahl mehr
+            self._availability_dns = None
+            self._status_dns = None
             self.clear_printer_details()
             return
 
+        item_name = current.text(0)
+
+        if current.parent() is None:
+            # Ergebnis einer noch laufenden Verfügbarkeits- bzw. Statusabfrage verwerfen
+            self._availability_dns = None
+            self._status_dns = None
+            self.clear_printer_details()
+
+            # Nur die zuletzt angeklickte Auswahl wird geladen
+            self._db.submit(
+                get_location_by_name,
+                item_name,
+                on_result=lambda location: self._on_location_loaded(current, location),
+                on_error=self._on_database_error,
+                key="selection",
+            )
+            return
+
         # Es ist ein Drucker
-        result = get_printer_by_dns(
-            self.printersTreeWidget.currentItem().data(0, Qt.UserRole)
+        self._db.submit(
+            _load_printer_with_location,
+            current.data(0, Qt.UserRole),
+            on_result=lambda result: self._on_printer_loaded(current, *result),
+            on_error=self._on_database_error,
+            key="selection",
         )
+
+    def _on_location_loaded(self, item: QTreeWidgetItem, location):
+        if item is not self.current_item or not location:
+            return
+
+        self.current_location = Location.from_dict(location)
+        # Ganzen Standort installieren
+        self.installPrinterButton.setEnabled(not self._installation_running())
+
+    def _on_printer_loaded(self, item: QTreeWidgetItem, result, location_result):
+        if item is not self.current_item:
+            return
+
         if not result:
             self.clear_printer_details()
             return
 
         printer = Printer.from_dict(result)
-        location = Location.from_dict(get_location_by_id(printer.location_id))
+        location = Location.from_dict(location_result)
         self.current_printer = printer
         self.current_location = location
         self.update_printer_details(printer, location.name)
         self.check_printer_availability(printer)
+        self.check_printer_status(printer)
 
-        self.editPrinterButton.setEnabled(True)
+        self.editPrinterButton.setEnabled(not is_read_only())
         self.installPrinterButton.setEnabled(True)
 
     def on_installed_printer_item_changed(self, current: QListWidgetItem):
@@ -197,6 +567,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         printer = current.data(Qt.UserRole)
         self.check_printer_availability(printer)
+        self.check_printer_status(printer)
         self.update_printer_details(printer, location_name="N/A")
 
     def update_printer_details(self, printer: Printer, location_name: str):
@@ -218,34 +589,69 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.driverPathLabel.setText("N/A")
         self.availableLabel.setText("N/A")
         self.availableLabel.setStyleSheet("N/A")
+        self.snmpStatusLabel.setText("N/A")
 
     def check_printer_availability(self, printer: Printer):
-        if self._check_availability_thread:
-            self._check_availability_thread.terminate()
-            self._check_availability_thread.quit()
-            self._check_availability_thread.wait()
+        self._availability_dns = printer.dns
+
+        # Gültiges Ergebnis aus dem Cache sofort anzeigen
+        cached = self._availability_cache.get(printer.dns)
+        if cached is not None:
+            self.on_availability_checked(printer.dns, cached)
+            return
 
         self._check_availability_thread = AvailabilityCheckThread(printer)
         self._check_availability_thread.availability_check_finished.connect(
             self.on_availability_checked
         )
-        self._check_availability_thread.start()
+        self._tasks.start(
+            self._check_availability_thread,
+            priority=PRIORITY_HIGH,
+            slot="availability_check",
+        )
+
+    def check_printer_status(self, printer: Printer):
+        self._status_dns = printer.dns
+
+        # Gültiges Ergebnis aus dem Cache sofort anzeigen
+        found, status = self._status_collector.cached(printer.dns)
+        if found:
+            self.on_printer_status_loaded(printer.dns, status)
+            return
+
+        self.snmpStatusLabel.setText("ABFRAGE LÄUFT...")
+        self._printer_status_thread = PrinterStatusThread(printer)
+        self._printer_status_thread.printer_status_finished.connect(
+            self.on_printer_status_loaded
+        )
+        self._tasks.start(
+            self._printer_status_thread,
+            priority=PRIORITY_HIGH,
+            slot="printer_status",
+        )
+
+    def on_printer_status_loaded(self, dns: str, status: PrinterStatus | None):
+        if dns != self._status_dns:
+            return
+
+        self.snmpStatusLabel.setText(status.summary() if status else "N/A")
+
+    def on_availability_checked(self, dns: str, is_available: bool):
+        if dns != self._availability_dns:
+            return
 
-    def on_availability_checked(self, is_available: bool):
         color = "lightgreen" if is_available else "salmon"
         self.availableLabel.setText("JA" if is_available else "NEIN")
         self.availableLabel.setStyleSheet(f"color: {color}; font-weight: bold;")
-        if self.current_printer:
-            if self._installer_thread:
-                self.installPrinterButton.setEnabled(
-                    is_available and self._installer_thread.isFinished()
-                )
-            else:
-                self.installPrinterButton.setEnabled(is_available)
+        if self.current_printer and self.current_printer.dns == dns:
+            self.on_printer_checked(self.current_printer.id, is_available)
+            self.installPrinterButton.setEnabled(
+                is_available and not self._installation_running()
+            )
 
     def on_create_item(self, item_type: str):
         if item_type == "Drucker":
-            if get_locations():
+            if self._location_items:
                 self.create_printer()
             else:
                 QMessageBox.critical(self, "Fehler", "Keine Standorte vorhanden!")
@@ -255,30 +661,43 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.create_location()
         self.createItemComboBox.setCurrentIndex(0)  # Zurücksetzen
 
+    def _on_record_saved(self, message: str):
+        self.refresh_changes()
+        self.statusbar.showMessage(message, 3000)
+
+    def _on_database_error(self, error: Exception):
+        QMessageBox.critical(self, "Fehler", str(error))
+
     def create_printer(self):
         dialog = CreatePrinterDialog(self.current_location)
         if dialog.exec():
             try:
                 printer_data = dialog.get_result()
-
-                create_printer(printer_data)
-
-                self.load_storage_to_gui()
-                self.statusbar.showMessage("Drucker erfolgreich erstellt!", 3000)
-
             except Exception as e:
                 QMessageBox.critical(self, "Fehler", str(e))
+                return
+
+            self._db.submit(
+                create_printer,
+                printer_data,
+                on_result=lambda _: self._on_record_saved(
+                    "Drucker erfolgreich erstellt!"
+                ),
+                on_error=self._on_database_error,
+            )
 
     def create_location(self):
         dialog = CreateLocationDialog()
         if dialog.exec():
-            try:
-                location_name = dialog.get_result()
-                create_location(location_name)
-                self.load_storage_to_gui()
-                self.statusbar.showMessage("Standort erfolgreich erstellt!", 3000)
-            except ValueError as e:
-                QMessageBox.critical(self, "Fehler", str(e))
+            location_name = dialog.get_result()
+            self._db.submit(
+                create_location,
+                location_name,
+                on_result=lambda _: self._on_record_saved(
+                    "Standort erfolgreich erstellt!"
+                ),
+                on_error=self._on_database_error,
+            )
 
     def on_edit_item(self):
         if not self.current_printer:
@@ -288,11 +707,19 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         if dialog.exec():
             try:
                 new_data = dialog.get_result()
-                update_printer(self.current_printer.id, new_data)
-                self.load_storage_to_gui()
-                self.statusbar.showMessage("Drucker erfolgreich aktualisiert!", 3000)
             except Exception as e:
                 QMessageBox.critical(self, "Fehler", str(e))
+                return
+
+            self._db.submit(
+                update_printer,
+                self.current_printer.id,
+                new_data,
+                on_result=lambda _: self._on_record_saved(
+                    "Drucker erfolgreich aktualisiert!"
+                ),
+                on_error=self._on_database_error,
+            )
 
     def on_delete_item(self):
         if not self.current_item:
@@ -308,33 +735,81 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel,
         )
 
-        if reply == QMessageBox.StandardButton.Yes:
-            try:
-                if is_location:
-                    if self.current_item.childCount() < 1:
-                        delete_location(get_location_by_name(item_name)["id"])
-
-                    else:
-                        QMessageBox.critical(
-                            self,
-                            "Fehler",
-                            f"Standort '{item_name}' enthält noch Drucker und kann nicht gelöscht werden.",
-                        )
-                        return
-
-                else:
-                    printer_index = self.current_printer.id
-                    delete_printer(printer_index)
-
-                self.load_storage_to_gui()
-                self.clear_printer_details()
-                self.statusbar.showMessage("Eintrag erfolgreich gelöscht!", 3000)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
 
-            except Exception as e:
-                QMessageBox.critical(self, "Fehler", str(e))
+        if is_location:
+            if self.current_item.childCount() > 0:
+                QMessageBox.critical(
+                    self,
+                    "Fehler",
+                    f"Standort '{item_name}' enthält noch Drucker und kann nicht gelöscht werden.",
+                )
+                return
+
+            location_id = next(
+                (
+                    location_id
+                    for location_id, item in self._location_items.items()
+                    if item is self.current_item
+                ),
+                None,
+            )
+            if location_id is None:
+                return
+            delete_func, record_id = delete_location, location_id
+
+        else:
+            if not self.current_printer:
+                return
+            delete_func, record_id = delete_printer, self.current_printer.id
+
+        self.clear_printer_details()
+        self._db.submit(
+            delete_func,
+            record_id,
+            on_result=lambda _: self._on_record_saved("Eintrag erfolgreich gelöscht!"),
+            on_error=self._on_database_error,
+        )
+
+    def _installation_running(self) -> bool:
+        return any(
+            thread is not None and not thread.is_finished()
+            for thread in (self._installer_thread, self._batch_installer_thread)
+        )
+
+    def _selected_printer_dns(self) -> list[str]:
+        return [
+            item.data(0, Qt.UserRole)
+            for item in self.printersTreeWidget.selectedItems()
+            if item.parent() is not None
+        ]
 
     def on_printer_install(self):
-        if not self.current_printer or not self.current_printer.is_available():
+        selected = self._selected_printer_dns()
+        if len(selected) > 1:
+            self.start_batch_install(_load_printers_with_locations, selected)
+            return
+
+        if not self.current_printer:
+            if self.current_location:
+                self.start_batch_install(
+                    _load_location_printers, self.current_location.id
+                )
+            return
+
+        is_available = self._availability_cache.get(self.current_printer.dns)
+        if is_available is None:
+            # Ergebnis ist abgelaufen: neu prüfen, der Button wird danach wieder freigegeben
+            self.installPrinterButton.setEnabled(False)
+            self.check_printer_availability(self.current_printer)
+            self.statusbar.showMessage(
+                "Verfügbarkeit wird erneut geprüft, bitte anschließend erneut installieren.",
+                5000,
+            )
+            return
+
+        if not is_available:
             QMessageBox.warning(
                 self,
                 "Aktion nicht möglich",
@@ -346,28 +821,118 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.editPrinterButton.setEnabled(False)
         self.deleteItemButton.setEnabled(False)
         self.progressBar.setValue(0)
-        self.progressBar.setMaximum(3)
-        self.progressBar.setFormat("[Schritt 0/3] Installation wird vorbereitet...")
+        # Unbestimmter Fortschritt, bis der Installationsplan feststeht
+        self.progressBar.setMaximum(0)
+        self.progressBar.setFormat("Installation wird vorbereitet...")
 
-        if self._load_installed_printers_thread:
-            self._load_installed_printers_thread.terminate()
-            self._load_installed_printers_thread.quit()
-            self._load_installed_printers_thread.wait()
+        # Laufende Abfrage der installierten Drucker beenden (greift vor dem nächsten Drucker)
+        self._tasks.cancel("installed_printers")
 
         self._installer_thread = InstallerThread(
             self.current_printer, self.current_location
         )
+        self._installer_thread.plan_ready.connect(self.on_installation_planned)
         self._installer_thread.step_finished.connect(self.on_installation_step)
+        self._installer_thread.step_started.connect(self.on_installation_step_started)
+        self._installer_thread.step_output.connect(self.on_installation_output)
+        self._installer_thread.step_retrying.connect(self.on_installation_retry)
         self._installer_thread.installation_finished.connect(
             self.on_installation_finished
         )
         self._installer_thread.installation_failed.connect(self.on_installation_failed)
-        self._installer_thread.start()
+        self._tasks.start(self._installer_thread, priority=PRIORITY_HIGH)
+
+    def start_batch_install(self, loader, *args):
+        """Lädt die Drucker über `loader(*args)` und installiert sie gesammelt."""
+        self.installPrinterButton.setEnabled(False)
+        self._db.submit(
+            loader,
+            *args,
+            on_result=self._on_batch_printers_loaded,
+            on_error=self._on_database_error,
+            key="batch_install",
+        )
+
+    def _on_batch_printers_loaded(self, rows):
+        if not rows:
+            self.statusbar.showMessage("Keine Drucker zum Installieren.", 3000)
+            self.installPrinterButton.setEnabled(True)
+            return
+
+        printers = [
+            (Printer.from_dict(printer), Location.from_dict(location))
+            for printer, location in rows
+        ]
+
+        self.installPrinterButton.setEnabled(False)
+        self.editPrinterButton.setEnabled(False)
+        self.deleteItemButton.setEnabled(False)
+        self.progressBar.setValue(0)
+        self.progressBar.setMaximum(0)
+        self.progressBar.setFormat(
+            f"Installation von {len(printers)} Druckern wird vorbereitet..."
+        )
+
+        self._tasks.cancel("installed_printers")
+
+        self._batch_installer_thread = BatchInstallerThread(printers)
+        self._batch_installer_thread.plan_ready.connect(self.on_installation_planned)
+        self._batch_installer_thread.step_finished.connect(self.on_installation_step)
+        self._batch_installer_thread.step_started.connect(
+            self.on_installation_step_started
+        )
+        self._batch_installer_thread.step_output.connect(self.on_installation_output)
+        self._batch_installer_thread.step_retrying.connect(self.on_installation_retry)
+        self._batch_installer_thread.printer_finished.connect(
+            self.on_batch_printer_finished
+        )
+        self._batch_installer_thread.batch_finished.connect(self.on_batch_finished)
+        self._batch_installer_thread.batch_failed.connect(self.on_installation_failed)
+        self._tasks.start(self._batch_installer_thread, priority=PRIORITY_HIGH)
+
+    def on_batch_printer_finished(self, queue_name: str, result: str, message: str):
+        self.statusbar.showMessage(f"{queue_name}: {result}", 3000)
+
+    def on_batch_finished(self, report):
+        self.progressBar.setFormat(report.summary())
+
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Warning if report.failed else QMessageBox.Information)
+        box.setWindowTitle("Sammelinstallation")
+        box.setText(report.summary())
+        box.setDetailedText(report.details())
+        box.exec()
+
+        self.installPrinterButton.setEnabled(True)
+        self.editPrinterButton.setEnabled(True)
+        self.deleteItemButton.setEnabled(True)
+        self.apply_read_only_state()
+
+    def on_installation_planned(self, step_count: int):
+        self.progressBar.setMaximum(max(step_count, 1))
+        self.progressBar.setValue(0)
+        self.progressBar.setFormat(f"[Schritt 0/{step_count}] Installation läuft...")
 
     def on_installation_step(self):
         value = self.progressBar.value() + 1
         self.progressBar.setValue(value)
-        self.progressBar.setFormat(f"[Schritt {value}/3] Installation läuft...")
+        self.progressBar.setFormat(
+            f"[Schritt {value}/{self.progressBar.maximum()}] Installation läuft..."
+        )
+
+    def on_installation_step_started(self, description: str):
+        self.progressBar.setFormat(
+            f"[Schritt {self.progressBar.value() + 1}/{self.progressBar.maximum()}] "
+            f"{description}..."
+        )
+
+    def on_installation_output(self, line: str):
+        self.statusbar.showMessage(line, 5000)
+
+    def on_installation_retry(self, description: str, attempt: int, message: str):
+        self.statusbar.showMessage(
+            f"{description}: {message} – neuer Versuch ({attempt}) folgt...", 5000
+        )
 
     def on_installation_finished(self, message):
         self.progressBar.setFormat(message)
@@ -375,6 +940,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.installPrinterButton.setEnabled(True)
         self.editPrinterButton.setEnabled(True)
         self.deleteItemButton.setEnabled(True)
+        self.apply_read_only_state()
 
     def on_installation_failed(self, error_message):
         self.progressBar.setFormat(f"Fehler: {error_message}")
@@ -382,31 +948,61 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.installPrinterButton.setEnabled(True)
         self.editPrinterButton.setEnabled(True)
         self.deleteItemButton.setEnabled(True)
+        self.apply_read_only_state()
 
     def on_search(self, text: str):
-        # Einfache Suche, die alle Items durchgeht
-        # Für große Datenmengen sollte dies optimiert werden
+        # Drucker über den Volltextindex suchen (Name, DNS, Modell, Treiber, Standort),
+        # Standorte zusätzlich über ihren Namen
+
+        term = text.strip()
+        if not term:
+            self._show_search_truncated(False)
+            self._apply_search_results(term, None)
+            return
 
-        term = text.lower()
-        root = self.printersTreeWidget.invisibleRootItem()
+        # Bei schnellem Tippen wird nur die letzte Eingabe ausgewertet; ein
+        # Treffer mehr als angezeigt zeigt an, dass die Liste abgeschnitten ist
+        self._db.submit(
+            search_printers,
+            term,
+            SEARCH_LIMIT + 1,
+            on_result=lambda printers: self._on_search_results(term, printers or []),
+            on_error=self._on_database_error,
+            key="search",
+        )
 
-        has_visible_child = False
+    def _on_search_results(self, term: str, printers: list):
+        self._show_search_truncated(len(printers) > SEARCH_LIMIT)
+        self._apply_search_results(
+            term, {printer["id"] for printer in printers[:SEARCH_LIMIT]}
+        )
 
-        for i in range(root.childCount()):
-            location_item = root.child(i)
-            location_visible = term in location_item.text(0).lower()
+    def _show_search_truncated(self, truncated: bool):
+        if truncated:
+            self.statusbar.showMessage(
+                f"Mehr als {SEARCH_LIMIT} Treffer – es werden nur die besten "
+                f"{SEARCH_LIMIT} angezeigt, bitte die Suche verfeinern."
+            )
+        elif self._search_truncated:
+            self.statusbar.clearMessage()
+        self._search_truncated = truncated
 
-            search_by_location = term == location_item.text(0).lower()
+    def _apply_search_results(self, term: str, matches: set[int] | None):
+        for printer_id, printer_item in self._printer_items.items():
+            printer_item.setHidden(matches is not None and printer_id not in matches)
 
-            for j in range(location_item.childCount()):
-                printer_item = location_item.child(j)
+        term = term.lower()
 
-                # Suchen nach Namen oder DNS
-                printer_visible = term in printer_item.text(0).lower() or \
-                term in printer_item.data(0, Qt.UserRole).lower()
-                
-                printer_item.setHidden(not (printer_visible or search_by_location))
-                if printer_visible:
-                    has_visible_child = True
+        for location_item in self._location_items.values():
+            location_name = location_item.text(0).lower()
 
-            location_item.setHidden(not (location_visible or has_visible_child))
+            # Bei exakter Eingabe eines Standorts alle seine Drucker zeigen
+            if term and term == location_name:
+                for j in range(location_item.childCount()):
+                    location_item.child(j).setHidden(False)
+
+            has_visible_child = any(
+                not location_item.child(j).isHidden()
+                for j in range(location_item.childCount())
+            )
+            location_item.setHidden(not (term in location_name or has_visible_child))
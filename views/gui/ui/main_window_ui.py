@@ -42,6 +42,7 @@ from PySide6.QtGui import (
     QTransform,
 )
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
     QComboBox,
     QGridLayout,
@@ -75,6 +76,12 @@ class Ui_MainWindow(object):
         MainWindow.resize(719, 555)
         self.openDocumentationAction = QAction(MainWindow)
         self.openDocumentationAction.setObjectName("openDocumentationAction")
+        self.importPrintersAction = QAction(MainWindow)
+        self.importPrintersAction.setObjectName("importPrintersAction")
+        self.exportPrintersAction = QAction(MainWindow)
+        self.exportPrintersAction.setObjectName("exportPrintersAction")
+        self.sweepAvailabilityAction = QAction(MainWindow)
+        self.sweepAvailabilityAction.setObjectName("sweepAvailabilityAction")
         self.centralwidget = QWidget(MainWindow)
         self.centralwidget.setObjectName("centralwidget")
         self.verticalLayout_5 = QVBoxLayout(self.centralwidget)
@@ -105,6 +112,9 @@ class Ui_MainWindow(object):
         self.verticalLayout_2.setObjectName("verticalLayout_2")
         self.printersTreeWidget = QTreeWidget(self.verwaltungTab)
         self.printersTreeWidget.setObjectName("printersTreeWidget")
+        self.printersTreeWidget.setSelectionMode(
+            QAbstractItemView.SelectionMode.ExtendedSelection
+        )
 
         self.verticalLayout_2.addWidget(self.printersTreeWidget)
 
@@ -352,6 +362,30 @@ class Ui_MainWindow(object):
 
         self.gridLayout.addWidget(self.label_7, 3, 0, 1, 1)
 
+        self.label_8 = QLabel(self.scrollAreaWidgetContents)
+        self.label_8.setObjectName("label_8")
+        sizePolicy2.setHeightForWidth(self.label_8.sizePolicy().hasHeightForWidth())
+        self.label_8.setSizePolicy(sizePolicy2)
+        self.label_8.setFont(font)
+        self.label_8.setAlignment(
+            Qt.AlignmentFlag.AlignLeading
+            | Qt.AlignmentFlag.AlignLeft
+            | Qt.AlignmentFlag.AlignTop
+        )
+
+        self.gridLayout.addWidget(self.label_8, 7, 0, 1, 1)
+
+        self.snmpStatusLabel = QLabel(self.scrollAreaWidgetContents)
+        self.snmpStatusLabel.setObjectName("snmpStatusLabel")
+        sizePolicy3.setHeightForWidth(
+            self.snmpStatusLabel.sizePolicy().hasHeightForWidth()
+        )
+        self.snmpStatusLabel.setSizePolicy(sizePolicy3)
+        self.snmpStatusLabel.setFont(font1)
+        self.snmpStatusLabel.setWordWrap(True)
+
+        self.gridLayout.addWidget(self.snmpStatusLabel, 7, 1, 1, 1)
+
         self.verticalLayout.addLayout(self.gridLayout)
 
         self.verticalSpacer = QSpacerItem(
@@ -394,6 +428,10 @@ class Ui_MainWindow(object):
         self.menubar = QMenuBar(MainWindow)
         self.menubar.setObjectName("menubar")
         self.menubar.setGeometry(QRect(0, 0, 719, 33))
+        self.menuFile = QMenu(self.menubar)
+        self.menuFile.setObjectName("menuFile")
+        self.menuTools = QMenu(self.menubar)
+        self.menuTools.setObjectName("menuTools")
         self.menuHelp = QMenu(self.menubar)
         self.menuHelp.setObjectName("menuHelp")
         MainWindow.setMenuBar(self.menubar)
@@ -401,7 +439,12 @@ class Ui_MainWindow(object):
         self.statusbar.setObjectName("statusbar")
         MainWindow.setStatusBar(self.statusbar)
 
+        self.menubar.addAction(self.menuFile.menuAction())
+        self.menubar.addAction(self.menuTools.menuAction())
         self.menubar.addAction(self.menuHelp.menuAction())
+        self.menuFile.addAction(self.importPrintersAction)
+        self.menuFile.addAction(self.exportPrintersAction)
+        self.menuTools.addAction(self.sweepAvailabilityAction)
         self.menuHelp.addAction(self.openDocumentationAction)
 
         self.retranslateUi(MainWindow)
@@ -424,6 +467,30 @@ class Ui_MainWindow(object):
             QCoreApplication.translate("MainWindow", "Ctrl+H", None)
         )
         # endif // QT_CONFIG(shortcut)
+        self.importPrintersAction.setText(
+            QCoreApplication.translate("MainWindow", "Drucker importieren...", None)
+        )
+        # if QT_CONFIG(shortcut)
+        self.importPrintersAction.setShortcut(
+            QCoreApplication.translate("MainWindow", "Ctrl+O", None)
+        )
+        # endif // QT_CONFIG(shortcut)
+        self.exportPrintersAction.setText(
+            QCoreApplication.translate("MainWindow", "Drucker exportieren...", None)
+        )
+        # if QT_CONFIG(shortcut)
+        self.exportPrintersAction.setShortcut(
+            QCoreApplication.translate("MainWindow", "Ctrl+S", None)
+        )
+        # endif // QT_CONFIG(shortcut)
+        self.sweepAvailabilityAction.setText(
+            QCoreApplication.translate("MainWindow", "Alle Drucker pr\u00fcfen", None)
+        )
+        # if QT_CONFIG(shortcut)
+        self.sweepAvailabilityAction.setShortcut(
+            QCoreApplication.translate("MainWindow", "F5", None)
+        )
+        # endif // QT_CONFIG(shortcut)
         self.searchEdit.setPlaceholderText(
             QCoreApplication.translate(
                 "MainWindow",
@@ -528,7 +595,15 @@ class Ui_MainWindow(object):
         self.label_7.setText(
             QCoreApplication.translate("MainWindow", "DNS-Name:", None)
         )
+        self.label_8.setText(QCoreApplication.translate("MainWindow", "Status:", None))
+        self.snmpStatusLabel.setText(
+            QCoreApplication.translate("MainWindow", "N/A", None)
+        )
         self.progressBar.setFormat("")
+        self.menuFile.setTitle(QCoreApplication.translate("MainWindow", "Datei", None))
+        self.menuTools.setTitle(
+            QCoreApplication.translate("MainWindow", "Extras", None)
+        )
         self.menuHelp.setTitle(QCoreApplication.translate("MainWindow", "Hilfe", None))
 
     # retranslateUi